@@ -0,0 +1,66 @@
+"""add dues period close (closed_at, snapshots, totals)
+
+Revision ID: 4f0b8e2d6a17
+Revises: e2a9c4d71f58
+Create Date: 2026-10-16 19:02:47.180254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f0b8e2d6a17'
+down_revision: Union[str, Sequence[str], None] = 'e2a9c4d71f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('dues_charges', sa.Column('closed_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('dues_charges', sa.Column('closed_by', sa.UUID(), nullable=True))
+    op.create_foreign_key(
+        'dues_charges_closed_by_fkey', 'dues_charges', 'users', ['closed_by'], ['id']
+    )
+
+    op.create_table(
+        'dues_period_snapshots',
+        sa.Column('charge_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('student_id', sa.String(length=20), nullable=False),
+        sa.Column('grade', sa.Integer(), nullable=False),
+        sa.Column('amount_due', sa.Integer(), nullable=False),
+        sa.Column('paid_amount', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.ForeignKeyConstraint(['charge_id'], ['dues_charges.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('charge_id', 'user_id'),
+    )
+
+    op.create_table(
+        'dues_period_totals',
+        sa.Column('charge_id', sa.UUID(), nullable=False),
+        sa.Column('members', sa.Integer(), nullable=False),
+        sa.Column('expected_total', sa.BigInteger(), nullable=False),
+        sa.Column('collected_total', sa.BigInteger(), nullable=False),
+        sa.Column('payments', sa.Integer(), nullable=False),
+        sa.Column('paid_count', sa.Integer(), nullable=False),
+        sa.Column('partial_count', sa.Integer(), nullable=False),
+        sa.Column('unpaid_count', sa.Integer(), nullable=False),
+        sa.Column('breakdown', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('closed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['charge_id'], ['dues_charges.id']),
+        sa.PrimaryKeyConstraint('charge_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dues_period_totals')
+    op.drop_table('dues_period_snapshots')
+    op.drop_constraint('dues_charges_closed_by_fkey', 'dues_charges', type_='foreignkey')
+    op.drop_column('dues_charges', 'closed_by')
+    op.drop_column('dues_charges', 'closed_at')
@@ -0,0 +1,28 @@
+"""add dues_version to users
+
+Revision ID: e2a9c4d71f58
+Revises: c51e7b0a9f24
+Create Date: 2026-10-16 18:21:09.336410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4d71f58'
+down_revision: Union[str, Sequence[str], None] = 'c51e7b0a9f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("dues_version", sa.Integer(), nullable=False, server_default="0")
+    )
+
+def downgrade():
+    op.drop_column("users", "dues_version")
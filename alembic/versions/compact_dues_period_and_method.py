@@ -0,0 +1,70 @@
+"""store dues period as YYYYMM integer and payment method as smallint code
+
+Revision ID: 8d4f1a6c2b93
+Revises: 3b7c2e9d41a6
+Create Date: 2026-10-16 15:40:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f1a6c2b93'
+down_revision: Union[str, Sequence[str], None] = '3b7c2e9d41a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 'YYYY-MM' → YYYYMM
+    op.alter_column(
+        'dues_charges', 'period',
+        existing_type=sa.String(length=7),
+        type_=sa.Integer(),
+        postgresql_using="replace(period, '-', '')::integer",
+        existing_nullable=False,
+    )
+    op.create_check_constraint(
+        'ck_dues_charges_period_month', 'dues_charges', 'mod(period, 100) BETWEEN 1 AND 12'
+    )
+
+    # CASH / TRANSFER / ETC → 1 / 2 / 3 (app.models.dues.PAYMENT_METHOD_CODES)
+    op.alter_column(
+        'dues_payments', 'method',
+        existing_type=sa.String(length=20),
+        type_=sa.SmallInteger(),
+        postgresql_using="CASE method WHEN 'CASH' THEN 1 WHEN 'TRANSFER' THEN 2 ELSE 3 END",
+        existing_nullable=False,
+    )
+
+    # (user_id) 인덱스를 (user_id, charge_id) INCLUDE (amount) 커버링 인덱스로 교체
+    op.drop_index('ix_dues_payments_user_id', table_name='dues_payments')
+    op.create_index(
+        'ix_dues_payments_user_charge', 'dues_payments', ['user_id', 'charge_id'],
+        postgresql_include=['amount'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dues_payments_user_charge', table_name='dues_payments')
+    op.create_index('ix_dues_payments_user_id', 'dues_payments', ['user_id'])
+
+    op.alter_column(
+        'dues_payments', 'method',
+        existing_type=sa.SmallInteger(),
+        type_=sa.String(length=20),
+        postgresql_using="CASE method WHEN 1 THEN 'CASH' WHEN 2 THEN 'TRANSFER' ELSE 'ETC' END",
+        existing_nullable=False,
+    )
+
+    op.drop_constraint('ck_dues_charges_period_month', 'dues_charges', type_='check')
+    op.alter_column(
+        'dues_charges', 'period',
+        existing_type=sa.Integer(),
+        type_=sa.String(length=7),
+        postgresql_using="to_char(period / 100, 'FM0000') || '-' || to_char(mod(period, 100), 'FM00')",
+        existing_nullable=False,
+    )
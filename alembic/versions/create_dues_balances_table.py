@@ -0,0 +1,51 @@
+"""create dues_balances table
+
+Revision ID: 3b7c2e9d41a6
+Revises: 516fa229371c
+Create Date: 2026-10-16 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c2e9d41a6'
+down_revision: Union[str, Sequence[str], None] = '516fa229371c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dues_balances',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('charge_id', sa.UUID(), nullable=False),
+        sa.Column('paid_amount', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['charge_id'], ['dues_charges.id']),
+        sa.PrimaryKeyConstraint('user_id', 'charge_id'),
+    )
+    op.create_index('ix_dues_balances_charge_id', 'dues_balances', ['charge_id'])
+
+    # 기존 납부 기록으로 잔액 원장 채우기
+    op.execute("""
+    INSERT INTO dues_balances (user_id, charge_id, paid_amount, status, updated_at)
+    SELECT p.user_id, p.charge_id, SUM(p.amount),
+           CASE WHEN SUM(p.amount) <= 0 THEN 'UNPAID'
+                WHEN SUM(p.amount) < c.amount THEN 'PARTIAL'
+                ELSE 'PAID' END,
+           now()
+    FROM dues_payments p
+    JOIN dues_charges c ON c.id = p.charge_id
+    GROUP BY p.user_id, p.charge_id, c.amount
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dues_balances_charge_id', table_name='dues_balances')
+    op.drop_table('dues_balances')
@@ -0,0 +1,51 @@
+"""create export_jobs table
+
+Revision ID: 7a3d5c9e1b60
+Revises: 4f0b8e2d6a17
+Create Date: 2026-10-17 10:12:31.518240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3d5c9e1b60'
+down_revision: Union[str, Sequence[str], None] = '4f0b8e2d6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'export_jobs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('media_type', sa.String(length=100), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('size', sa.BigInteger(), nullable=True),
+        sa.Column('created_by', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_export_jobs_cache_key', 'export_jobs', ['cache_key'])
+    op.create_index('ix_export_jobs_expires_at', 'export_jobs', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_export_jobs_expires_at', table_name='export_jobs')
+    op.drop_index('ix_export_jobs_cache_key', table_name='export_jobs')
+    op.drop_table('export_jobs')
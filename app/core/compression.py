@@ -0,0 +1,210 @@
+"""
+compression.py
+
+응답 압축(Content-Encoding) ASGI 미들웨어.
+
+회원 / 로그 목록과 CSV export 처럼 큰 응답은 전송 시간이 대부분이므로
+클라이언트가 지원하면 gzip(기본) 또는 Brotli(설치된 경우)로 압축해서 보낸다.
+
+주요 기능:
+- Accept-Encoding(q 값 포함) 협상: br → gzip 순으로 선호, q=0 은 거부로 취급
+- StreamingResponse 는 본문을 모으지 않고 청크마다 압축 후 flush 하여 바로 전송
+  (첫 청크 전송 시점은 압축 전과 동일)
+- 한 번에 보내는 작은 응답(minimum_size 미만)은 압축하지 않음
+- 이미 압축된 형식(XLSX / zip / 이미지 등), Content-Encoding 이 있는 응답,
+  Range 부분 응답(206)은 그대로 전송
+- 압축 대상 형식이면 Vary: Accept-Encoding 추가 (프록시 캐시 분리)
+
+설계 원칙:
+- Brotli 는 선택 의존성 (brotli 패키지가 없으면 gzip 만 사용)
+- 압축 수준은 설정(COMPRESSION_*)으로 조정
+- 압축 상태는 요청마다 새로 만들어 요청 간 공유하지 않음
+
+관련 파일:
+- app.main               : 미들웨어 등록
+- app.core.config        : 압축 최소 크기 / 수준 설정
+
+"""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip 만 사용
+    brotli = None
+
+
+# 이미 압축되어 있거나 스트림 특성상 압축하지 않는 형식 (Content-Type 접두어)
+EXCLUDED_CONTENT_TYPES = (
+    "application/vnd.openxmlformats-officedocument.",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/pdf",
+    "image/",
+    "audio/",
+    "video/",
+    "text/event-stream",
+)
+
+
+"""
+Accept-Encoding 협상
+
+- 'gzip, deflate, br;q=0.9' 형식의 헤더에서 q > 0 인 인코딩만 허용
+- '*' 는 명시되지 않은 인코딩 전부 허용
+- 같은 q 값이면 br(설치된 경우) → gzip 순, 둘 다 안 되면 None
+
+"""
+
+def negotiate_encoding(accept_encoding: str, *, brotli_available: bool = brotli is not None) -> str | None:
+    q_values = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_values[name] = q
+
+    supported = ["br", "gzip"] if brotli_available else ["gzip"]
+    best, best_q = None, 0.0
+    for name in supported:
+        q = q_values.get(name, q_values.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31: gzip 헤더 / 트레일러 포함
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+"""
+응답 압축 미들웨어
+
+- minimum_size : 한 번에 보내는 응답이 이보다 작으면 압축하지 않음 (바이트)
+- gzip_level   : 1(빠름) ~ 9(작음)
+- brotli_level : 0(빠름) ~ 11(작음)
+
+"""
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, *, minimum_size: int = 1024, gzip_level: int = 6, brotli_level: int = 1):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_level = brotli_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        await _CompressionResponder(self, encoding, send)(scope, receive)
+
+    def encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_level)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str | None, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    # 압축 대상 형식인지 (시작 메시지 헤더 기준)
+    @staticmethod
+    def _eligible(message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if message["status"] < 200 or message["status"] in (204, 206, 304):
+            return False
+        return not headers.get("content-type", "").lower().startswith(EXCLUDED_CONTENT_TYPES)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            eligible = self._eligible(message)
+            if eligible:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            if eligible and self.encoding is not None:
+                # 헤더는 첫 본문 청크를 보고 압축 여부를 정한 뒤 전송
+                self.start = message
+            else:
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.encoder = self.middleware.encoder(self.encoding)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            compressed = self.encoder.compress(body, final=not more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(compressed))
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        await self.send({
+            "type": "http.response.body",
+            "body": self.encoder.compress(body, final=not more_body),
+            "more_body": more_body,
+        })
+
+    async def _flush_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
@@ -11,6 +11,9 @@ config.py
 - JWT 인증 관련 시크릿 및 만료 정책
 - 쿠키 보안 옵션
 - CORS 허용 도메인 목록
+- 회비 청구 캐시 TTL / 워커 간 무효화 여부
+- 응답 압축 최소 크기 / 압축 수준
+- 백그라운드 export 작업 디렉터리 / 워커 수 / 보관 시간
 
 설계 원칙:
 - 모든 환경 변수는 이 파일을 통해서만 접근
@@ -19,6 +22,7 @@ config.py
 
 관련 파일:
 - app.main               : CORS 및 앱 초기화 시 설정 사용
+- app.core.compression   : 응답 압축 설정 사용
 - app.core.security      : JWT 시크릿 / 만료 설정 사용
 - app.db.session         : DATABASE_URL 사용
 
@@ -54,6 +58,39 @@ class Settings(BaseSettings):
     # CORS 허용 도메인 (프론트엔드 주소)
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://127.0.0.1:5173"]
 
+    # 회비 캐시
+    # - DUES_CHARGE_CACHE_TTL: 프로세스 내 청구 캐시 유지 시간(초), 0 이하면 무효화 전까지 유지
+    # - DUES_ANALYTICS_CACHE_TTL: 마감된 기간 수납 통계 캐시 유지 시간(초)
+    # - DUES_STATUS_CACHE_TTL: 관리자 납부 현황 / export 집계 결과 재사용 시간(초), 0 이면 동시 요청 병합만
+    # - DUES_CACHE_NOTIFY: 워커가 여러 개일 때 Postgres NOTIFY로 다른 워커 캐시도 무효화
+    DUES_CHARGE_CACHE_TTL: int = 300
+    DUES_ANALYTICS_CACHE_TTL: int = 3600
+    DUES_STATUS_CACHE_TTL: int = 30
+    DUES_CACHE_NOTIFY: bool = False
+
+    # 관리자 회비 쓰기 API Idempotency-Key 보관 시간(시간)
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+
+    # 응답 압축 (Accept-Encoding 협상, Brotli 는 brotli 패키지가 설치된 경우에만)
+    # - COMPRESSION_MINIMUM_SIZE: 이보다 작은 단건 응답은 압축하지 않음(바이트)
+    # - COMPRESSION_GZIP_LEVEL: 1(빠름) ~ 9(작음)
+    # - COMPRESSION_BROTLI_LEVEL: 0(빠름) ~ 11(작음)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 1
+
+    # 백그라운드 export 작업
+    # - EXPORT_DIR: 완성된 파일 저장 디렉터리 (워커가 여러 개면 공유 디렉터리)
+    # - EXPORT_JOB_TTL_HOURS: 완성된 파일 재사용 / 다운로드 가능 시간(시간)
+    # - EXPORT_JOB_THREADS: CSV 작업 스레드 수 (COPY 대기 위주)
+    # - EXPORT_JOB_PROCESSES: XLSX 작업 프로세스 수, 0 이면 XLSX 도 스레드에서 생성
+    # - EXPORT_JOB_TIMEOUT_MINUTES: 이 시간이 지나도 끝나지 않은 작업은 재사용하지 않음
+    EXPORT_DIR: str = "exports"
+    EXPORT_JOB_TTL_HOURS: int = 24
+    EXPORT_JOB_THREADS: int = 2
+    EXPORT_JOB_PROCESSES: int = 1
+    EXPORT_JOB_TIMEOUT_MINUTES: int = 30
+
 # 애플리케이션 전역에서 import하여 사용하는 Settings 인스턴스
 # 실행 시 한 번만 생성됨
 settings = Settings()
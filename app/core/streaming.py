@@ -0,0 +1,109 @@
+"""
+streaming.py
+
+큰 목록 API 의 JSON / NDJSON 스트리밍 응답 유틸리티.
+
+회원 / 삭제 회원 / 관리자 로그 목록처럼 행 수에 제한이 없는 응답을
+전체 목록을 만들어 한 번에 직렬화하지 않고, 서버 측 커서로 읽은 행 묶음마다
+바로 직렬화해서 보낸다. 메모리는 행 수와 관계없이 묶음 하나 크기로 유지된다.
+
+응답 형식:
+- Accept: application/x-ndjson → 한 줄에 행 하나, 마지막 줄은 {"meta": {..., "count": N}}
+- ?stream=true                 → 기존과 같은 {"data": [...], "meta": {..., "count": N}} 봉투를
+                                 배열 원소 단위로 스트리밍 (meta 는 data 뒤에 오는 trailer)
+- 둘 다 아니면 호출 측이 기존 방식(전체 JSON)으로 응답
+
+설계 원칙:
+- 행 → dict 변환은 라우터가, 직렬화 / 전송은 이 파일이 담당
+- count 는 실제 보낸 행 수 (전송이 끝날 때 확정)
+- DB 세션은 get_db 의존성이 응답 전송 후 정리
+
+관련 파일:
+- app.routers.admin      : 전체 / 삭제 회원 목록, 관리자 로그
+- app.routers.users      : 회원용 회원 목록
+
+"""
+
+import json
+from typing import Callable, Iterable, Iterator, Literal
+
+from sqlalchemy.orm import Session
+from starlette.responses import StreamingResponse
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+STREAM_BATCH_SIZE = 500
+
+StreamFormat = Literal["ndjson", "json"]
+
+
+# Accept 헤더 / stream 파라미터 → 스트리밍 형식 (없으면 None: 기존 방식)
+def stream_format(accept: str | None, stream: bool) -> StreamFormat | None:
+    if accept and NDJSON_MEDIA_TYPE in accept.lower():
+        return "ndjson"
+    if stream:
+        return "json"
+    return None
+
+
+# 서버 측 커서로 batch_size 개씩 읽어 행 묶음 반환 (generator)
+def iter_batches(db: Session, stmt, *, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[list]:
+    result = db.execute(stmt, execution_options={"stream_results": True, "yield_per": batch_size})
+    yield from result.partitions()
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+"""
+JSON 봉투 스트리밍
+
+- '{"data":[' 를 먼저 보내고, 행 묶음마다 원소들을 이어 붙인 문자열 하나를 반환
+- 끝에 '],"meta":{...,"count":N}}' (trailer)
+
+"""
+
+def iter_json_envelope(batches: Iterable[list[dict]], *, meta: dict | None = None) -> Iterator[str]:
+    yield '{"data":['
+    count = 0
+    for batch in batches:
+        if not batch:
+            continue
+        yield ("," if count else "") + ",".join(_dumps(item) for item in batch)
+        count += len(batch)
+    yield '],"meta":' + _dumps({**(meta or {}), "count": count}) + "}"
+
+
+"""
+NDJSON 스트리밍
+
+- 행 묶음마다 '한 줄 = 행 하나' 문자열 하나를 반환
+- 마지막 줄: {"meta":{...,"count":N}}
+
+"""
+
+def iter_ndjson(batches: Iterable[list[dict]], *, meta: dict | None = None) -> Iterator[str]:
+    count = 0
+    for batch in batches:
+        if not batch:
+            continue
+        yield "".join(_dumps(item) + "\n" for item in batch)
+        count += len(batch)
+    yield _dumps({"meta": {**(meta or {}), "count": count}}) + "\n"
+
+
+# 스트리밍 목록 응답: 서버 측 커서 → 행 변환(to_item) → NDJSON / JSON 봉투
+def streaming_list_response(
+    fmt: StreamFormat,
+    db: Session,
+    stmt,
+    to_item: Callable[..., dict],
+    *,
+    meta: dict | None = None,
+) -> StreamingResponse:
+    batches = ([to_item(row) for row in batch] for batch in iter_batches(db, stmt))
+    if fmt == "ndjson":
+        return StreamingResponse(iter_ndjson(batches, meta=meta), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(iter_json_envelope(batches, meta=meta), media_type="application/json")
@@ -8,9 +8,11 @@ FastAPI 애플리케이션 진입점(Entry Point).
 
 주요 역할:
 - FastAPI 앱 인스턴스 생성
-- CORS 미들웨어 설정
+- CORS / 응답 압축 미들웨어 설정
 - 각 도메인별 라우터(auth, users, admin, dues 등) 등록
 - 헬스 체크 및 DB 연결 상태 확인용 엔드포인트 제공
+- 회비 청구 캐시 워커 간 무효화 리스너 시작 / 종료
+- 백그라운드 export 작업 워커 풀 종료
 
 설계 원칙:
 - 비즈니스 로직은 포함하지 않고 설정/조립 역할만 수행
@@ -20,20 +22,49 @@ FastAPI 애플리케이션 진입점(Entry Point).
 관련 파일:
 - app.core.config        : 환경 변수 및 설정 로드
 - app.core.deps          : DB 세션 의존성
+- app.core.compression   : 응답 압축 미들웨어
 - app.routers.*          : 기능별 API 라우터
 
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.core.deps import get_db
-from app.routers import auth, users, admin, dues, admin_dues
+from app.db.session import engine
+from app.routers import auth, users, admin, dues, admin_dues, admin_exports
+from app.services.dues_cache import ChargeCacheListener
+from app.services.dues_export_jobs import export_runner
+
 
-app = FastAPI(title="Club Backend")
+"""
+애플리케이션 수명 주기
+
+- DUES_CACHE_NOTIFY=true 이면 회비 청구 캐시 무효화 리스너(LISTEN) 시작
+- 종료 시 리스너 스레드 / export 작업 풀 정리 (진행 중이 아닌 대기 작업은 취소)
+
+"""
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    listener = None
+    if settings.DUES_CACHE_NOTIFY:
+        listener = ChargeCacheListener(engine)
+        listener.start()
+    try:
+        yield
+    finally:
+        if listener is not None:
+            listener.stop()
+        export_runner.shutdown(wait=False)
+
+
+app = FastAPI(title="Club Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -43,11 +74,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 큰 목록 / CSV export 응답 압축 (gzip, brotli 설치 시 br)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_level=settings.COMPRESSION_BROTLI_LEVEL,
+)
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(admin.router)
 app.include_router(dues.router)
 app.include_router(admin_dues.router)
+app.include_router(admin_exports.router)
 
 """
 서버 헬스 체크 엔드포인트
@@ -1,4 +1,6 @@
 from app.models.user import User
 from .user import User
 from .admin_log import AdminActionLog
-from .dues import DuesCharge, DuesPayment
\ No newline at end of file
+from .dues import DuesCharge, DuesPayment, DuesBalance, DuesPeriodSnapshot, DuesPeriodTotal
+from .idempotency import IdempotencyKey
+from .export_job import ExportJob
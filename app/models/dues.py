@@ -10,25 +10,99 @@ dues.py
 회비는 '청구 → 납부' 구조로 관리되며,
 부분 납부 및 추가 납부를 지원하도록 설계되었다.
 
+저장 형식:
+- period 는 DB에 정수 월 키(YYYYMM, 예: 202601)로 저장하고
+  Python / API 에서는 'YYYY-MM' 문자열로 다룬다 (PeriodKey)
+- 납부 방법(method)은 DB에 smallint 코드로 저장하고
+  Python / API 에서는 CASH / TRANSFER / ETC 문자열로 다룬다 (PaymentMethodCode)
+
 """
 
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    TypeDecorator,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
 
 
+"""
+회비 period 컬럼 타입
+
+- DB: 정수 월 키 YYYYMM (정수 비교만으로 기간 범위 / 최신 청구 조회)
+- Python: 'YYYY-MM' 문자열 (바인딩 / 결과 변환 자동 수행)
+
+"""
+
+class PeriodKey(TypeDecorator):
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        year, sep, month = str(value).partition("-")
+        if not sep or not year.isdigit() or not month.isdigit():
+            raise ValueError("period must be in 'YYYY-MM' format")
+        return int(year) * 100 + int(month)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return f"{value // 100:04d}-{value % 100:02d}"
+
+
+# 납부 방법 ↔ DB 코드 (코드 값은 변경 금지, 새 방법은 뒤에 추가)
+PAYMENT_METHOD_CODES = {"CASH": 1, "TRANSFER": 2, "ETC": 3}
+_PAYMENT_METHOD_NAMES = {code: name for name, code in PAYMENT_METHOD_CODES.items()}
+
+
+"""
+납부 방법 컬럼 타입
+
+- DB: smallint 코드 (PAYMENT_METHOD_CODES)
+- Python: CASH / TRANSFER / ETC 문자열
+
+"""
+
+class PaymentMethodCode(TypeDecorator):
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return PAYMENT_METHOD_CODES[value]
+        except KeyError:
+            raise ValueError("method must be one of CASH, TRANSFER, ETC")
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return _PAYMENT_METHOD_NAMES.get(value, "ETC")
+
 
 """
 회비 청구(Dues Charge) 모델
 
 - 특정 기간(period)에 대해 회비를 얼마 청구했는지 기록
-- period는 'YYYY-MM' 형식 권장
+- period는 'YYYY-MM' 형식 (DB에는 YYYYMM 정수로 저장)
 - 동일 period에 대한 중복 청구는 UniqueConstraint로 방지
+- 마감(closed_at)된 청구는 이후 납부를 받지 않고 스냅샷으로 조회
 
 """
 
@@ -41,16 +115,21 @@ class DuesCharge(Base):
     __tablename__ = "dues_charges"
     __table_args__ = (
         UniqueConstraint("period", name="uq_dues_charges_period"),
+        CheckConstraint("mod(period, 100) BETWEEN 1 AND 12", name="ck_dues_charges_period_month"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    period: Mapped[str] = mapped_column(String(7), nullable=False)  # YYYY-MM
+    period: Mapped[str] = mapped_column(PeriodKey, nullable=False)  # YYYY-MM (DB: YYYYMM)
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
 
     created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
+    # 마감(close) 시각 / 마감한 관리자 - 마감된 청구에는 납부 추가 불가
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    closed_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+
 
 """
 회비 납부(Dues Payment) 모델
@@ -70,7 +149,8 @@ class DuesPayment(Base):
 
     __tablename__ = "dues_payments"
     __table_args__ = (
-        Index("ix_dues_payments_user_id", "user_id"),
+        # 회원 × 청구 납부 합계를 테이블 접근 없이 계산 (index-only scan)
+        Index("ix_dues_payments_user_charge", "user_id", "charge_id", postgresql_include=["amount"]),
         Index("ix_dues_payments_charge_id", "charge_id"),
     )
 
@@ -80,8 +160,96 @@ class DuesPayment(Base):
     charge_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("dues_charges.id"), nullable=False)
 
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
-    method: Mapped[str] = mapped_column(String(20), default="TRANSFER", nullable=False)  # CASH/TRANSFER/ETC
+    method: Mapped[str] = mapped_column(PaymentMethodCode, default="TRANSFER", nullable=False)  # CASH/TRANSFER/ETC
     memo: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+
+"""
+회원별 회비 잔액(Dues Balance) 모델
+
+- (user_id, charge_id) 단위로 누적 납부 금액과 상태를 보관하는 원장(ledger)
+- record_payment / create_charge 가 같은 트랜잭션 안에서 증분 갱신
+- 상태/누적 미납 조회는 dues_payments 원본 대신 이 테이블을 PK로 조회
+- 원본과의 불일치는 scripts.reconcile_dues_balances 로 점검/재구축
+
+"""
+
+class DuesBalance(Base):
+    """회원 × 청구 단위 누적 납부 잔액.
+
+    - paid_amount: 해당 청구에 대한 누적 납부 금액
+    - status: PAID / PARTIAL / UNPAID
+    """
+
+    __tablename__ = "dues_balances"
+    __table_args__ = (
+        Index("ix_dues_balances_charge_id", "charge_id"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    charge_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("dues_charges.id"), primary_key=True)
+
+    paid_amount: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    status: Mapped[str] = mapped_column(String(10), default="UNPAID", nullable=False)  # PAID/PARTIAL/UNPAID
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+
+"""
+마감 기간 회원별 스냅샷(Dues Period Snapshot) 모델
+
+- 청구 마감 시점의 MEMBER / ADMIN 회원별 납부 현황을 그대로 보관
+- 마감 이후 관리자 납부 현황 / export 는 원장 대신 이 테이블을 조회
+- 마감 후 회원 정보(이름 / 학번 / 학년)가 바뀌어도 마감 당시 값 유지
+- 작성 후 수정 / 삭제하지 않음
+
+"""
+
+class DuesPeriodSnapshot(Base):
+    """마감된 청구 × 회원 단위 납부 현황 스냅샷."""
+
+    __tablename__ = "dues_period_snapshots"
+
+    charge_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("dues_charges.id"), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+    student_id: Mapped[str] = mapped_column(String(20), nullable=False)
+    grade: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    amount_due: Mapped[int] = mapped_column(Integer, nullable=False)
+    paid_amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(10), nullable=False)  # PAID/PARTIAL/UNPAID
+
+
+"""
+마감 기간 합계(Dues Period Total) 모델
+
+- 청구 마감 시점의 기간 합계 (청구 / 수납 총액, 상태별 인원)
+- breakdown: 수납 통계 API 형식의 by_method / by_grade 세부 통계 (JSONB)
+- 마감 기간의 수납 통계는 납부 원본 대신 이 테이블에서 응답
+
+"""
+
+class DuesPeriodTotal(Base):
+    """마감된 청구 단위 합계."""
+
+    __tablename__ = "dues_period_totals"
+
+    charge_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("dues_charges.id"), primary_key=True)
+
+    members: Mapped[int] = mapped_column(Integer, nullable=False)
+    expected_total: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    collected_total: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    payments: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    paid_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    partial_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    unpaid_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    breakdown: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    closed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
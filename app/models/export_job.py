@@ -0,0 +1,68 @@
+"""
+
+export_job.py
+
+회비 export 작업(Export Job) 모델 정의 파일.
+
+연간 / 여러 기간 XLSX 보고서처럼 생성에 오래 걸리는 파일은
+요청 처리 중에 만들지 않고 작업으로 등록한 뒤 백그라운드 워커가 디스크에 생성한다.
+이 테이블은 작업 종류 / 파라미터 / 진행 상태와 완성된 파일 위치를 보관하여,
+어느 API 워커(프로세스)로 조회가 들어와도 같은 상태를 볼 수 있게 한다.
+
+설계 원칙:
+- cache_key(작업 종류 + 파라미터 + 데이터 지문)가 같은 살아있는 작업은 새로 만들지 않고 재사용
+- 상태: QUEUED → RUNNING → DONE / FAILED
+- expires_at 이 지난 작업은 없는 것으로 취급하고 파일과 함께 주기적으로 삭제
+
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+"""
+export 작업 모델
+
+- kind        : status_csv / status_xlsx / payments_csv / year_xlsx
+- params      : 정규화된 요청 파라미터 (periods / year)
+- cache_key   : kind + params + 데이터 지문 SHA-256 (같은 요청 + 같은 데이터 → 같은 파일)
+- status      : QUEUED / RUNNING / DONE / FAILED
+- progress    : 0 ~ 100 (XLSX 는 시트 단위로 갱신)
+- file_path   : 완성된 파일 경로 (DONE 일 때만)
+- expires_at  : 만료 시각 (이후 재사용 / 다운로드 불가, 정리 대상)
+
+"""
+
+class ExportJob(Base):
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        Index("ix_export_jobs_cache_key", "cache_key"),
+        Index("ix_export_jobs_expires_at", "expires_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status: Mapped[str] = mapped_column(String(10), default="QUEUED", nullable=False)
+    progress: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    media_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    file_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    size: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,53 @@
+"""
+
+idempotency.py
+
+멱등성 키(Idempotency-Key) 저장 모델 정의 파일.
+
+관리자 회비 쓰기 API(청구 생성 / 납부 기록)는
+클라이언트 타임아웃 후 재시도되어도 한 번만 반영되어야 한다.
+이 테이블은 (엔드포인트, 키) 마다 요청 본문 해시와
+처음 반환한 응답을 보관하여, 같은 키의 재요청에 원래 응답을 돌려준다.
+
+설계 원칙:
+- 원래 요청의 쓰기와 같은 트랜잭션에서 저장 (둘 다 반영되거나 둘 다 취소)
+- expires_at 이 지난 키는 없는 것으로 취급하고 주기적으로 삭제
+
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+"""
+멱등성 키 모델
+
+- scope         : 엔드포인트 식별자 (예: 'POST /admin/dues/payments')
+- key           : 클라이언트가 보낸 Idempotency-Key 헤더 값
+- request_hash  : 요청자 + 요청 본문 SHA-256 (같은 키로 다른 요청 감지)
+- status_code   : 처음 반환한 HTTP 상태 코드
+- response_body : 처음 반환한 응답 JSON
+- expires_at    : 만료 시각 (이후 정리 대상)
+
+"""
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    scope: Mapped[str] = mapped_column(String(64), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    response_body: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -49,6 +49,7 @@ class Role(str, Enum):
 - role을 통해 접근 권한 제어
 - is_deleted / deleted_at 으로 Soft Delete 지원
 - refresh_token_version 으로 강제 로그아웃 및 토큰 무효화 지원
+- dues_version 은 본인 회비 데이터(청구 / 납부)가 바뀔 때마다 증가 (회원 회비 API ETag)
 
 """
 
@@ -74,3 +75,5 @@ class User(Base):
     deleted_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     refresh_token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    dues_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
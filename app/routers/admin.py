@@ -13,6 +13,7 @@ admin.py
 - 회원 삭제 (Soft Delete)
 - 전체 회원 / 삭제된 회원 조회
 - 관리자 활동 로그 조회
+- 목록 API 의 NDJSON / JSON 스트리밍 응답 (대규모 목록)
 
 설계 원칙:
 - 모든 엔드포인트는 관리자 권한을 요구
@@ -29,13 +30,14 @@ admin.py
 """
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session, aliased
 from sqlalchemy import select, desc
 
 from app.core.deps import get_db, get_current_admin, get_current_superadmin
+from app.core.streaming import stream_format, streaming_list_response
 from app.schemas.user import RoleUpdate
 
 from app.models.user import User, Role
@@ -360,85 +362,140 @@ def get_user_details(
         }
     }
 
+# 관리자 회원 목록 응답 항목
+def _user_item(u) -> dict:
+    return {
+        "id": str(u.id),
+        "email": u.email,
+        "name": u.name,
+        "student_id": u.student_id,
+        "phone": u.phone,
+        "grade": u.grade,
+        "role": u.role.value,
+    }
+
+
 """
 관리자 전용 전체 회원 목록 조회 API
 
 - Soft Delete되지 않은 활성 회원만 조회
 - 학번 기준 정렬
+- Accept: application/x-ndjson 또는 stream=true 이면 서버 측 커서로 스트리밍
+  (회원 수와 관계없이 메모리 일정, count 는 마지막 meta 에 포함)
 
 """
 @router.get("/users/all")
 def list_all_users(
+    stream: bool = Query(default=False),
+    accept: str | None = Header(default=None),
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin),
 ):
-    users = db.scalars(select(User)
-            .where(User.is_deleted.is_(False))
-            .order_by(User.student_id)
-        ).all()
+    stmt = (
+        select(User.id, User.email, User.name, User.student_id, User.phone, User.grade, User.role)
+        .where(User.is_deleted.is_(False))
+        .order_by(User.student_id)
+    )
+    fmt = stream_format(accept, stream)
+    if fmt is not None:
+        return streaming_list_response(fmt, db, stmt, _user_item)
+
+    users = db.execute(stmt).all()
     return {
-        "data": [
-            {
-                "id": str(u.id),
-                "email": u.email,
-                "name": u.name,
-                "student_id": u.student_id,
-                "phone": u.phone,
-                "grade": u.grade,
-                "role": u.role.value,
-            }
-            for u in users
-        ],
+        "data": [_user_item(u) for u in users],
         "meta": {
             "count": len(users),
         }
     }
 
+# 삭제 회원 목록 응답 항목 (삭제 여부 / 삭제 시각 포함)
+def _deleted_user_item(u) -> dict:
+    return {
+        **_user_item(u),
+        "is_deleted": u.is_deleted,
+        "deleted_at": u.deleted_at.isoformat() if u.deleted_at else None,
+    }
+
+
 """
 삭제된(DELETED) 회원 목록 조회 API
 
 - Soft Delete된 회원만 조회
 - 최근 삭제 순으로 정렬
+- Accept: application/x-ndjson 또는 stream=true 이면 스트리밍
 
 """
 @router.get("/users/deleted")
 def list_deleted_users(
+    stream: bool = Query(default=False),
+    accept: str | None = Header(default=None),
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin),
 ):
     # 삭제된 회원 목록 조회(최근 삭제일 기준)
-    users = db.scalars(select(User).where(User.is_deleted.is_(True)).order_by(desc(User.deleted_at))).all()
+    stmt = (
+        select(
+            User.id, User.email, User.name, User.student_id, User.phone, User.grade, User.role,
+            User.is_deleted, User.deleted_at,
+        )
+        .where(User.is_deleted.is_(True))
+        .order_by(desc(User.deleted_at))
+    )
+    fmt = stream_format(accept, stream)
+    if fmt is not None:
+        return streaming_list_response(fmt, db, stmt, _deleted_user_item)
+
+    users = db.execute(stmt).all()
     return {
-        "data": [
-            {
-                "id": str(u.id),
-                "email": u.email,
-                "name": u.name,
-                "student_id": u.student_id,
-                "phone": u.phone,
-                "grade": u.grade,
-                "role": u.role.value,
-                "is_deleted": u.is_deleted,
-                "deleted_at": u.deleted_at.isoformat() if u.deleted_at else None,
-            }
-            for u in users
-        ],
+        "data": [_deleted_user_item(u) for u in users],
         "meta": {
             "count": len(users),
         }
     }
 
+# 관리자 로그 응답 항목 (row: AdminActionLog, actor, target)
+def _log_item(row) -> dict:
+    log, actor, target = row
+    return {
+        "id": str(log.id),
+        "created_at": log.created_at.isoformat(),
+        "action": log.action,
+        "before_role": log.before_role,
+        "after_role": log.after_role,
+
+        "actor": {
+            "id": str(actor.id),
+            "email": actor.email,
+            "name": actor.name,
+            "role": actor.role.value,
+        },
+        "target": (
+            {
+                "id": str(target.id),
+                "email": target.email,
+                "name": target.name,
+                "role": target.role.value,
+            }
+            if target
+            else None
+        ),
+    }
+
+
 """
 관리자 활동 로그 조회 API
 
 - 회원 승인 / 거절 / 삭제 / 권한 변경 이력 조회
 - actor(행위자) / target(대상 사용자) 정보 포함
 - limit 파라미터로 조회 개수 제한 (최대 200)
+- Accept: application/x-ndjson 또는 stream=true 이면 스트리밍
 
 """
 @router.get("/logs")
 def list_admin_logs(
     limit: int = 50,
+    stream: bool = Query(default=False),
+    accept: str | None = Header(default=None),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_admin),
 ):
@@ -447,42 +504,18 @@ def list_admin_logs(
     Actor = aliased(User)
     Target = aliased(User)
 
-    rows = db.execute(
+    stmt = (
         select(AdminActionLog, Actor, Target)
         .join(Actor, Actor.id == AdminActionLog.actor_id)
         .outerjoin(Target, Target.id == AdminActionLog.target_user_id)
         .order_by(desc(AdminActionLog.created_at))
         .limit(limit)
-    ).all()
+    )
+    fmt = stream_format(accept, stream)
+    if fmt is not None:
+        return streaming_list_response(fmt, db, stmt, _log_item, meta={"limit": limit})
 
-    result = []
-    for log, actor, target in rows:
-        result.append(
-            {
-                "id": str(log.id),
-                "created_at": log.created_at.isoformat(),
-                "action": log.action,
-                "before_role": log.before_role,
-                "after_role": log.after_role,
-
-                "actor": {
-                    "id": str(actor.id),
-                    "email": actor.email,
-                    "name": actor.name,
-                    "role": actor.role.value,
-                },
-                "target": (
-                    {
-                        "id": str(target.id),
-                        "email": target.email,
-                        "name": target.name,
-                        "role": target.role.value,
-                    }
-                    if target
-                    else None
-                ),
-            }
-        )
+    result = [_log_item(row) for row in db.execute(stmt).all()]
     return {
         "data": result,
         "meta": {
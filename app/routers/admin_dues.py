@@ -9,9 +9,19 @@ admin_dues.py
 
 주요 기능:
 - 월별 회비 청구 생성 및 목록 조회
-- 회원별 회비 납부 기록 생성
+- 학기 / 연간 회비 청구 일정 일괄 생성
+- 회비 기간 마감 (이후 납부 거부, 회원별 / 기간 합계 스냅샷 저장)
+- 회원별 회비 납부 기록 생성 (Idempotency-Key 재시도 안전)
+- 일괄 납부 금액을 오래된 미납 청구부터 자동 배분 (FIFO)
+- 회비 납부 기록 일괄 등록 (CSV / JSON-lines / XLSX 업로드)
+- 은행 거래내역 CSV 대사 및 납부 후보 일괄 확정
 - 월별 회비 납부 현황 조회 (PAID / PARTIAL / UNPAID)
 - 관리자용 CSV / Excel(xlsx) 데이터 내보내기
+- 회원 × 기간 회비 매트릭스 조회 (JSON / CSV / XLSX)
+- 회원별 누적 미납 랭킹 조회 (정렬 + 커서 페이지네이션)
+- 연속 / 최근 M개월 중 K개월 미납 회원 조회 (완납 비트셋)
+- 기간별 수납 통계 조회 (청구 / 수납 총액, 수납률, 납부 방법 · 학년별)
+- 회비 캐시 통계 조회
 
 설계 원칙:
 - 모든 엔드포인트는 관리자 권한(get_current_admin)을 요구
@@ -25,56 +35,138 @@ admin_dues.py
 - app.schemas.dues         : 요청/응답 스키마 정의
 """
 
-import csv
 import io
-from starlette.responses import StreamingResponse, Response
-from openpyxl import Workbook
+import tempfile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse, JSONResponse
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
 
 
 from app.core.deps import get_db, get_current_admin
 from app.models.user import User
-from app.models.dues import DuesCharge, DuesPayment
-from app.services.dues import validate_period, create_charge, record_payment, admin_status_for_period
+from app.services.dues import (
+    validate_period,
+    get_charge_by_period,
+    MAX_SCHEDULE_PERIODS,
+    ChargeAlreadyExists,
+    create_charge,
+    build_charge_schedule,
+    create_charge_schedule,
+    record_payment,
+    allocate_payment,
+    admin_status_for_period,
+    STREAM_BATCH_SIZE,
+    dues_matrix,
+    arrears_ranking,
+)
+from app.services.dues_cache import charge_cache, analytics_cache, status_cache, paid_bitsets
+from app.services.dues_analytics import collection_analytics
+from app.services.dues_close import close_period
+from app.services.dues_delinquency import find_delinquent_members
+from app.services.dues_export import (
+    write_xlsx,
+    iter_file_chunks,
+    iter_csv,
+    iter_status_csv,
+    iter_payments_csv,
+    matrix_table,
+    XLSX_MEDIA_TYPE,
+)
+from app.services.dues_import import import_payments, PARSERS, CONTENT_TYPE_FORMATS, UploadParseError
+from app.services.dues_bank import parse_bank_csv, reconcile_bank_lines
+from app.services.idempotency import (
+    IdempotencyKeyMismatch,
+    request_fingerprint,
+    find_stored_response,
+    store_response,
+)
 from app.schemas.dues import (
     ChargeCreateRequest,
+    ChargeScheduleRequest,
     ChargeResponse,
     PaymentCreateRequest,
+    PaymentAllocateRequest,
     PaymentResponse,
     AdminDuesUserStatus,
+    ReconcileConfirmRequest,
 )
 
 router = APIRouter(prefix="/admin/dues", tags=["admin-dues"])
 
 
+# Idempotency-Key 로 저장된 응답 → JSONResponse (없으면 None, 다른 요청 본문이면 422)
+def _stored_response(db: Session, *, scope: str, key: str, request_hash: str) -> JSONResponse | None:
+    try:
+        stored = find_stored_response(db, scope=scope, key=key, request_hash=request_hash)
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if stored is None:
+        return None
+    return JSONResponse(
+        status_code=stored.status_code,
+        content=stored.response_body,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+# 같은 키의 동시 요청에 저장이 밀린 경우: 먼저 저장된 응답을 반환
+# 그 사이 키가 만료 / 정리되어 응답이 없으면 409 (이 요청은 이미 rollback 되었으므로 재시도 요청)
+def _replay_lost_race(db: Session, *, scope: str, key: str, request_hash: str) -> JSONResponse:
+    replay = _stored_response(db, scope=scope, key=key, request_hash=request_hash)
+    if replay is None:
+        raise HTTPException(status_code=409, detail="idempotency key in use, retry")
+    return replay
+
+
+# 납부 기록 응답 항목 (DuesPayment 또는 RETURNING Row)
+def _payment_data(payment) -> dict:
+    return {
+        "id": str(payment.id),
+        "user_id": str(payment.user_id),
+        "charge_id": str(payment.charge_id),
+        "amount": payment.amount,
+        "method": payment.method,
+        "memo": payment.memo,
+        "created_by": str(payment.created_by),
+        "created_at": payment.created_at.isoformat() if payment.created_at else None,
+    }
+
+
 """
 관리자 전용 회비 청구 생성 API
 
 - 특정 period(YYYY-MM)에 대한 회비 청구를 생성
-- 동일 period에 대한 중복 청구는 허용하지 않음
+- 동일 period에 대한 중복 청구는 허용하지 않음 (동시 요청 포함, 409)
 - 실제 비즈니스 검증 로직은 service(create_charge)에서 처리
+- Idempotency-Key 헤더: 같은 키의 재요청은 저장된 원래 응답 반환
 
 """
 @router.post("/charges")
 def create_dues_charge(
     body: ChargeCreateRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin),
 ):
-    try:
+    scope = "POST /admin/dues/charges"
+    request_hash = request_fingerprint(admin.id, body.model_dump(mode="json"))
+    if idempotency_key:
+        replay = _stored_response(db, scope=scope, key=idempotency_key, request_hash=request_hash)
+        if replay is not None:
+            return replay
 
+    try:
         charge = create_charge(
             db,
             period=body.period,
             amount=body.amount,
             created_by=admin.id,
         )
-        db.commit()
-        db.refresh(charge)
-        return {
+        response = {
             "data": {
                 "id": str(charge.id),
                 "period": charge.period,
@@ -83,6 +175,17 @@ def create_dues_charge(
                 "created_at": charge.created_at.isoformat() if charge.created_at else None,
             }
         }
+        if idempotency_key and not store_response(
+            db, scope=scope, key=idempotency_key, request_hash=request_hash, status_code=200, body=response,
+        ):
+            # 같은 키의 동시 요청이 먼저 반영됨 → 이 요청은 취소하고 먼저 저장된 응답 반환
+            db.rollback()
+            return _replay_lost_race(db, scope=scope, key=idempotency_key, request_hash=request_hash)
+        db.commit()
+        return response
+    except ChargeAlreadyExists as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
@@ -91,11 +194,67 @@ def create_dues_charge(
         raise
 
 
+"""
+관리자 전용 회비 청구 일정 일괄 생성 API
+
+- 학기 / 1년치 청구를 한 번에 생성
+- 범위: {"from": "2026-03", "to": "2027-02", "amount": 10000}
+- 목록: {"charges": [{"period": "2026-03", "amount": 10000}, ...]}
+  (범위와 함께 주면 해당 period 금액을 덮어씀)
+- 이미 청구가 있는 period 는 건너뛰고 created / skipped 로 보고
+- 전체가 한 트랜잭션 (INSERT ... ON CONFLICT DO NOTHING ... RETURNING 1회)
+
+"""
+@router.post("/charges/schedule")
+def create_dues_charge_schedule(
+    body: ChargeScheduleRequest,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    try:
+        schedule = build_charge_schedule(
+            from_period=body.from_period,
+            to_period=body.to_period,
+            amount=body.amount,
+            items=[(c.period, c.amount) for c in body.charges],
+        )
+        created, skipped = create_charge_schedule(db, schedule=schedule, created_by=admin.id)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "data": {
+            "created": [
+                {
+                    "id": str(c.id),
+                    "period": c.period,
+                    "amount": c.amount,
+                    "created_by": str(c.created_by),
+                    "created_at": c.created_at.isoformat() if c.created_at else None,
+                }
+                for c in created
+            ],
+            "skipped": skipped,
+        },
+        "meta": {
+            "requested": len(schedule),
+            "created": len(created),
+            "skipped": len(skipped),
+        },
+    }
+
+
 """
 관리자 전용 회비 청구 목록 조회 API
 
 - 생성된 모든 회비 청구를 period 기준 내림차순으로 반환
 - 최신 회비 청구가 상단에 오도록 정렬
+- 프로세스 내 청구 캐시에서 응답 (청구 생성 시 무효화)
 
 """
 @router.get("/charges")
@@ -103,7 +262,7 @@ def list_dues_charges(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_admin),
 ):
-    charges = db.scalars(select(DuesCharge).order_by(desc(DuesCharge.period))).all()
+    charges = charge_cache.ordered_desc(db)
     return {
         "data": [
             {
@@ -112,6 +271,7 @@ def list_dues_charges(
                 "amount": c.amount,
                 "created_by": str(c.created_by),
                 "created_at": c.created_at.isoformat() if c.created_at else None,
+                "closed_at": c.closed_at.isoformat() if c.closed_at else None,
             }
             for c in charges
         ],
@@ -120,20 +280,70 @@ def list_dues_charges(
         }
     }
 
+"""
+관리자 전용 회비 기간 마감 API
+
+- 해당 period 청구를 마감하여 이후 납부(단건 / 일괄 / 대사 확정)를 거부
+- 마감 시점의 회원별 납부 현황 스냅샷과 기간 합계를 저장
+- 마감 이후 납부 현황 / export / 수납 통계는 스냅샷에서 조회
+- 이미 마감된 기간이면 400
+
+"""
+@router.post("/charges/{period}/close")
+def close_dues_period(
+    period: str,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    try:
+        total = close_period(db, period=period, closed_by=admin.id)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "data": {
+            "period": period,
+            "closed_at": total.closed_at.isoformat(),
+            "members": total.members,
+            "expected_total": total.expected_total,
+            "collected_total": total.collected_total,
+            "payments": total.payments,
+            "paid_count": total.paid_count,
+            "partial_count": total.partial_count,
+            "unpaid_count": total.unpaid_count,
+        }
+    }
+
+
 """
 관리자 전용 회비 납부 기록 생성 API
 
 - 특정 사용자(user_id)에 대한 회비 납부 내역을 추가
 - 부분 납부 / 추가 납부를 허용
 - 청구가 존재하지 않는 period에 대해서는 납부 불가
+- Idempotency-Key 헤더: 같은 키의 재요청은 납부를 다시 기록하지 않고 원래 응답 반환
+  (같은 키에 다른 요청 본문이면 422)
 
 """
 @router.post("/payments")
 def create_dues_payment(
     body: PaymentCreateRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin),
 ):
+    scope = "POST /admin/dues/payments"
+    request_hash = request_fingerprint(admin.id, body.model_dump(mode="json"))
+    if idempotency_key:
+        replay = _stored_response(db, scope=scope, key=idempotency_key, request_hash=request_hash)
+        if replay is not None:
+            return replay
+
     try:
         payment = record_payment(
             db,
@@ -144,20 +354,75 @@ def create_dues_payment(
             memo=body.memo,
             created_by=admin.id,
         )
+        response = {
+            "data": _payment_data(payment),
+        }
+        if idempotency_key and not store_response(
+            db, scope=scope, key=idempotency_key, request_hash=request_hash, status_code=200, body=response,
+        ):
+            # 같은 키의 동시 요청이 먼저 반영됨 → 이 요청은 취소하고 먼저 저장된 응답 반환
+            db.rollback()
+            return _replay_lost_race(db, scope=scope, key=idempotency_key, request_hash=request_hash)
         db.commit()
-        db.refresh(payment)
-        return {
-            "data": {
-                "id": str(payment.id),
-                "user_id": str(payment.user_id),
-                "charge_id": str(payment.charge_id),
-                "amount": payment.amount,
-                "method": payment.method,
-                "memo": payment.memo,
-                "created_by": str(payment.created_by),
-                "created_at": payment.created_at.isoformat() if payment.created_at else None,
-            }
+        return response
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        db.rollback()
+        raise
+
+
+"""
+관리자 전용 회비 일괄 납부 자동 배분 API
+
+- period 없이 금액만 받아 회원의 미납 / 부분 납부 청구에 오래된 period 부터 배분 (FIFO)
+- 마감된 청구는 배분 대상에서 제외
+- 미납 잔액 합계를 넘는 금액이면 400 (아무것도 저장하지 않음)
+- 배분 결과(청구별 납부 기록)를 한 트랜잭션에 저장
+- Idempotency-Key 헤더: 납부 기록 생성 API 와 동일
+
+"""
+@router.post("/payments/allocate")
+def allocate_dues_payment(
+    body: PaymentAllocateRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    scope = "POST /admin/dues/payments/allocate"
+    request_hash = request_fingerprint(admin.id, body.model_dump(mode="json"))
+    if idempotency_key:
+        replay = _stored_response(db, scope=scope, key=idempotency_key, request_hash=request_hash)
+        if replay is not None:
+            return replay
+
+    try:
+        payments = allocate_payment(
+            db,
+            user_id=body.user_id,
+            amount=body.amount,
+            method=body.method,
+            memo=body.memo,
+            created_by=admin.id,
+        )
+        response = {
+            "data": [
+                {**_payment_data(p), "period": period}
+                for p, period in payments
+            ],
+            "meta": {
+                "count": len(payments),
+                "amount": body.amount,
+            },
         }
+        if idempotency_key and not store_response(
+            db, scope=scope, key=idempotency_key, request_hash=request_hash, status_code=200, body=response,
+        ):
+            db.rollback()
+            return _replay_lost_race(db, scope=scope, key=idempotency_key, request_hash=request_hash)
+        db.commit()
+        return response
     except ValueError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
@@ -166,6 +431,162 @@ def create_dues_payment(
         raise
 
 
+"""
+관리자 전용 회비 납부 기록 일괄 등록 API
+
+- 요청 본문(body)에 CSV / JSON-lines / XLSX 파일을 그대로 업로드
+- 형식은 format 쿼리 또는 Content-Type 으로 결정
+- 컬럼: user_id 또는 student_id, period, amount, method(선택), memo(선택)
+- 본문은 임시 파일(SpooledTemporaryFile)로 받아 한 행씩 스트리밍 파싱
+- mode=atomic(기본): 오류 행이 하나라도 있으면 전체 취소(400 + 오류 목록)
+- mode=best_effort : 오류 행만 건너뛰고 저장, 오류 목록 함께 반환
+
+"""
+@router.post("/payments/bulk")
+async def bulk_create_dues_payments(
+    request: Request,
+    mode: Literal["atomic", "best_effort"] = Query(default="atomic"),
+    format: Literal["csv", "jsonl", "xlsx"] | None = Query(default=None),
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = CONTENT_TYPE_FORMATS.get(content_type)
+        if format is None:
+            raise HTTPException(status_code=400, detail="unsupported upload format (use csv, jsonl or xlsx)")
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+
+        def _import():
+            try:
+                report = import_payments(
+                    db,
+                    rows=PARSERS[format](upload),
+                    mode=mode,
+                    created_by=admin.id,
+                )
+            except Exception:
+                db.rollback()
+                raise
+
+            if report["committed"]:
+                db.commit()
+            else:
+                db.rollback()
+            return report
+
+        try:
+            report = await run_in_threadpool(_import)
+        except UploadParseError as e:
+            # 파일 자체를 읽을 수 없는 경우 (깨진 CSV / XLSX, 인코딩 오류 등)
+            raise HTTPException(status_code=400, detail=f"could not parse upload: {e}")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if not report["committed"]:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "bulk upload rejected",
+                "failed": report["failed"],
+                "errors": report["errors"],
+            },
+        )
+
+    return {
+        "data": report,
+    }
+
+
+"""
+관리자 전용 은행 거래내역 대사 API
+
+- 요청 본문(body)에 은행 입금 거래내역 CSV를 그대로 업로드
+- 입금자명 / 적요의 학번 조각 / 금액으로 회원과 미납 청구를 찾아 납부 후보 제안
+- 아무것도 저장하지 않음 (확정은 /reconcile/confirm 에서 수행)
+- 회원 / 미납 청구 인덱스는 대사 1회당 한 번만 조회
+
+"""
+@router.post("/reconcile")
+async def reconcile_bank_statement(
+    request: Request,
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    body = await request.body()
+
+    def _reconcile():
+        lines = parse_bank_csv(io.BytesIO(body))
+        return reconcile_bank_lines(db, lines=lines)
+
+    try:
+        result = await run_in_threadpool(_reconcile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "data": result,
+        "meta": {
+            "suggested": len(result["suggestions"]),
+            "unmatched": len(result["unmatched"]),
+        },
+    }
+
+
+"""
+관리자 전용 대사 결과 일괄 확정 API
+
+- /reconcile 에서 받은 제안(suggestions) 중 확정할 항목을 그대로 전달
+- 일괄 등록과 같은 경로(import_payments, atomic)로 한 트랜잭션에 저장
+- 한 건이라도 유효하지 않으면 전체 취소(400 + 오류 목록)
+
+"""
+@router.post("/reconcile/confirm")
+def confirm_reconciled_payments(
+    body: ReconcileConfirmRequest,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    rows = (
+        (i, {
+            "user_id": str(p.user_id),
+            "period": p.period,
+            "amount": p.amount,
+            "method": p.method,
+            "memo": p.memo,
+        })
+        for i, p in enumerate(body.payments, start=1)
+    )
+
+    try:
+        report = import_payments(db, rows=rows, mode="atomic", created_by=admin.id)
+        if report["committed"]:
+            db.commit()
+        else:
+            db.rollback()
+    except Exception:
+        db.rollback()
+        raise
+
+    if not report["committed"]:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "confirmation rejected",
+                "failed": report["failed"],
+                "errors": report["errors"],
+            },
+        )
+
+    return {
+        "data": report,
+    }
+
+
 """
 관리자 전용 월별 회비 납부 현황 조회 API
 
@@ -196,12 +617,12 @@ def status_for_period(
 
     result = [
         {
-            "user_id": str(r["user"].id),
-            "name": r["user"].name,
-            "student_id": r["user"].student_id,
-            "amount_due": r["amount_due"],
-            "paid_amount": r["paid_amount"],
-            "status": r["status"],
+            "user_id": str(r.user_id),
+            "name": r.name,
+            "student_id": r.student_id,
+            "amount_due": r.amount_due,
+            "paid_amount": r.paid_amount,
+            "status": r.status,
         }
         for r in rows
     ]
@@ -217,7 +638,8 @@ def status_for_period(
     관리자용 월별 회비 납부 현황 CSV 다운로드 API
 
     - 지정한 period(YYYY-MM)의 회원별 납부 상태를 CSV 파일로 반환
-    - StreamingResponse를 사용해 대용량 데이터도 메모리 부담 없이 처리
+    - Postgres 는 COPY ... TO STDOUT 결과를 그대로 전송, 그 외 DB 는 서버 측 커서 + 묶음 단위 전송
+    - BOM + 헤더를 쿼리 전에 먼저 전송하여 첫 바이트까지의 시간 단축
     - UTF-8 BOM을 추가하여 Excel에서 한글이 깨지지 않도록 처리
 
 """
@@ -232,35 +654,7 @@ def export_status_csv(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    charge, rows = admin_status_for_period(db, period=period)
-
-    def generate():
-        # Excel에서 UTF-8 CSV 한글 깨짐 방지를 위해 BOM(Byte Order Mark) 먼저 출력
-        yield "\ufeff"
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # CSV 헤더 행
-        writer.writerow(
-            ["period", "name", "student_id", "status", "amount_due", "paid_amount"]
-        )
-        yield output.getvalue()
-        output.seek(0)
-        output.truncate(0)
-
-        # charge 없으면 헤더만 내보내고 종료
-        if not charge:
-            return
-
-        for r in rows:
-            u = r["user"]
-            writer.writerow(
-                [period, u.name, u.student_id, r["status"], r["amount_due"], r["paid_amount"]]
-            )
-            yield output.getvalue()
-            output.seek(0)
-            output.truncate(0)
+    charge = get_charge_by_period(db, period)
 
     filename = f"dues_status_{period}.csv"
     headers = {
@@ -268,7 +662,7 @@ def export_status_csv(
     }
 
     return StreamingResponse(
-        generate(),
+        iter_status_csv(db, period=period, charge=charge),
         media_type="text/csv; charset=utf-8",
         headers=headers,
     )
@@ -279,6 +673,7 @@ def export_status_csv(
 
 - 특정 월(period)에 대한 모든 납부 기록을 CSV로 제공
 - 납부 ID, 사용자 ID, 금액, 결제 수단, 메모 등 원본 데이터 포함
+- Postgres 는 COPY ... TO STDOUT 결과를 그대로 전송, 그 외 DB 는 서버 측 커서 + 묶음 단위 전송
 - BOM을 포함한 UTF-8 CSV로 Excel 호환성 보장
 
 """
@@ -294,50 +689,15 @@ def export_payments_csv(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    charge = db.scalar(select(DuesCharge).where(DuesCharge.period == period))
-
-    def generate():
-        # Excel에서 UTF-8 CSV 한글 깨짐 방지를 위해 BOM(Byte Order Mark) 먼저 출력
-        yield "\ufeff"
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # 헤더
-        writer.writerow(["period", "payment_id", "user_id", "amount", "method", "memo", "created_by", "created_at"])
-        yield output.getvalue()
-        output.seek(0)
-        output.truncate(0)
-
-        # 해당 월 청구가 없으면 헤더만
-        if not charge:
-            return
-
-        payments = db.scalars(
-            select(DuesPayment)
-            .where(DuesPayment.charge_id == charge.id)
-            .order_by(desc(DuesPayment.created_at))
-        ).all()
-
-        for p in payments:
-            # CSV는 문자열 기반 포맷이므로 UUID / datetime은 문자열로 변환
-            writer.writerow([
-                period,
-                str(p.id),
-                str(p.user_id),
-                p.amount,
-                p.method,
-                p.memo or "",
-                str(p.created_by),
-                p.created_at.isoformat() if p.created_at else "",
-            ])
-            yield output.getvalue()
-            output.seek(0)
-            output.truncate(0)
+    charge = get_charge_by_period(db, period)
 
     filename = f"dues_payments_{period}.csv"
     headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    return StreamingResponse(generate(), media_type="text/csv; charset=utf-8", headers=headers)
+    return StreamingResponse(
+        iter_payments_csv(db, period=period, charge=charge),
+        media_type="text/csv; charset=utf-8",
+        headers=headers,
+    )
 
 # NOTE:
 # - 회비 관련 비즈니스 로직은 service 계층에서 처리
@@ -347,60 +707,261 @@ def export_payments_csv(
 관리자용 월별 회비 납부 현황 Excel(xlsx) 다운로드 API
 
 - CSV 대신 Excel 형식이 필요한 경우를 위한 엔드포인트
-- openpyxl을 사용하여 XLSX 파일 생성
+- openpyxl write-only 모드로 XLSX 파일 생성 (행을 메모리에 쌓지 않음)
+- period 를 여러 번 주면 한 워크북에 period 마다 시트 하나 (?period=2026-01&period=2026-02)
+- 완성된 파일은 임시 파일(SpooledTemporaryFile)에서 청크 단위로 스트리밍
 - 한글 깨짐 없이 바로 Excel에서 열 수 있음
 
 """
 
 @router.get("/export.xlsx")
 def export_status_xlsx(
-    period: str = Query(..., description="예: 2026-01"),
+    period: list[str] = Query(..., description="예: 2026-01 (여러 번 지정 가능)"),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_admin),
 ):
+    periods = list(dict.fromkeys(period))
     try:
-        validate_period(period)
+        for p in periods:
+            validate_period(p)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if len(periods) > MAX_SCHEDULE_PERIODS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_SCHEDULE_PERIODS} periods per export")
+
+    header = ["period", "name", "student_id", "status", "amount_due", "paid_amount"]
+
+    # 시트는 하나씩 만들어지므로 한 번에 한 period 의 현황만 메모리에 유지
+    def sheets():
+        for p in periods:
+            charge, rows = admin_status_for_period(db, period=p)
+            yield p, header, (
+                [p, r.name, r.student_id, r.status, r.amount_due, r.paid_amount]
+                for r in (rows if charge else [])
+            )
 
-    charge, rows = admin_status_for_period(db, period=period)
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "dues_status"
-
-    # Excel 시트 헤더
-    ws.append(["period", "name", "student_id", "status", "amount_due", "paid_amount"])
-
-    # 데이터
-    if charge:
-        for r in rows:
-            u = r["user"]
-            ws.append([
-                period,
-                u.name,
-                u.student_id,
-                r["status"],
-                r["amount_due"],
-                r["paid_amount"],
-            ])
-
-    buf = io.BytesIO()
-    wb.save(buf)
-    data = buf.getvalue()
+    xlsx = write_xlsx(sheets())
 
     # Content-Disposition 헤더를 통해 브라우저에서 파일 다운로드로 처리
-    filename = f"dues_status_{period}.xlsx"
+    suffix = periods[0] if len(periods) == 1 else f"{periods[0]}_{periods[-1]}"
+    filename = f"dues_status_{suffix}.xlsx"
     headers = {
         "Content-Disposition": f'attachment; filename="{filename}"'
     }
 
-    return Response(
-        content=data,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers,
-    )
+    return StreamingResponse(iter_file_chunks(xlsx), media_type=XLSX_MEDIA_TYPE, headers=headers)
 
 # NOTE:
 # CSV는 엑셀 호환성 문제로 BOM + UTF-8 스트리밍 방식 사용
 # XLSX는 Excel에서 바로 열기 위한 대안 포맷
+
+
+
+"""
+관리자용 회원 × 기간 회비 매트릭스 API
+
+- from ~ to(YYYY-MM) 범위의 청구를 열로, 회원을 행으로 하는 피벗 표
+- 각 칸은 해당 기간의 납부 금액(paid_amount)과 상태(status)
+- 월별 /status 를 여러 번 호출하는 대신 한 번의 집계 쿼리로 계산
+- format: json(기본) / csv / xlsx
+
+"""
+
+@router.get("/matrix")
+def dues_matrix_view(
+    from_period: str = Query(..., alias="from", description="예: 2026-01"),
+    to_period: str = Query(..., alias="to", description="예: 2026-12"),
+    format: Literal["json", "csv", "xlsx"] = Query(default="json"),
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    try:
+        charges, rows = dues_matrix(db, from_period=from_period, to_period=to_period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    periods = [c.period for c in charges]
+
+    if format == "json":
+        return {
+            "data": {
+                "periods": [{"period": c.period, "amount": c.amount} for c in charges],
+                "rows": [
+                    {
+                        "user_id": str(r.user_id),
+                        "name": r.name,
+                        "student_id": r.student_id,
+                        "cells": [
+                            {"paid_amount": paid, "status": st}
+                            for paid, st in zip(r.paid_amounts, r.statuses)
+                        ],
+                    }
+                    for r in rows
+                ],
+            },
+            "meta": {
+                "from": from_period,
+                "to": to_period,
+                "count": len(rows),
+            },
+        }
+
+    header, table = matrix_table(periods, rows)
+
+    filename = f"dues_matrix_{from_period}_{to_period}"
+
+    if format == "csv":
+        batches = (
+            table[i:i + STREAM_BATCH_SIZE]
+            for i in range(0, len(table), STREAM_BATCH_SIZE)
+        )
+        headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"'}
+        return StreamingResponse(iter_csv(header, batches), media_type="text/csv; charset=utf-8", headers=headers)
+
+    xlsx = write_xlsx([("dues_matrix", header, table)])
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.xlsx"'}
+    return StreamingResponse(iter_file_chunks(xlsx), media_type=XLSX_MEDIA_TYPE, headers=headers)
+
+
+"""
+관리자용 회원별 누적 미납 랭킹 API
+
+- 활성 회원 전체의 누적 미납 금액 / 미납 기간 수 / 가장 오래된 미납 기간
+- sort: arrears(기본, 많은 순) / unpaid_periods / oldest / name / student_id
+- cursor: 이전 응답 meta.next_cursor 값을 그대로 전달
+- owing_only=true 이면 미납이 있는 회원만 반환
+
+"""
+
+@router.get("/arrears")
+def list_arrears(
+    sort: Literal["arrears", "unpaid_periods", "oldest", "name", "student_id"] = Query(default="arrears"),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    owing_only: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    try:
+        rows, next_cursor, total = arrears_ranking(
+            db,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            owing_only=owing_only,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "data": [
+            {
+                "user_id": str(r.user_id),
+                "name": r.name,
+                "student_id": r.student_id,
+                "arrears_total": int(r.arrears_total),
+                "unpaid_periods": r.unpaid_periods,
+                "oldest_unpaid_period": r.oldest_unpaid,
+            }
+            for r in rows
+        ],
+        "meta": {
+            "count": len(rows),
+            "total": total,
+            "sort": sort,
+            "next_cursor": next_cursor,
+        },
+    }
+
+
+"""
+관리자용 연체 회원 조회 API
+
+- consecutive=N           : 최근 N개 청구를 연속 미납한 회원
+- missed=K & window=M     : 최근 M개 청구 중 K개 이상 미납한 회원
+- to=YYYY-MM 지정 시 그 기간 이하 청구 기준 (기본: 최신 청구)
+- 청구별 완납 비트셋(프로세스 내 캐시)으로 판정, 회원별 미납 기간 목록 포함
+
+"""
+
+@router.get("/delinquency")
+def list_delinquent_members(
+    consecutive: int | None = Query(default=None),
+    missed: int | None = Query(default=None),
+    window: int | None = Query(default=None),
+    to_period: str | None = Query(default=None, alias="to", description="예: 2026-06"),
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    try:
+        periods, members = find_delinquent_members(
+            db,
+            consecutive=consecutive,
+            missed=missed,
+            window=window,
+            to_period=to_period,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "data": [{**m, "user_id": str(m["user_id"])} for m in members],
+        "meta": {
+            "count": len(members),
+            "periods": periods,
+        },
+    }
+
+
+"""
+관리자용 기간별 수납 통계 API
+
+- from ~ to(YYYY-MM) 범위의 청구별 청구 총액 / 수납 총액 / 수납률
+- 납부 방법별(by_method) · 회원 학년별(by_grade) 세부 통계 포함
+- 마감된(현재 월 이전) 기간은 캐시에서 응답 (meta.cached)
+
+"""
+
+@router.get("/analytics")
+def dues_analytics(
+    from_period: str = Query(..., alias="from", description="예: 2026-01"),
+    to_period: str = Query(..., alias="to", description="예: 2026-12"),
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    try:
+        items, cached = collection_analytics(db, from_period=from_period, to_period=to_period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "data": items,
+        "meta": {
+            "from": from_period,
+            "to": to_period,
+            "count": len(items),
+            "cached": cached,
+        },
+    }
+
+
+"""
+관리자 전용 회비 캐시 통계 API
+
+- 프로세스 내 회비 청구 / 수납 통계 / 납부 현황 캐시의 hit / miss / 무효화 횟수와 적재 건수
+- 납부 현황은 동시 요청 병합(coalesced) 횟수와 진행 중 계산 수도 포함
+- 통계는 워커(프로세스)별로 집계됨
+
+"""
+@router.get("/cache/stats")
+def dues_cache_stats(
+    _: User = Depends(get_current_admin),
+):
+    return {
+        "data": {
+            "charges": charge_cache.stats(),
+            "analytics": analytics_cache.stats(),
+            "status": status_cache.stats(),
+            "paid_bitsets": paid_bitsets.stats(),
+        }
+    }
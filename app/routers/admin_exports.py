@@ -0,0 +1,140 @@
+"""
+admin_exports.py
+
+관리자 전용 백그라운드 export 작업 API.
+
+연간 / 여러 기간 XLSX 보고서처럼 생성에 오래 걸리는 파일을
+요청 워커와 프록시 타임아웃에 묶이지 않도록 작업으로 등록하고,
+진행 상태를 조회한 뒤 완성된 파일을 내려받는다.
+
+주요 기능:
+- export 작업 등록 (납부 현황 CSV / XLSX, 납부 내역 CSV, 연간 보고서 XLSX)
+- 같은 요청 + 같은 데이터의 작업 / 파일 재사용
+- 작업 상태 / 진행률 조회
+- 완성된 파일 다운로드 (Range 요청 지원, 이어받기 가능)
+
+설계 원칙:
+- 모든 엔드포인트는 관리자 권한(get_current_admin)을 요구
+- 작업 등록 / 재사용 판단은 service 계층(app.services.dues_export_jobs)에 위임
+- 작업 실행 요청은 등록 트랜잭션 commit 후 (워커가 QUEUED 행을 볼 수 있도록)
+
+관련 파일:
+- app.services.dues_export_jobs : 작업 등록 / 실행 / 재사용
+- app.models.export_job         : export_jobs 테이블
+- app.schemas.dues              : 요청 스키마 (ExportJobRequest)
+"""
+
+import os
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from starlette.responses import FileResponse, JSONResponse
+
+from app.core.deps import get_db, get_current_admin
+from app.models.export_job import ExportJob
+from app.models.user import User
+from app.schemas.dues import ExportJobRequest
+from app.services.dues_export_jobs import (
+    normalize_export_request,
+    submit_export,
+    get_export_job,
+    export_runner,
+)
+
+router = APIRouter(prefix="/admin/exports", tags=["admin-exports"])
+
+
+def _job_data(job: ExportJob) -> dict:
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "params": job.params,
+        "status": job.status,
+        "progress": job.progress,
+        "error": job.error,
+        "filename": job.filename,
+        "size": job.size,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "expires_at": job.expires_at.isoformat(),
+        "download_url": f"{router.prefix}/{job.id}/file" if job.status == "DONE" else None,
+    }
+
+
+"""
+export 작업 등록 API
+
+- kind: status_csv / payments_csv (periods 1개), status_xlsx (periods 여러 개), year_xlsx (year)
+- 같은 요청이고 대상 데이터가 바뀌지 않았으면 기존 작업을 그대로 반환 (meta.reused=true)
+  · 이미 완성된 파일이면 200, 새로 등록했거나 진행 중이면 202
+- 상태는 GET /admin/exports/{id} 로 조회
+
+"""
+
+@router.post("")
+def create_export_job(
+    body: ExportJobRequest,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    try:
+        params = normalize_export_request(body.kind, periods=body.periods, year=body.year)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job, reused = submit_export(db, kind=body.kind, params=params, created_by=admin.id)
+    db.commit()
+    if not reused:
+        export_runner.submit(job)
+
+    return JSONResponse(
+        status_code=200 if job.status == "DONE" else 202,
+        content={"data": _job_data(job), "meta": {"reused": reused}},
+    )
+
+
+"""
+export 작업 상태 조회 API
+
+- status: QUEUED / RUNNING / DONE / FAILED, progress: 0 ~ 100
+- DONE 이면 download_url 포함
+- 없거나 만료된 작업은 404
+
+"""
+
+@router.get("/{job_id}")
+def get_export_job_status(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    job = get_export_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="export job not found")
+    return {"data": _job_data(job)}
+
+
+"""
+export 파일 다운로드 API
+
+- DONE 작업의 파일을 그대로 전송 (Range 요청 시 206 부분 응답)
+- 아직 끝나지 않았으면 409, 없거나 만료되었거나 파일이 지워졌으면 404
+
+"""
+
+@router.get("/{job_id}/file")
+def download_export_file(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    job = get_export_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="export job not found")
+    if job.status != "DONE":
+        raise HTTPException(status_code=409, detail=f"export job is {job.status}")
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=404, detail="export file not found")
+
+    return FileResponse(job.file_path, media_type=job.media_type, filename=job.filename)
@@ -11,12 +11,14 @@ dues.py
 주요 기능:
 - 본인 기준 월별 회비 납부 상태 조회
 - 본인 기준 회비 납부 내역 조회
+- 본인 기준 회비 명세(청구 + 납부 원장, 누적 잔액) 조회
 
 설계 원칙:
 - MEMBER 이상 권한만 접근 가능
 - 모든 데이터는 "본인 기준"으로만 조회
 - 회비 계산 로직은 service 계층(app.services.dues)에 위임
 - 회비 미청구 기간도 안전하게 처리 (NO_CHARGE 상태 반환)
+- 회비 버전 기반 ETag: If-None-Match 일치 시 계산 없이 304 반환
 
 관련 파일:
 - app.services.dues        : 회비 계산 및 누적 미납 로직
@@ -25,18 +27,65 @@ dues.py
 
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc
 
 from app.core.deps import get_db, get_current_member
 from app.models.user import User
-from app.models.dues import DuesCharge, DuesPayment
-from app.services.dues import validate_period, sum_paid_for_charge, arrears_total
+from app.models.dues import DuesPayment
+from app.services.dues import (
+    validate_period,
+    get_charge_by_period,
+    my_dues_summary,
+    dues_statement,
+    dues_etag,
+    STATEMENT_CHARGE,
+)
 from app.schemas.dues import MyDuesStatusResponse, PaymentResponse
 
 router = APIRouter(prefix="/dues", tags=["dues"])
 
+
+# If-None-Match 헤더에 etag 가 포함되어 있는지 (약한 비교, '*' 허용)
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+"""
+회원 회비 조회 공통 의존성 (ETag / 304)
+
+- 로그인 회원 조회(get_current_member) 외에 추가 쿼리 없음
+- ETag 는 회원 id + 회원의 회비 버전(users.dues_version) 기반
+  (본인 납부 / 새 청구가 생기면 증가, 버전이 같아도 회원마다 다른 ETag)
+- 200 / 304 모두 Vary: Authorization (같은 브라우저의 다른 계정이 캐시를 재사용하지 않도록)
+- If-None-Match 가 일치하면 회비 계산 전에 304 Not Modified 반환
+- 일치하지 않으면 응답에 ETag 헤더를 붙이고 회원 반환
+
+"""
+
+def get_member_with_dues_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_member),
+) -> User:
+    etag = dues_etag(current_user.id, current_user.dues_version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return current_user
+
+
 """
 회원 본인 회비 납부 현황 조회 API
 
@@ -44,25 +93,26 @@ router = APIRouter(prefix="/dues", tags=["dues"])
 - period 미지정 시 가장 최신 회비 청구 기준으로 조회
 - 납부 상태를 PAID / PARTIAL / UNPAID / NO_CHARGE 로 계산
 - 누적 미납 금액(arrears_total)을 함께 반환
+- 청구 수와 관계없이 단일 집계 쿼리로 계산 (service: my_dues_summary)
 
 """
 @router.get("/me")
 def my_dues_status(
     period: str | None = Query(default=None, description="예: 2026-01"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_member),
+    current_user: User = Depends(get_member_with_dues_etag),
 ):
-    # period 미지정이면 가장 최신 period(문자열 정렬 기준) 사용
     if period:
         try:
             validate_period(period)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
-        charge = db.scalar(select(DuesCharge).where(DuesCharge.period == period))
-    else:
-        charge = db.scalar(select(DuesCharge).order_by(desc(DuesCharge.period)))
 
-    if not charge:
+    # period 미지정이면 가장 최신 period(문자열 정렬 기준) 사용
+    # 청구 / 납부 합계 / 상태 / 누적 미납을 한 번의 집계 쿼리로 계산
+    summary = my_dues_summary(db, user_id=current_user.id, period=period)
+
+    if not summary:
         return {
             "data": {
                 "current_period": None,
@@ -73,24 +123,8 @@ def my_dues_status(
             }
         }
 
-    paid = sum_paid_for_charge(db, user_id=current_user.id, charge_id=charge.id)
-    if paid <= 0:
-        status = "UNPAID"
-    elif paid < charge.amount:
-        status = "PARTIAL"
-    else:
-        status = "PAID"
-
-    arrears = arrears_total(db, user_id=current_user.id)
-
     return {
-        "data": {
-            "current_period": charge.period,
-            "current_amount": charge.amount,
-            "paid_amount": paid,
-            "status": status,
-            "arrears_total": arrears,
-        }
+        "data": summary,
     }
 
 """
@@ -105,7 +139,7 @@ def my_dues_status(
 def my_payments(
     period: str | None = Query(default=None, description="예: 2026-01"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_member),
+    current_user: User = Depends(get_member_with_dues_etag),
 ):
     if period:
         try:
@@ -113,7 +147,7 @@ def my_payments(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-        charge = db.scalar(select(DuesCharge).where(DuesCharge.period == period))
+        charge = get_charge_by_period(db, period)
         if not charge:
             return {
                 "data": [],
@@ -153,3 +187,55 @@ def my_payments(
             "count": len(payments),
         }
     }
+
+
+"""
+회원 본인 회비 명세(statement) 조회 API
+
+- 청구와 본인 납부 내역을 시간순으로 합친 원장 + 항목별 누적 잔액(balance)
+- balance 는 청구 합계 - 납부 합계 (양수면 미납, 음수면 초과 납부)
+- order=desc(기본, 최신순) / asc, 커서 기반 페이지네이션 (meta.next_cursor)
+- 기간 / 납부 수와 관계없이 단일 쿼리 (service: dues_statement)
+
+"""
+@router.get("/me/statement")
+def my_statement(
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    order: Literal["asc", "desc"] = Query(default="desc"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_member_with_dues_etag),
+):
+    try:
+        rows, next_cursor, total, closing_balance = dues_statement(
+            db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            order=order,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "data": [
+            {
+                "type": "CHARGE" if r.kind == STATEMENT_CHARGE else "PAYMENT",
+                "id": str(r.id),
+                "period": r.period,
+                "occurred_at": r.occurred_at.isoformat(),
+                "amount": r.amount,
+                "method": r.method,
+                "memo": r.memo,
+                "balance": int(r.balance),
+            }
+            for r in rows
+        ],
+        "meta": {
+            "count": len(rows),
+            "total": total,
+            "closing_balance": closing_balance,
+            "order": order,
+            "next_cursor": next_cursor,
+        },
+    }
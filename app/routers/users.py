@@ -12,7 +12,7 @@ users.py
 
 주요 기능:
 - 본인 프로필 정보 조회
-- 동아리 소속 회원 목록 조회 (공개 정보만)
+- 동아리 소속 회원 목록 조회 (공개 정보만, NDJSON / JSON 스트리밍 지원)
 
 설계 원칙:
 - MEMBER 이상 권한만 접근 가능
@@ -25,8 +25,9 @@ users.py
 """
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from app.core.deps import get_current_member, get_db
+from app.core.streaming import stream_format, streaming_list_response
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.models.user import User, Role
@@ -54,6 +55,16 @@ def profile(current_user: User = Depends(get_current_member)):
         }
     }
 
+
+# 회원용 목록 응답 항목 (공개 정보만)
+def _member_item(u) -> dict:
+    return {
+        "name": u.name,
+        "student_id": u.student_id,
+        "grade": u.grade,
+    }
+
+
 """
 동아리 회원 목록 조회 API (회원용)
 
@@ -61,27 +72,28 @@ def profile(current_user: User = Depends(get_current_member)):
 - Soft Delete되지 않은 활성 회원만 포함
 - 학번 기준 오름차순 정렬
 - 공개 가능한 최소 정보만 반환 (이름, 학번, 학년)
+- Accept: application/x-ndjson 또는 stream=true 이면 서버 측 커서로 스트리밍
 
 """
 @router.get("/all")
 def list_all_users(
+    stream: bool = Query(default=False),
+    accept: str | None = Header(default=None),
     db: Session = Depends(get_db),
     member: User = Depends(get_current_member),
 ):
-    users = db.scalars(
-        select(User)
+    stmt = (
+        select(User.name, User.student_id, User.grade)
         .where(User.role == Role.MEMBER, User.is_deleted.is_(False))
         .order_by(User.student_id)
-    ).all()
+    )
+    fmt = stream_format(accept, stream)
+    if fmt is not None:
+        return streaming_list_response(fmt, db, stmt, _member_item)
+
+    users = db.execute(stmt).all()
     return {
-        "data": [
-            {
-                "name": u.name,
-                "student_id": u.student_id,
-                "grade": u.grade,
-            }
-            for u in users
-        ],
+        "data": [_member_item(u) for u in users],
         "meta": {
             "count": len(users),
         }
@@ -13,6 +13,22 @@ class ChargeCreateRequest(BaseModel):
     amount: int = Field(..., ge=0, examples=[10000])
 
 
+class ChargeScheduleItem(BaseModel):
+    period: PeriodStr = Field(..., examples=["2026-03"])
+    amount: int = Field(..., ge=0, examples=[10000])
+
+
+class ChargeScheduleRequest(BaseModel):
+    """범위(from ~ to, 기본 금액 amount) 또는 charges 목록, 둘 다 주면 charges 가 범위 금액을 덮어씀."""
+
+    from_period: Optional[PeriodStr] = Field(default=None, alias="from", examples=["2026-03"])
+    to_period: Optional[PeriodStr] = Field(default=None, alias="to", examples=["2027-02"])
+    amount: Optional[int] = Field(default=None, ge=0, examples=[10000])
+    charges: List[ChargeScheduleItem] = Field(default_factory=list)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
 class ChargeResponse(BaseModel):
     id: uuid.UUID
     period: PeriodStr
@@ -34,6 +50,30 @@ class PaymentCreateRequest(BaseModel):
     memo: Optional[str] = None
 
 
+class PaymentAllocateRequest(BaseModel):
+    """period 없이 금액만 받아 오래된 미납 청구부터 배분 (FIFO)."""
+
+    user_id: uuid.UUID
+    amount: int = Field(..., gt=0, examples=[30000])
+    method: PaymentMethod = "TRANSFER"
+    memo: Optional[str] = None
+
+
+class ReconcileConfirmRequest(BaseModel):
+    payments: List[PaymentCreateRequest] = Field(..., min_length=1)
+
+
+ExportKind = Literal["status_csv", "status_xlsx", "payments_csv", "year_xlsx"]
+
+
+class ExportJobRequest(BaseModel):
+    """CSV 는 periods 1개, status_xlsx 는 periods 여러 개, year_xlsx 는 year."""
+
+    kind: ExportKind
+    periods: List[PeriodStr] = Field(default_factory=list, examples=[["2026-01"]])
+    year: Optional[int] = Field(default=None, examples=[2026])
+
+
 class PaymentResponse(BaseModel):
     id: uuid.UUID
     user_id: uuid.UUID
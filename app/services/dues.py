@@ -13,22 +13,33 @@ services/dues.py
 - 회비 관련 모든 규칙을 한 곳에 집중
 - period 형식 검증을 공통 함수로 제공
 - 금액 계산은 항상 DB 기준으로 수행
+- 납부 잔액은 dues_balances 원장에 증분 반영하고, 조회는 원장 기준으로 수행
 
 관련 파일:
-- app.models.dues        : DuesCharge / DuesPayment 모델
+- app.models.dues        : DuesCharge / DuesPayment / DuesBalance 모델
 - app.models.user        : User / Role 모델
 - app.routers.admin_dues : 관리자 회비 API
 - app.routers.dues       : 회원 회비 조회 API
 
 """
 
+import base64
+import json
 import re
 import uuid
-from sqlalchemy import select, func
+from datetime import datetime
+from sqlalchemy import (
+    select, insert, update, exists, true, func, case, desc, literal, literal_column, values, column, union_all, tuple_,
+    type_coerce, Integer, SmallInteger, String,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert, aggregate_order_by, UUID
 from sqlalchemy.orm import Session
 
-from app.models.dues import DuesCharge, DuesPayment
+from app.models.dues import DuesCharge, DuesPayment, DuesBalance, DuesPeriodSnapshot, PAYMENT_METHOD_CODES
 from app.models.user import User, Role
+from app.services.dues_cache import (
+    ChargeInfo, charge_cache, status_cache, invalidate_charges, mark_payments, mark_paid_members,
+)
 
 
 _PERIOD_RE = re.compile(r"^\d{4}-\d{2}$")
@@ -58,40 +69,194 @@ def validate_period(period: str) -> None:
 """
 특정 period의 회비 청구 조회
 
+- 프로세스 내 청구 캐시(dues_cache)에서 조회 → 불변 스냅샷(ChargeInfo) 반환
 - 존재하지 않으면 None 반환
 
 """
 
-def get_charge_by_period(db: Session, period: str) -> DuesCharge | None:
-    return db.scalar(select(DuesCharge).where(DuesCharge.period == period))
+def get_charge_by_period(db: Session, period: str) -> ChargeInfo | None:
+    return charge_cache.by_period(db, period)
+
+class ChargeAlreadyExists(ValueError):
+    """같은 period 의 청구가 이미 있음 (라우터에서 409 로 변환)."""
+
 
 """
 회비 청구 생성
 
-- period 중복 생성 불가
-- 생성 즉시 DB flush 수행
+- period 중복 생성 불가 (UNIQUE 제약 기준, 동시 요청도 한쪽만 생성)
+- 청구 INSERT ... ON CONFLICT DO NOTHING ... RETURNING,
+  현재 MEMBER / ADMIN 회원의 잔액 원장(UNPAID) 행 생성,
+  전체 회원의 회비 버전(dues_version) 증가를 CTE 로 묶어 한 문장으로 실행
+- 이미 있는 period 면 ChargeAlreadyExists
+- 생성 후 청구 캐시 무효화
+- 반환: 생성된 청구 Row (id, period, amount, created_by, created_at)
 
 """
-def create_charge(db: Session, *, period: str, amount: int, created_by: uuid.UUID) -> DuesCharge:
+def create_charge(db: Session, *, period: str, amount: int, created_by: uuid.UUID):
     validate_period(period)
 
-    existing = get_charge_by_period(db, period)
-    if existing:
-        raise ValueError("charge for that period already exists")
+    charge = (
+        pg_insert(DuesCharge)
+        .values(
+            id=uuid.uuid4(),
+            period=period,
+            amount=amount,
+            created_by=created_by,
+            created_at=datetime.utcnow(),
+        )
+        .on_conflict_do_nothing(index_elements=[DuesCharge.period])
+        .returning(
+            DuesCharge.id,
+            DuesCharge.period,
+            DuesCharge.amount,
+            DuesCharge.created_by,
+            DuesCharge.created_at,
+        )
+        .cte("new_charge")
+    )
+    seeded = _seed_balances_stmt(charge).cte("seeded")
+    bumped = _bump_versions_stmt().where(exists(select(charge.c.id))).cte("bumped")
+
+    created = db.execute(select(charge).add_cte(seeded, bumped)).one_or_none()
+    if created is None:
+        raise ChargeAlreadyExists("charge for that period already exists")
 
-    charge = DuesCharge(period=period, amount=amount, created_by=created_by)
+    invalidate_charges(db)
+    return created
 
-    db.add(charge)
-    db.flush()
-    return charge
+
+# 한 번의 일정 생성 요청에서 허용하는 최대 period 수 (10년)
+MAX_SCHEDULE_PERIODS = 120
+
+
+"""
+period 범위 전개
+
+- from_period ~ to_period (양 끝 포함)를 'YYYY-MM' 목록으로 전개
+- 범위가 뒤집혔거나 MAX_SCHEDULE_PERIODS 를 넘으면 ValueError
+
+"""
+
+def expand_period_range(from_period: str, to_period: str) -> list[str]:
+    validate_period(from_period)
+    validate_period(to_period)
+    if from_period > to_period:
+        raise ValueError("from must not be later than to")
+
+    year, month = map(int, from_period.split("-"))
+    end_year, end_month = map(int, to_period.split("-"))
+    count = (end_year - year) * 12 + (end_month - month) + 1
+    if count > MAX_SCHEDULE_PERIODS:
+        raise ValueError(f"schedule must not exceed {MAX_SCHEDULE_PERIODS} periods")
+
+    periods = []
+    for _ in range(count):
+        periods.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
+
+
+"""
+청구 일정 요청 → {period: amount}
+
+- 범위(from_period ~ to_period) 는 기본 금액(amount)으로 전개
+- items [(period, amount)] 는 범위 금액을 덮어쓰거나 period 를 추가
+- 범위와 items 가 모두 없거나, 범위에 금액이 없거나, items 에 같은 period 가 중복되면 ValueError
+
+"""
+
+def build_charge_schedule(
+    *,
+    from_period: str | None,
+    to_period: str | None,
+    amount: int | None,
+    items: list[tuple[str, int]],
+) -> dict[str, int]:
+    schedule: dict[str, int] = {}
+    if from_period or to_period:
+        if not (from_period and to_period):
+            raise ValueError("from and to must be given together")
+        if amount is None:
+            raise ValueError("amount is required for a period range")
+        schedule = {p: amount for p in expand_period_range(from_period, to_period)}
+    elif not items:
+        raise ValueError("either from/to or charges is required")
+
+    seen = set()
+    for period, item_amount in items:
+        if period in seen:
+            raise ValueError(f"duplicate period in charges: {period}")
+        seen.add(period)
+        schedule[period] = item_amount
+    return schedule
+
+
+"""
+회비 청구 일정 일괄 생성
+
+- schedule: {period: amount} (period 오름차순으로 처리)
+- INSERT ... ON CONFLICT (period) DO NOTHING ... RETURNING 한 번으로
+  없는 청구만 생성 (이미 있는 period 는 건너뜀)
+- 생성된 청구의 잔액 원장(UNPAID) 행도 같은 트랜잭션에서 한 번에 생성
+- 청구가 하나라도 생성되면 전체 회원의 회비 버전 증가
+- 반환: (created, skipped)
+  created : 생성된 청구 Row (id, period, amount, created_by, created_at) 목록
+  skipped : 이미 청구가 있어 건너뛴 period 목록
+
+"""
+
+def create_charge_schedule(db: Session, *, schedule: dict[str, int], created_by: uuid.UUID):
+    if not schedule:
+        raise ValueError("schedule is empty")
+    if len(schedule) > MAX_SCHEDULE_PERIODS:
+        raise ValueError(f"schedule must not exceed {MAX_SCHEDULE_PERIODS} periods")
+    for period, amount in schedule.items():
+        validate_period(period)
+        if amount < 0:
+            raise ValueError("amount must be greater than or equal to 0")
+
+    periods = sorted(schedule)
+    stmt = (
+        pg_insert(DuesCharge)
+        .values([
+            {"id": uuid.uuid4(), "period": p, "amount": schedule[p], "created_by": created_by}
+            for p in periods
+        ])
+        .on_conflict_do_nothing(index_elements=[DuesCharge.period])
+        .returning(
+            DuesCharge.id,
+            DuesCharge.period,
+            DuesCharge.amount,
+            DuesCharge.created_by,
+            DuesCharge.created_at,
+        )
+    )
+    created = sorted(db.execute(stmt).all(), key=lambda r: r.period)
+
+    if created:
+        seed_balances_for_charges(db, charge_ids=[r.id for r in created])
+        bump_dues_versions(db)
+        invalidate_charges(db)
+
+    created_periods = {r.period for r in created}
+    skipped = [p for p in periods if p not in created_periods]
+    return created, skipped
 
 
 """
 회비 납부 기록 생성
 
 - 해당 period에 대한 청구가 존재해야 함
+- 마감된 period 에는 납부 불가
 - user 존재 여부 검증
 - 부분 납부 / 추가 납부 허용
+- 납부 INSERT ... SELECT (dues_charges JOIN users) ... RETURNING,
+  잔액 원장 반영, 회원 회비 버전 증가를 CTE 로 묶어 한 문장으로 실행
+- 청구 행을 FOR SHARE 로 잠가 진행 중인 마감이 끝나면 마감 여부를 다시 확인
+  (문장 시작 시점 스냅샷만 보면 마감 직후 납부가 스냅샷에서 빠짐)
+- 삽입된 행이 없을 때만 원인(회원 없음 / 마감)을 추가로 조회
+- 반환: 생성된 납부 Row (id, user_id, charge_id, amount, method, memo, created_by, created_at)
 
 """
 def record_payment(
@@ -103,58 +268,390 @@ def record_payment(
     method: str,
     memo: str | None,
     created_by: uuid.UUID,
-) -> DuesPayment:
+):
     validate_period(period)
     charge = get_charge_by_period(db, period)
     if not charge:
         raise ValueError("charge not found for that period")
+    if charge.closed_at is not None:
+        raise ValueError("period is closed")
+
+    payment = (
+        insert(DuesPayment)
+        .from_select(
+            ["id", "user_id", "charge_id", "amount", "method", "memo", "created_by", "created_at"],
+            select(
+                literal(uuid.uuid4(), DuesPayment.id.type),
+                User.id,
+                DuesCharge.id,
+                literal(amount, Integer),
+                literal(method, DuesPayment.method.type),
+                literal(memo, DuesPayment.memo.type),
+                literal(created_by, DuesPayment.created_by.type),
+                literal(datetime.utcnow(), DuesPayment.created_at.type),
+            )
+            .select_from(DuesCharge)
+            .join(User, User.id == user_id)
+            .where(DuesCharge.id == charge.id)
+            .where(DuesCharge.closed_at.is_(None))
+            # 마감(FOR UPDATE)과 직렬화: 잠금 대기 후 최신 행으로 closed_at 을 다시 확인
+            .with_for_update(read=True, of=DuesCharge),
+        )
+        .returning(
+            DuesPayment.id,
+            DuesPayment.user_id,
+            DuesPayment.charge_id,
+            DuesPayment.amount,
+            DuesPayment.method,
+            DuesPayment.memo,
+            DuesPayment.created_by,
+            DuesPayment.created_at,
+        )
+        .cte("new_payment")
+    )
+    deltas = select(payment.c.user_id, payment.c.charge_id, payment.c.amount.label("delta")).subquery()
+    balanced = _balance_upsert_stmt(deltas).returning(DuesBalance.status).cte("balanced")
+    bumped = _bump_versions_stmt().where(User.id.in_(select(payment.c.user_id))).cte("bumped")
+
+    mark_payments(db, {charge.id})
+    created = db.execute(
+        select(payment, balanced.c.status.label("balance_status"))
+        .join_from(payment, balanced, true())
+        .add_cte(bumped)
+    ).one_or_none()
+    if created is None:
+        # user 존재 검증 (MEMBER/ADMIN 포함), 아니면 캐시 이후 마감된 청구
+        if db.scalar(select(User.id).where(User.id == user_id)) is None:
+            raise ValueError("user not found")
+        raise ValueError("period is closed")
+
+    mark_paid_members(db, {charge.id}, {(user_id, charge.id)} if created.balance_status == "PAID" else set())
+    return created
+
+
+"""
+회비 일괄 납부 금액 자동 배분 (FIFO)
+
+- 한 번에 받은 금액을 회원의 미납 / 부분 납부 청구에 오래된 period 부터 채워 넣음
+- 마감된 청구와 금액이 0 인 청구는 제외
+- 미납 잔액 조회 1회 + 납부 행 다중 INSERT 1회 + 잔액 원장 반영 1회
+- 회원 행을 잠가(FOR UPDATE) 같은 회원에 대한 동시 배분이 같은 잔액을 나눠 갖지 않도록 함
+- 금액이 미납 잔액 합계를 넘으면 ValueError (초과 납부는 period 를 지정한 납부로 처리)
+- 반환: [(생성된 DuesPayment, period)] (period 오름차순, period 는 미납 잔액 조회에서 함께 읽음)
+
+"""
+def allocate_payment(
+    db: Session,
+    *,
+    user_id: uuid.UUID,
+    amount: int,
+    method: str,
+    memo: str | None,
+    created_by: uuid.UUID,
+) -> list[tuple[DuesPayment, str]]:
+    if amount <= 0:
+        raise ValueError("amount must be positive")
 
-    # user 존재 검증 (MEMBER/ADMIN 포함)
-    user = db.scalar(select(User).where(User.id == user_id))
-    if not user:
+    user = db.scalar(select(User.id).where(User.id == user_id).with_for_update())
+    if user is None:
         raise ValueError("user not found")
 
-    payment = DuesPayment(
-        user_id=user_id,
-        charge_id=charge.id,
-        amount=amount,
-        method=method,
-        memo=memo,
-        created_by=created_by,
+    outstanding = DuesCharge.amount - func.coalesce(DuesBalance.paid_amount, 0)
+    open_charges = db.execute(
+        select(DuesCharge.id, DuesCharge.period, outstanding.label("outstanding"))
+        .outerjoin(
+            DuesBalance,
+            (DuesBalance.charge_id == DuesCharge.id) & (DuesBalance.user_id == user_id),
+        )
+        .where(DuesCharge.closed_at.is_(None))
+        .where(outstanding > 0)
+        .order_by(DuesCharge.period)
+    ).all()
+
+    rows = []
+    periods = []
+    remaining = amount
+    for charge in open_charges:
+        if remaining <= 0:
+            break
+        part = min(remaining, charge.outstanding)
+        rows.append({
+            "user_id": user_id,
+            "charge_id": charge.id,
+            "amount": part,
+            "method": method,
+            "memo": memo,
+            "created_by": created_by,
+        })
+        periods.append(charge.period)
+        remaining -= part
+
+    if not rows:
+        raise ValueError("no open charges for that user")
+    if remaining > 0:
+        raise ValueError(f"amount exceeds open balance ({amount - remaining})")
+
+    payments = list(db.scalars(insert(DuesPayment).returning(DuesPayment, sort_by_parameter_order=True), rows))
+    apply_balance_deltas(db, {(user_id, r["charge_id"]): r["amount"] for r in rows})
+    return list(zip(payments, periods))
+
+
+"""
+회비 잔액 원장(dues_balances) 증분 반영
+
+- deltas: {(user_id, charge_id): 추가 납부 금액}
+- 한 번의 INSERT ... ON CONFLICT DO UPDATE 로 여러 (회원, 청구) 잔액을 갱신
+- 상태(PAID / PARTIAL / UNPAID)는 갱신된 누적 금액과 청구 금액으로 재계산
+- 마감된 청구가 포함되면 ValueError (호출 측 rollback)
+- 반영된 청구는 commit 후 수납 통계 캐시에서 무효화
+- 반영된 회원의 회비 버전(dues_version) 증가
+- 트랜잭션 제어(commit)는 호출 측에서 수행
+
+"""
+
+def apply_balance_deltas(db: Session, deltas: dict[tuple[uuid.UUID, uuid.UUID], int]):
+    if not deltas:
+        return []
+
+    v = values(
+        column("user_id", UUID(as_uuid=True)),
+        column("charge_id", UUID(as_uuid=True)),
+        column("delta", Integer),
+        name="v",
+    ).data([(user_id, charge_id, delta) for (user_id, charge_id), delta in deltas.items()])
+
+    stmt = _balance_upsert_stmt(v).returning(
+        DuesBalance.user_id, DuesBalance.charge_id, DuesBalance.paid_amount, DuesBalance.status,
+    )
+
+    mark_payments(db, {charge_id for _, charge_id in deltas})
+    rows = db.execute(stmt).all()
+    if len(rows) != len(deltas):
+        # 마감된 청구는 SELECT 에서 빠짐 (캐시가 늦게 갱신된 워커 / 마감과 동시에 들어온 납부)
+        raise ValueError("period is closed")
+    mark_paid_members(
+        db,
+        {charge_id for _, charge_id in deltas},
+        {(r.user_id, r.charge_id) for r in rows if r.status == "PAID"},
+    )
+    bump_dues_versions(db, user_ids={user_id for user_id, _ in deltas})
+    return rows
+
+
+"""
+잔액 원장 증분 UPSERT 문
+
+- deltas: (user_id, charge_id, delta) 컬럼을 가진 FROM 절 (VALUES 또는 방금 INSERT 한 납부 CTE)
+- 마감된 청구의 행은 SELECT 에서 제외
+- 상태(PAID / PARTIAL / UNPAID)는 갱신된 누적 금액과 청구 금액으로 재계산
+
+"""
+
+def _balance_upsert_stmt(deltas):
+    stmt = pg_insert(DuesBalance).from_select(
+        ["user_id", "charge_id", "paid_amount", "status", "updated_at"],
+        select(
+            deltas.c.user_id,
+            deltas.c.charge_id,
+            deltas.c.delta,
+            dues_status_case(deltas.c.delta, DuesCharge.amount),
+            func.now(),
+        )
+        .join(DuesCharge, DuesCharge.id == deltas.c.charge_id)
+        .where(DuesCharge.closed_at.is_(None)),
+    )
+    new_paid = DuesBalance.paid_amount + stmt.excluded.paid_amount
+    # ON CONFLICT 절은 상관 서브쿼리 대상으로 인식되지 않으므로 excluded 를 직접 참조
+    charge_amount = (
+        select(DuesCharge.amount)
+        .where(DuesCharge.id == literal_column("excluded.charge_id"))
+        .scalar_subquery()
     )
-    db.add(payment)
-    db.flush()
-    return payment
+    return stmt.on_conflict_do_update(
+        index_elements=[DuesBalance.user_id, DuesBalance.charge_id],
+        set_={
+            "paid_amount": new_paid,
+            "status": dues_status_case(new_paid, charge_amount),
+            "updated_at": func.now(),
+        },
+    )
+
+
+"""
+청구 생성 시 회원 잔액 원장 초기화
+
+- 현재 MEMBER / ADMIN 회원마다 paid_amount=0, UNPAID 행 생성
+- 이미 존재하는 행은 건드리지 않음 (ON CONFLICT DO NOTHING)
+- 원장 행이 없는 (회원, 청구)는 조회 시 UNPAID / 0 으로 간주
+
+"""
+
+def seed_balances_for_charges(db: Session, *, charge_ids: list[uuid.UUID]) -> None:
+    if not charge_ids:
+        return
+
+    charges = select(DuesCharge.id).where(DuesCharge.id.in_(charge_ids)).subquery()
+    db.execute(_seed_balances_stmt(charges))
+
 
+# 잔액 원장 초기화 INSERT 문 (charges: id 컬럼을 가진 FROM 절, 청구 테이블 또는 방금 INSERT 한 청구 CTE)
+def _seed_balances_stmt(charges):
+    return pg_insert(DuesBalance).from_select(
+        ["user_id", "charge_id", "paid_amount", "status", "updated_at"],
+        select(
+            User.id,
+            charges.c.id,
+            literal(0, Integer),
+            literal("UNPAID"),
+            func.now(),
+        )
+        .select_from(User)
+        .join(charges, true())
+        .where(User.role.in_([Role.MEMBER, Role.ADMIN])),
+    ).on_conflict_do_nothing(index_elements=[DuesBalance.user_id, DuesBalance.charge_id])
 
-# 특정 회비 청구에 대해 사용자가 납부한 총 금액 계산
+
+"""
+회원 회비 버전(users.dues_version) 증가
+
+- 회원 회비 API(/dues/me, /dues/me/payments, /dues/me/statement)의 ETag 기준 값
+- user_ids 지정 시 해당 회원만 (납부 반영), None 이면 전체 회원 (청구 생성)
+- 트랜잭션 제어(commit)는 호출 측에서 수행
+
+"""
+
+def bump_dues_versions(db: Session, *, user_ids=None) -> None:
+    stmt = _bump_versions_stmt()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        stmt = stmt.where(User.id.in_(user_ids))
+    db.execute(stmt, execution_options={"synchronize_session": False})
+
+
+# 회비 버전 증가 UPDATE 문 (대상 조건은 호출 측에서 where 로 추가)
+def _bump_versions_stmt():
+    return update(User).values(dues_version=User.dues_version + 1)
+
+
+# 회원 회비 API ETag (약한 비교용, 응답 형식이 바뀌면 접두어 변경)
+# - 버전은 새 청구마다 전원이 함께 증가하므로 회원 id 를 포함 (다른 회원의 캐시와 일치하지 않도록)
+def dues_etag(user_id: uuid.UUID, dues_version: int) -> str:
+    return f'W/"dues-v1-{user_id}-{dues_version}"'
+
+
+# 특정 회비 청구에 대해 사용자가 납부한 총 금액 계산 (잔액 원장 PK 조회)
 def sum_paid_for_charge(db: Session, *, user_id: uuid.UUID, charge_id: uuid.UUID) -> int:
     paid = db.scalar(
-        select(func.coalesce(func.sum(DuesPayment.amount), 0))
-        .where(DuesPayment.user_id == user_id)
-        .where(DuesPayment.charge_id == charge_id)
+        select(DuesBalance.paid_amount)
+        .where(DuesBalance.user_id == user_id)
+        .where(DuesBalance.charge_id == charge_id)
     )
     return int(paid or 0)
 
 
 
+"""
+납부 금액 기준 회비 상태 계산 (SQL CASE 식)
+
+- paid <= 0       : UNPAID
+- paid < amount   : PARTIAL
+- 그 외           : PAID
+- 집계 쿼리 안에서 상태까지 한 번에 계산하기 위한 공통 식
+
+"""
+
+def dues_status_case(paid, amount):
+    return case(
+        (paid <= 0, "UNPAID"),
+        (paid < amount, "PARTIAL"),
+        else_="PAID",
+    )
+
+
+# 사용자의 청구별 잔액 원장 서브쿼리 (charge_id, paid, status)
+def _balances_for_user_subquery(user_id: uuid.UUID):
+    return (
+        select(
+            DuesBalance.charge_id,
+            DuesBalance.paid_amount.label("paid"),
+            DuesBalance.status.label("status"),
+        )
+        .where(DuesBalance.user_id == user_id)
+        .subquery()
+    )
+
+
 """
 사용자의 전체 회비 누적 미납 금액 계산
 
 - 모든 회비 청구 기준으로 계산
 - (청구 금액 - 납부 금액)의 합
+- 청구 LEFT JOIN 회원 잔액 원장(PK 조회)으로 단일 쿼리에서 집계
 
 """
 
 def arrears_total(db: Session, *, user_id: uuid.UUID) -> int:
-    # 모든 청구에 대해 paid < amount 인 부족분 합산
-    charges = db.scalars(select(DuesCharge)).all()
-    total = 0
-    for c in charges:
-        paid = sum_paid_for_charge(db, user_id=user_id, charge_id=c.id)
-        if paid < c.amount:
-            total += (c.amount - paid)
-    return total
+    paid = _balances_for_user_subquery(user_id)
+    total = db.scalar(
+        select(
+            func.coalesce(
+                func.sum(func.greatest(DuesCharge.amount - func.coalesce(paid.c.paid, 0), 0)),
+                0,
+            )
+        )
+        .select_from(DuesCharge)
+        .outerjoin(paid, paid.c.charge_id == DuesCharge.id)
+    )
+    return int(total or 0)
+
+
+"""
+회원 본인 회비 현황 계산 (/dues/me)
+
+- 청구 LEFT JOIN 회원 잔액 원장을 한 번의 집계 쿼리로 계산
+- 상태(PAID / PARTIAL / UNPAID)는 원장 값 사용 (원장 행이 없으면 UNPAID)
+- 누적 미납(arrears_total)은 윈도우 함수(SUM OVER)로 같은 쿼리에서 계산
+- period 미지정 시 가장 최신 period(문자열 정렬 기준) 사용
+- 해당 청구가 없으면 None 반환
+
+"""
+
+def my_dues_summary(db: Session, *, user_id: uuid.UUID, period: str | None = None) -> dict | None:
+    paid = _balances_for_user_subquery(user_id)
+    paid_amount = func.coalesce(paid.c.paid, 0)
+
+    per_charge = (
+        select(
+            DuesCharge.period.label("period"),
+            DuesCharge.amount.label("amount"),
+            paid_amount.label("paid_amount"),
+            func.coalesce(paid.c.status, "UNPAID").label("status"),
+            func.sum(func.greatest(DuesCharge.amount - paid_amount, 0)).over().label("arrears_total"),
+        )
+        .select_from(DuesCharge)
+        .outerjoin(paid, paid.c.charge_id == DuesCharge.id)
+        .subquery()
+    )
+
+    stmt = select(per_charge)
+    if period:
+        stmt = stmt.where(per_charge.c.period == period)
+    else:
+        stmt = stmt.order_by(desc(per_charge.c.period)).limit(1)
+
+    row = db.execute(stmt).first()
+    if row is None:
+        return None
+
+    return {
+        "current_period": row.period,
+        "current_amount": row.amount,
+        "paid_amount": int(row.paid_amount),
+        "status": row.status,
+        "arrears_total": int(row.arrears_total),
+    }
 
 
 """
@@ -163,6 +660,11 @@ def arrears_total(db: Session, *, user_id: uuid.UUID) -> int:
 - MEMBER / ADMIN 대상 - superadmin은 제외
 - PAID / PARTIAL / UNPAID 상태 계산
 - 청구가 없으면 (None, []) 반환
+- 대상 회원 LEFT JOIN 잔액 원장(charge_id 인덱스) 단일 쿼리로 계산
+- 마감된 청구는 마감 스냅샷(dues_period_snapshots)에서 조회 (마감 당시 회원 / 금액)
+- 같은 period 의 동시 요청은 계산 1회를 공유하고, 결과는 짧은 TTL 동안 재사용 (status_cache)
+- rows는 User ORM 객체가 아닌 경량 Row 튜플
+  (user_id, name, student_id, amount_due, paid_amount, status)
 
 """
 
@@ -172,17 +674,432 @@ def admin_status_for_period(db: Session, *, period: str):
     if not charge:
         return None, []
 
-    members = db.scalars(select(User).where(User.role.in_([Role.MEMBER, Role.ADMIN]))).all()
+    rows = status_cache.get_or_compute(("status", period), charge.id, lambda: _status_rows(db, charge))
+    return charge, rows
 
-    rows = []
-    for u in members:
-        paid = sum_paid_for_charge(db, user_id=u.id, charge_id=charge.id)
-        if paid <= 0:
-            st = "UNPAID"
-        elif paid < charge.amount:
-            st = "PARTIAL"
+
+def _status_rows(db: Session, charge: ChargeInfo) -> list:
+    return db.execute(_status_select(charge)).all()
+
+
+# 납부 현황 SELECT 문: 마감된 청구는 스냅샷, 그 외는 회원 LEFT JOIN 잔액 원장
+def _status_select(charge: ChargeInfo):
+    if charge.closed_at is not None:
+        return (
+            select(
+                DuesPeriodSnapshot.user_id,
+                DuesPeriodSnapshot.name,
+                DuesPeriodSnapshot.student_id,
+                DuesPeriodSnapshot.amount_due,
+                DuesPeriodSnapshot.paid_amount,
+                DuesPeriodSnapshot.status,
+            )
+            .where(DuesPeriodSnapshot.charge_id == charge.id)
+            .order_by(DuesPeriodSnapshot.student_id)
+        )
+    return admin_status_stmt(charge_id=charge.id, amount_due=charge.amount)
+
+
+"""
+CSV export 용 SELECT 문 (Postgres COPY 에 그대로 사용)
+
+- 컬럼 이름 / 순서 / 값 표현이 CSV 헤더와 같음
+- 납부 방법은 코드 대신 CASH / TRANSFER / ETC, 일시는 UTC ISO-8601 문자열
+
+"""
+
+def admin_status_export_stmt(charge: ChargeInfo):
+    status = _status_select(charge).order_by(None).subquery()
+    return (
+        select(
+            literal(charge.period, String).label("period"),
+            status.c.name,
+            status.c.student_id,
+            status.c.status,
+            status.c.amount_due,
+            status.c.paid_amount,
+        )
+        .order_by(status.c.student_id)
+    )
+
+
+def payment_export_stmt(charge: ChargeInfo):
+    return (
+        select(
+            literal(charge.period, String).label("period"),
+            DuesPayment.id.label("payment_id"),
+            DuesPayment.user_id,
+            DuesPayment.amount,
+            case(
+                {code: name for name, code in PAYMENT_METHOD_CODES.items()},
+                value=type_coerce(DuesPayment.method, SmallInteger),
+                else_="ETC",
+            ).label("method"),
+            DuesPayment.memo,
+            DuesPayment.created_by,
+            func.to_char(
+                func.timezone("UTC", DuesPayment.created_at),
+                'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"',
+            ).label("created_at"),
+        )
+        .where(DuesPayment.charge_id == charge.id)
+        .order_by(desc(DuesPayment.created_at))
+    )
+
+
+# export 스트리밍 시 서버 측 커서에서 한 번에 가져오는 행 수
+STREAM_BATCH_SIZE = 500
+
+
+"""
+관리자용 납부 현황 행 스트리밍 (CSV export)
+
+- admin_status_for_period 와 같은 행을 batch_size 개씩 나눈 목록으로 반환 (generator)
+- 요청 병합 캐시(status_cache)에 결과가 있으면 그대로 나눠서 반환 (use_cache=False 면 항상 DB)
+- 없으면 서버 측 커서(stream_results / yield_per)로 읽어 전체 행을 메모리에 올리지 않음
+- 첫 batch 를 요청할 때 쿼리 실행 (응답 헤더 / 첫 줄은 쿼리 전에 전송 가능)
+
+"""
+
+def iter_admin_status_rows(
+    db: Session,
+    *,
+    charge: ChargeInfo,
+    batch_size: int = STREAM_BATCH_SIZE,
+    use_cache: bool = True,
+):
+    cached = status_cache.peek(("status", charge.period), charge.id) if use_cache else None
+    if cached is not None:
+        for i in range(0, len(cached), batch_size):
+            yield cached[i:i + batch_size]
+        return
+
+    result = db.execute(
+        _status_select(charge),
+        execution_options={"stream_results": True, "yield_per": batch_size},
+    )
+    yield from result.partitions()
+
+
+"""
+관리자용 청구별 납부 기록 스트리밍 (CSV export)
+
+- 해당 청구의 납부 기록을 최신순으로 batch_size 개씩 나눈 목록으로 반환 (generator)
+- ORM 객체 대신 필요한 컬럼만 서버 측 커서로 읽음
+
+"""
+
+def iter_payment_rows(db: Session, *, charge_id: uuid.UUID, batch_size: int = STREAM_BATCH_SIZE):
+    result = db.execute(
+        select(
+            DuesPayment.id,
+            DuesPayment.user_id,
+            DuesPayment.amount,
+            DuesPayment.method,
+            DuesPayment.memo,
+            DuesPayment.created_by,
+            DuesPayment.created_at,
+        )
+        .where(DuesPayment.charge_id == charge_id)
+        .order_by(desc(DuesPayment.created_at)),
+        execution_options={"stream_results": True, "yield_per": batch_size},
+    )
+    yield from result.partitions()
+
+
+# 특정 청구에 대한 회원별 납부 현황 SELECT 문 (학번 오름차순)
+def admin_status_stmt(*, charge_id: uuid.UUID, amount_due: int):
+    return (
+        select(
+            User.id.label("user_id"),
+            User.name.label("name"),
+            User.student_id.label("student_id"),
+            literal(amount_due, Integer).label("amount_due"),
+            func.coalesce(DuesBalance.paid_amount, 0).label("paid_amount"),
+            func.coalesce(DuesBalance.status, "UNPAID").label("status"),
+        )
+        .select_from(User)
+        .outerjoin(
+            DuesBalance,
+            (DuesBalance.user_id == User.id) & (DuesBalance.charge_id == charge_id),
+        )
+        .where(User.role.in_([Role.MEMBER, Role.ADMIN]))
+        .order_by(User.student_id)
+    )
+
+
+"""
+관리자용 회원 × 기간 회비 매트릭스 계산
+
+- from_period ~ to_period 범위의 청구를 열(column)로,
+  MEMBER / ADMIN 회원을 행(row)으로 하는 피벗 표
+- 회원 × 청구 CROSS JOIN 후 잔액 원장 LEFT JOIN,
+  회원별 GROUP BY + array_agg(ORDER BY period) 로 한 번에 피벗
+- 반환: (charges, rows)
+  charges : 범위 내 청구 Row (period, amount) 목록 (period 오름차순)
+  rows    : (user_id, name, student_id, paid_amounts[], statuses[]) Row 목록
+            배열 순서는 charges 순서와 동일
+
+"""
+
+def dues_matrix(db: Session, *, from_period: str, to_period: str):
+    validate_period(from_period)
+    validate_period(to_period)
+    if from_period > to_period:
+        raise ValueError("from must not be later than to")
+
+    in_range = DuesCharge.period.between(from_period, to_period)
+
+    charges = db.execute(
+        select(DuesCharge.period, DuesCharge.amount)
+        .where(in_range)
+        .order_by(DuesCharge.period)
+    ).all()
+    if not charges:
+        return [], []
+
+    rows = db.execute(
+        select(
+            User.id.label("user_id"),
+            User.name.label("name"),
+            User.student_id.label("student_id"),
+            func.array_agg(
+                aggregate_order_by(func.coalesce(DuesBalance.paid_amount, 0), DuesCharge.period)
+            ).label("paid_amounts"),
+            func.array_agg(
+                aggregate_order_by(func.coalesce(DuesBalance.status, "UNPAID"), DuesCharge.period)
+            ).label("statuses"),
+        )
+        .select_from(User)
+        .join(DuesCharge, in_range)
+        .outerjoin(
+            DuesBalance,
+            (DuesBalance.user_id == User.id) & (DuesBalance.charge_id == DuesCharge.id),
+        )
+        .where(User.role.in_([Role.MEMBER, Role.ADMIN]))
+        .group_by(User.id, User.name, User.student_id)
+        .order_by(User.student_id)
+    ).all()
+
+    return charges, rows
+
+
+# 미납 랭킹 정렬 기준 → (정렬 키 이름, 내림차순 여부, 커서 값 타입)
+ARREARS_SORTS = {
+    "arrears": ("arrears_total", True, int),
+    "unpaid_periods": ("unpaid_periods", True, int),
+    "oldest": ("oldest_key", False, str),
+    "name": ("name", False, str),
+    "student_id": ("student_id", False, str),
+}
+
+# 미납 기간이 없는 회원의 oldest 정렬 키 (항상 뒤로)
+_NO_UNPAID_KEY = "9999-99"
+
+
+def _encode_cursor(values: list) -> str:
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str, size: int = 2) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("invalid cursor")
+    return values
+
+
+"""
+관리자용 회원별 누적 미납 랭킹
+
+- 활성 회원(MEMBER / ADMIN) × 전체 청구 LEFT JOIN 잔액 원장을 회원별로 집계
+  arrears_total  : 누적 미납 금액
+  unpaid_periods : 미납/부분납 기간 수
+  oldest_unpaid  : 가장 오래된 미납 기간 (없으면 None)
+  total          : 전체 대상 회원 수 (COUNT(*) OVER ())
+- sort: arrears / unpaid_periods (내림차순), oldest / name / student_id (오름차순)
+- 커서 기반 페이지네이션: (정렬 키, 학번) keyset, 다음 커서는 불투명 문자열
+  커서 값의 타입이 정렬 키 / 학번 타입과 다르면 ValueError("invalid cursor")
+- 반환: (rows, next_cursor, total)
+
+"""
+
+def arrears_ranking(
+    db: Session,
+    *,
+    sort: str = "arrears",
+    limit: int = 50,
+    cursor: str | None = None,
+    owing_only: bool = False,
+):
+    if sort not in ARREARS_SORTS:
+        raise ValueError("invalid sort")
+    key_name, descending, key_type = ARREARS_SORTS[sort]
+
+    outstanding = func.greatest(DuesCharge.amount - func.coalesce(DuesBalance.paid_amount, 0), 0)
+    owing = outstanding > 0
+
+    per_member = (
+        select(
+            User.id.label("user_id"),
+            User.name.label("name"),
+            User.student_id.label("student_id"),
+            func.coalesce(func.sum(outstanding), 0).label("arrears_total"),
+            func.count().filter(owing).label("unpaid_periods"),
+            func.min(DuesCharge.period).filter(owing).label("oldest_unpaid"),
+            func.count().over().label("total"),
+        )
+        .select_from(User)
+        .outerjoin(DuesCharge, literal(True))
+        .outerjoin(
+            DuesBalance,
+            (DuesBalance.user_id == User.id) & (DuesBalance.charge_id == DuesCharge.id),
+        )
+        .where(User.role.in_([Role.MEMBER, Role.ADMIN]))
+        .group_by(User.id, User.name, User.student_id)
+    )
+    if owing_only:
+        per_member = per_member.having(func.sum(outstanding) > 0)
+    per_member = per_member.subquery()
+
+    oldest_key = func.coalesce(per_member.c.oldest_unpaid, literal(_NO_UNPAID_KEY, DuesCharge.period.type))
+    sort_col = oldest_key if key_name == "oldest_key" else per_member.c[key_name]
+
+    stmt = select(per_member)
+    if cursor:
+        value, last_student_id = _decode_cursor(cursor)
+        # bool 은 int 의 하위 타입이므로 정확한 타입으로 비교 (잘못된 값이 DB 오류(500)가 되지 않도록)
+        if type(value) is not key_type or type(last_student_id) is not str:
+            raise ValueError("invalid cursor")
+        if key_name == "oldest_key" and not _PERIOD_RE.match(value):
+            raise ValueError("invalid cursor")
+        after = sort_col < value if descending else sort_col > value
+        stmt = stmt.where(after | ((sort_col == value) & (per_member.c.student_id > last_student_id)))
+
+    stmt = stmt.order_by(
+        sort_col.desc() if descending else sort_col.asc(),
+        per_member.c.student_id.asc(),
+    ).limit(limit + 1)
+
+    rows = db.execute(stmt).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if key_name == "oldest_key":
+            value = last.oldest_unpaid or _NO_UNPAID_KEY
         else:
-            st = "PAID"
-        rows.append({"user": u, "amount_due": charge.amount, "paid_amount": paid, "status": st})
-    return charge, rows
+            value = getattr(last, key_name)
+        next_cursor = _encode_cursor([value, last.student_id])
+
+    # total 은 커서 조건 적용 전에 계산된 윈도우 값이므로 어느 행에서 읽어도 동일
+    total = rows[0].total if rows else 0
+    return rows, next_cursor, total
+
+
+# 회비 명세 항목 종류 (같은 시각이면 청구가 납부보다 먼저)
+STATEMENT_CHARGE = 0
+STATEMENT_PAYMENT = 1
+
+
+"""
+회원 본인 회비 명세(statement)
+
+- 청구(dues_charges)와 본인 납부(dues_payments)를 UNION ALL 한 원장을
+  발생 시각(created_at) → 종류(청구 먼저) → id 순으로 정렬
+- balance         : 해당 항목까지의 누적 잔액 (청구 합계 - 납부 합계, 양수면 미납)
+                    SUM(...) OVER (ORDER BY ...) 윈도우 함수로 계산
+- total           : 전체 항목 수 (COUNT(*) OVER ())
+- closing_balance : 전체 원장 기준 최종 잔액 (SUM(...) OVER ())
+- order: desc(기본, 최신순) / asc
+- 커서 기반 페이지네이션: (발생 시각, 종류, id) keyset
+  누적 잔액은 커서 조건 적용 전 전체 원장 기준이므로 페이지와 무관하게 동일
+  커서 값의 타입이 (문자열, 종류 정수, 문자열)이 아니거나 변환할 수 없으면 ValueError("invalid cursor")
+- 기간 / 납부 수와 관계없이 쿼리 1회
+- 반환: (rows, next_cursor, total, closing_balance)
+
+"""
+
+def dues_statement(
+    db: Session,
+    *,
+    user_id: uuid.UUID,
+    limit: int = 50,
+    cursor: str | None = None,
+    order: str = "desc",
+):
+    if order not in ("asc", "desc"):
+        raise ValueError("invalid order")
+
+    charges = select(
+        literal(STATEMENT_CHARGE, Integer).label("kind"),
+        DuesCharge.id.label("id"),
+        DuesCharge.period.label("period"),
+        DuesCharge.created_at.label("occurred_at"),
+        DuesCharge.amount.label("amount"),
+        literal(None, DuesPayment.method.type).label("method"),
+        literal(None, DuesPayment.memo.type).label("memo"),
+    )
+    payments = (
+        select(
+            literal(STATEMENT_PAYMENT, Integer),
+            DuesPayment.id,
+            DuesCharge.period,
+            DuesPayment.created_at,
+            DuesPayment.amount,
+            DuesPayment.method,
+            DuesPayment.memo,
+        )
+        .join(DuesCharge, DuesCharge.id == DuesPayment.charge_id)
+        .where(DuesPayment.user_id == user_id)
+    )
+    ledger = union_all(charges, payments).subquery()
+
+    signed = case((ledger.c.kind == STATEMENT_CHARGE, ledger.c.amount), else_=-ledger.c.amount)
+    chronological = (ledger.c.occurred_at, ledger.c.kind, ledger.c.id)
+    entries = select(
+        ledger,
+        func.sum(signed).over(order_by=chronological, rows=(None, 0)).label("balance"),
+        func.sum(signed).over().label("closing_balance"),
+        func.count().over().label("total"),
+    ).subquery()
+
+    key = (entries.c.occurred_at, entries.c.kind, entries.c.id)
+    stmt = select(entries)
+    if cursor:
+        occurred_at, kind, entry_id = _decode_cursor(cursor, size=3)
+        # 변환 전에 타입 확인 (uuid.UUID(5) 는 AttributeError → 500 이 되지 않도록)
+        if (
+            type(occurred_at) is not str
+            or kind not in (STATEMENT_CHARGE, STATEMENT_PAYMENT) or type(kind) is not int
+            or type(entry_id) is not str
+        ):
+            raise ValueError("invalid cursor")
+        try:
+            after = (datetime.fromisoformat(occurred_at), kind, uuid.UUID(entry_id))
+        except ValueError:
+            raise ValueError("invalid cursor")
+        if order == "desc":
+            stmt = stmt.where(tuple_(*key) < tuple_(*after))
+        else:
+            stmt = stmt.where(tuple_(*key) > tuple_(*after))
+
+    stmt = stmt.order_by(*[(c.desc() if order == "desc" else c.asc()) for c in key]).limit(limit + 1)
+    rows = db.execute(stmt).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor([last.occurred_at.isoformat(), last.kind, str(last.id)])
+
+    if rows:
+        return rows, next_cursor, rows[0].total, int(rows[0].closing_balance)
 
+    # 마지막 페이지 이후 등으로 행이 없을 때는 전체 값만 따로 계산
+    totals = db.execute(select(func.count(), func.coalesce(func.sum(signed), 0)).select_from(ledger)).one()
+    return [], None, totals[0], int(totals[1])
@@ -0,0 +1,236 @@
+"""
+services/dues_analytics.py
+
+회비 기간별 수납 통계(Analytics) 서비스.
+
+이 파일은 from ~ to 범위의 회비 청구마다
+청구 총액(expected) / 수납 총액(collected) / 수납률과
+납부 방법별 · 회원 학년별 세부 통계를 계산한다.
+
+주요 기능:
+- 청구 대상(회원 × 청구) 행과 납부 행을 UNION ALL 한 뒤
+  GROUPING SETS ((period), (period, method), (period, grade)) 로 한 번에 집계
+- 마감(close)된 period 는 마감 합계 스냅샷(dues_period_totals)에서 응답
+- 마감 전이지만 지난(현재 월 이전) period 의 결과는 프로세스 내 캐시(dues_cache)에 보관
+- 캐시에 없는 period 만 모아서 쿼리 1회로 계산
+
+집계 기준:
+- 대상 회원은 현재 MEMBER / ADMIN (관리자 납부 현황 / export 와 동일)
+- expected  : 청구 금액 × 대상 회원 수
+- collected : 대상 회원의 납부 금액 합계 (초과 납부 포함)
+- 납부 방법별 통계는 collected / 납부 건수만 제공
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 잘못된 입력은 ValueError 로 알림
+
+관련 파일:
+- app.services.dues_cache  : 청구 / 통계 캐시
+- app.routers.admin_dues   : 수납 통계 API
+
+"""
+
+from datetime import date
+
+from sqlalchemy import select, func, literal, union_all, tuple_, Integer
+from sqlalchemy.orm import Session
+
+from app.models.dues import DuesCharge, DuesPayment, DuesPeriodTotal
+from app.models.user import User, Role
+from app.services.dues import validate_period
+from app.services.dues_cache import charge_cache, analytics_cache
+
+
+def _rate(collected: int, expected: int) -> float | None:
+    if expected <= 0:
+        return None
+    return round(collected / expected, 4)
+
+
+# 현재 월 이전 period 는 캐시 대상 (마감 전이라도 납부 / 회원 변경 시 무효화)
+def _is_past(period: str) -> bool:
+    return period < date.today().strftime("%Y-%m")
+
+
+"""
+기간별 수납 통계 집계 SELECT 문
+
+- 청구 대상 행: (period, NULL method, grade, expected=청구 금액, collected=0)
+- 납부 행     : (period, method, grade, expected=0, collected=납부 금액)
+- GROUPING SETS 결과 행은 grouping(method, grade) 값으로 구분
+  3 : period 합계 / 1 : period + method / 2 : period + grade
+
+"""
+
+def analytics_stmt(periods: list[str]):
+    active = User.role.in_([Role.MEMBER, Role.ADMIN])
+    in_periods = DuesCharge.period.in_(periods)
+
+    expected_rows = (
+        select(
+            DuesCharge.period.label("period"),
+            literal(None, DuesPayment.method.type).label("method"),
+            User.grade.label("grade"),
+            DuesCharge.amount.label("expected"),
+            literal(0, Integer).label("collected"),
+            literal(1, Integer).label("is_member"),
+            literal(0, Integer).label("is_payment"),
+        )
+        .select_from(User)
+        .join(DuesCharge, in_periods)
+        .where(active)
+    )
+    payment_rows = (
+        select(
+            DuesCharge.period,
+            DuesPayment.method,
+            User.grade,
+            literal(0, Integer),
+            DuesPayment.amount,
+            literal(0, Integer),
+            literal(1, Integer),
+        )
+        .select_from(DuesPayment)
+        .join(DuesCharge, DuesCharge.id == DuesPayment.charge_id)
+        .join(User, User.id == DuesPayment.user_id)
+        .where(in_periods)
+        .where(active)
+    )
+    u = union_all(expected_rows, payment_rows).subquery()
+
+    return (
+        select(
+            u.c.period,
+            u.c.method,
+            u.c.grade,
+            func.grouping(u.c.method, u.c.grade).label("level"),
+            func.sum(u.c.expected).label("expected"),
+            func.sum(u.c.collected).label("collected"),
+            func.sum(u.c.is_member).label("members"),
+            func.sum(u.c.is_payment).label("payments"),
+        )
+        .group_by(
+            func.grouping_sets(
+                tuple_(u.c.period),
+                tuple_(u.c.period, u.c.method),
+                tuple_(u.c.period, u.c.grade),
+            )
+        )
+        .order_by(u.c.period, u.c.method, u.c.grade)
+    )
+
+
+# GROUPING SETS 결과 행 → period 별 통계 dict
+def collect_analytics(rows, charges: dict[str, int]) -> dict[str, dict]:
+    result = {
+        period: {
+            "period": period,
+            "amount": amount,
+            "expected_total": 0,
+            "collected_total": 0,
+            "collection_rate": None,
+            "members": 0,
+            "payments": 0,
+            "by_method": [],
+            "by_grade": [],
+        }
+        for period, amount in charges.items()
+    }
+
+    for r in rows:
+        item = result[r.period]
+        expected = int(r.expected or 0)
+        collected = int(r.collected or 0)
+        if r.level == 3:
+            item.update(
+                expected_total=expected,
+                collected_total=collected,
+                collection_rate=_rate(collected, expected),
+                members=int(r.members or 0),
+                payments=int(r.payments or 0),
+            )
+        elif r.level == 1:
+            # 청구 대상 행(method 없음)은 납부 방법별 통계에서 제외
+            if r.method is None:
+                continue
+            item["by_method"].append({
+                "method": r.method,
+                "collected_total": collected,
+                "payments": int(r.payments or 0),
+            })
+        elif r.level == 2:
+            item["by_grade"].append({
+                "grade": r.grade,
+                "expected_total": expected,
+                "collected_total": collected,
+                "collection_rate": _rate(collected, expected),
+                "members": int(r.members or 0),
+                "payments": int(r.payments or 0),
+            })
+    return result
+
+
+# 마감 합계 행 → 통계 dict (collect_analytics 와 같은 형식)
+def _from_total(period: str, amount: int, total: DuesPeriodTotal) -> dict:
+    return {
+        "period": period,
+        "amount": amount,
+        "expected_total": total.expected_total,
+        "collected_total": total.collected_total,
+        "collection_rate": _rate(total.collected_total, total.expected_total),
+        "members": total.members,
+        "payments": total.payments,
+        "by_method": total.breakdown.get("by_method", []),
+        "by_grade": total.breakdown.get("by_grade", []),
+    }
+
+
+"""
+기간별 수납 통계 조회
+
+- from_period ~ to_period 범위의 청구만 대상 (period 오름차순)
+- 마감(close)된 period 는 마감 합계(dues_period_totals)에서 쿼리 1회로 응답
+- 마감 전이지만 지난 period 는 캐시에서 응답
+- 나머지는 GROUPING SETS 쿼리 1회로 계산
+- 반환: (items, cached_count)  cached_count 는 납부 원본을 읽지 않은 period 수
+
+"""
+
+def collection_analytics(db: Session, *, from_period: str, to_period: str) -> tuple[list[dict], int]:
+    validate_period(from_period)
+    validate_period(to_period)
+    if from_period > to_period:
+        raise ValueError("from must not be later than to")
+
+    charges = [
+        c for c in reversed(charge_cache.ordered_desc(db))
+        if from_period <= c.period <= to_period
+    ]
+
+    items: dict[str, dict] = {}
+    closed = {c.id: c for c in charges if c.closed_at is not None}
+    if closed:
+        for total in db.scalars(select(DuesPeriodTotal).where(DuesPeriodTotal.charge_id.in_(list(closed)))):
+            charge = closed[total.charge_id]
+            items[charge.period] = _from_total(charge.period, charge.amount, total)
+
+    missing = []
+    for charge in charges:
+        if charge.period in items:
+            continue
+        cached = analytics_cache.get(charge.period, charge.id) if _is_past(charge.period) else None
+        if cached is not None:
+            items[charge.period] = cached
+        else:
+            missing.append(charge)
+
+    if missing:
+        rows = db.execute(analytics_stmt([c.period for c in missing])).all()
+        computed = collect_analytics(rows, {c.period: c.amount for c in missing})
+        for charge in missing:
+            item = computed[charge.period]
+            items[charge.period] = item
+            if _is_past(charge.period):
+                analytics_cache.put(charge.period, charge.id, item)
+
+    return [items[c.period] for c in charges], len(charges) - len(missing)
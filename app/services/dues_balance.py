@@ -0,0 +1,188 @@
+"""
+services/dues_balance.py
+
+회비 잔액 원장(dues_balances) 점검 / 재구축 서비스.
+
+dues_balances 는 record_payment / create_charge 에서 증분 갱신되는
+파생 데이터이므로, 원본(dues_payments)과 어긋날 가능성에 대비해
+원본 기준으로 다시 계산하고 차이(drift)를 보고하는 기능을 제공한다.
+
+주요 기능:
+- 청구(charge) 단위 배치로 원본 납부 합계와 원장 값을 비교
+- 여러 배치를 스레드 풀에서 병렬 처리 (배치마다 독립 세션 / 트랜잭션)
+- fix=True 이면 어긋난 행을 원본 기준 값으로 덮어씀
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 배치 단위로 commit 하여 긴 트랜잭션 / 잠금을 피함
+  (재구축 시 배치의 청구 행 잠금은 해당 배치 commit 까지만 유지)
+- 잔액 상태 계산 규칙은 app.services.dues 와 동일한 식을 사용
+
+관련 파일:
+- app.models.dues                  : DuesCharge / DuesPayment / DuesBalance 모델
+- app.services.dues                : 잔액 증분 반영 로직
+- scripts.reconcile_dues_balances  : 점검 / 재구축 실행 스크립트
+
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select, func, or_, values, column, Integer, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert, UUID
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.dues import DuesCharge, DuesPayment, DuesBalance
+from app.services.dues import dues_status_case, bump_dues_versions
+from app.services.dues_cache import mark_payments
+
+
+"""
+청구 배치 하나에 대한 원장 점검 / 재구축
+
+- 원본: dues_payments 를 (user_id, charge_id) 로 GROUP BY
+- 원장: 같은 청구 범위의 dues_balances
+- 두 집합을 FULL OUTER JOIN 하여 금액 또는 상태가 다른 행만 drift 로 반환
+- fix=True 이면 drift 행을 원본 기준 값으로 upsert 후 commit
+- fix=True 이면 먼저 배치의 청구 행을 FOR UPDATE 로 잠금 (period 순)
+  납부 INSERT(FK KEY SHARE) / record_payment(FOR SHARE)와 충돌하므로
+  진행 중인 납부는 commit 된 뒤에 합계를 계산하고, 재구축 중에는 새 납부가 대기
+  (잠그지 않으면 합계 계산 ~ upsert 사이에 commit 된 납부의 증분을 절대값으로 덮어씀)
+
+"""
+
+def reconcile_charge_batch(db: Session, *, charge_ids: list[uuid.UUID], fix: bool = True) -> list[dict]:
+    if fix:
+        db.execute(
+            select(DuesCharge.id)
+            .where(DuesCharge.id.in_(charge_ids))
+            .order_by(DuesCharge.period)
+            .with_for_update()
+        )
+
+    expected = (
+        select(
+            DuesPayment.user_id,
+            DuesPayment.charge_id,
+            func.sum(DuesPayment.amount).label("paid"),
+        )
+        .where(DuesPayment.charge_id.in_(charge_ids))
+        .group_by(DuesPayment.user_id, DuesPayment.charge_id)
+        .subquery()
+    )
+    stored = (
+        select(DuesBalance.user_id, DuesBalance.charge_id, DuesBalance.paid_amount, DuesBalance.status)
+        .where(DuesBalance.charge_id.in_(charge_ids))
+        .subquery()
+    )
+
+    user_id = func.coalesce(expected.c.user_id, stored.c.user_id)
+    charge_id = func.coalesce(expected.c.charge_id, stored.c.charge_id)
+    expected_paid = func.coalesce(expected.c.paid, 0)
+    expected_status = dues_status_case(expected_paid, DuesCharge.amount)
+
+    rows = db.execute(
+        select(
+            user_id.label("user_id"),
+            charge_id.label("charge_id"),
+            DuesCharge.period.label("period"),
+            stored.c.paid_amount.label("stored_paid"),
+            stored.c.status.label("stored_status"),
+            expected_paid.label("expected_paid"),
+            expected_status.label("expected_status"),
+        )
+        .select_from(expected)
+        .join(
+            stored,
+            (stored.c.user_id == expected.c.user_id) & (stored.c.charge_id == expected.c.charge_id),
+            full=True,
+        )
+        .join(DuesCharge, DuesCharge.id == charge_id)
+        .where(
+            or_(
+                stored.c.paid_amount.is_(None),
+                stored.c.paid_amount != expected_paid,
+                stored.c.status != expected_status,
+            )
+        )
+    ).all()
+
+    drift = [
+        {
+            "user_id": str(r.user_id),
+            "charge_id": str(r.charge_id),
+            "period": r.period,
+            "stored_paid": r.stored_paid,
+            "stored_status": r.stored_status,
+            "expected_paid": int(r.expected_paid),
+            "expected_status": r.expected_status,
+        }
+        for r in rows
+    ]
+
+    if fix and rows:
+        v = values(
+            column("user_id", UUID(as_uuid=True)),
+            column("charge_id", UUID(as_uuid=True)),
+            column("paid", Integer),
+            column("status", String(10)),
+            name="v",
+        ).data([(r.user_id, r.charge_id, int(r.expected_paid), r.expected_status) for r in rows])
+
+        stmt = pg_insert(DuesBalance).from_select(
+            ["user_id", "charge_id", "paid_amount", "status", "updated_at"],
+            select(v.c.user_id, v.c.charge_id, v.c.paid, v.c.status, func.now()),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DuesBalance.user_id, DuesBalance.charge_id],
+            set_={
+                "paid_amount": stmt.excluded.paid_amount,
+                "status": stmt.excluded.status,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        mark_payments(db, {r.charge_id for r in rows})
+        bump_dues_versions(db, user_ids={r.user_id for r in rows})
+    db.commit()
+
+    return drift
+
+
+"""
+전체 잔액 원장 점검 / 재구축
+
+- 모든 청구를 batch_size 개씩 나누어 workers 개의 스레드에서 병렬 처리
+- 배치마다 session_factory 로 독립 세션을 열고 닫음
+- 반환: {"charges", "batches", "drift_count", "drift", "fixed"}
+
+"""
+
+def reconcile_balances(
+    session_factory: sessionmaker,
+    *,
+    batch_size: int = 12,
+    workers: int = 4,
+    fix: bool = True,
+) -> dict:
+    with session_factory() as db:
+        charge_ids = list(db.scalars(select(DuesCharge.id).order_by(DuesCharge.period)).all())
+
+    batches = [charge_ids[i:i + batch_size] for i in range(0, len(charge_ids), batch_size)]
+
+    def _run(batch: list[uuid.UUID]) -> list[dict]:
+        with session_factory() as db:
+            return reconcile_charge_batch(db, charge_ids=batch, fix=fix)
+
+    drift: list[dict] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for batch_drift in pool.map(_run, batches):
+            drift.extend(batch_drift)
+
+    return {
+        "charges": len(charge_ids),
+        "batches": len(batches),
+        "drift_count": len(drift),
+        "drift": drift,
+        "fixed": fix,
+    }
@@ -0,0 +1,283 @@
+"""
+services/dues_bank.py
+
+은행 거래내역 ↔ 회비 납부 대사(Reconciliation) 서비스.
+
+이 파일은 은행에서 내려받은 입금 거래내역 CSV를 읽어
+입금자명 / 적요(memo)의 학번 조각 / 금액을 기준으로
+회원과 미납 청구를 찾아 회비 납부(DuesPayment) 후보를 제안한다.
+
+주요 기능:
+- 은행 CSV 파싱 (한글/영문 헤더 모두 허용)
+- 회원 인덱스(정규화 이름 → 회원, 학번 → 회원, 학번 끝 4자리 → 회원)를
+  대사 1회당 한 번만 생성
+- 미납/부분납 청구 목록을 쿼리 한 번으로 읽어 금액 기준으로 청구 선택
+  (정확히 맞는 청구가 없으면 오래된 청구부터 나눠 배정)
+- 제안(suggestions)과 매칭 실패(unmatched) 목록 반환
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 거래 한 줄마다 쿼리하지 않음 (모든 매칭은 메모리 해시 맵)
+- 제안만 만들고 저장하지 않음 (확정은 일괄 등록 경로로 별도 수행)
+
+관련 파일:
+- app.services.dues_import : 확정된 제안의 일괄 저장
+- app.routers.admin_dues   : 대사 / 확정 API
+
+"""
+
+import csv
+import io
+import re
+import uuid
+from collections import defaultdict
+from typing import IO
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.models.dues import DuesCharge, DuesBalance
+from app.models.user import User, Role
+
+
+# 은행별로 다른 헤더 이름 → 표준 필드
+BANK_COLUMNS = {
+    "date": ("date", "거래일시", "거래일자", "거래일", "일자"),
+    "depositor": ("depositor", "name", "입금자명", "입금자", "보낸분", "의뢰인", "기재내용"),
+    "amount": ("amount", "deposit", "입금액", "입금", "맡기신금액", "입금금액"),
+    "memo": ("memo", "적요", "메모", "내용", "비고"),
+}
+
+# 학번 조각 후보: 숫자를 하나 이상 포함한 4자 이상 영숫자 토큰
+_ID_TOKEN_RE = re.compile(r"[0-9A-Za-z]*\d[0-9A-Za-z]*")
+_NAME_STRIP_RE = re.compile(r"[\s\d\W_]+", re.UNICODE)
+
+# 학번 끝자리 인덱스 길이
+SUFFIX_LEN = 4
+
+
+# 이름 비교용 정규화 (공백/숫자/기호 제거, 소문자)
+def normalize_name(value: str | None) -> str:
+    return _NAME_STRIP_RE.sub("", value or "").lower()
+
+
+def _amount(value: str | None) -> int | None:
+    if value is None:
+        return None
+    value = value.replace(",", "").replace("원", "").strip()
+    if not value:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+"""
+은행 CSV 파싱
+
+- 첫 행을 헤더로 보고 BANK_COLUMNS 기준으로 표준 필드에 매핑
+- 반환: [{"line", "date", "depositor", "amount", "memo"}]
+- 필수 컬럼(depositor, amount)이 없으면 ValueError
+
+"""
+
+def parse_bank_csv(fileobj: IO[bytes]) -> list[dict]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("bank statement is empty")
+
+    index: dict[str, int] = {}
+    normalized = [h.strip().lower() for h in header]
+    for field, names in BANK_COLUMNS.items():
+        for i, h in enumerate(normalized):
+            if h in names:
+                index[field] = i
+                break
+    if "depositor" not in index or "amount" not in index:
+        raise ValueError("bank statement must have depositor and amount columns")
+
+    def _cell(row: list[str], field: str) -> str | None:
+        i = index.get(field)
+        if i is None or i >= len(row):
+            return None
+        return row[i].strip() or None
+
+    lines = []
+    for row in reader:
+        if not any(c.strip() for c in row):
+            continue
+        lines.append({
+            "line": reader.line_num,
+            "date": _cell(row, "date"),
+            "depositor": _cell(row, "depositor"),
+            "amount": _amount(_cell(row, "amount")),
+            "memo": _cell(row, "memo"),
+        })
+    return lines
+
+
+"""
+대사용 메모리 인덱스
+
+- members        : user_id → {"user_id", "name", "student_id"}
+- by_name        : 정규화 이름 → {user_id}
+- by_student_id  : 학번 → user_id
+- by_suffix      : 학번 끝 4자리 → [user_id]
+- open_charges   : user_id → [[period, outstanding], ...] (마감 전 청구만, period 오름차순)
+- 쿼리 2회 (회원, 회원별 미납 청구 array_agg)
+
+"""
+
+class BankMatchIndex:
+    def __init__(self, db: Session):
+        self.members: dict[uuid.UUID, dict] = {}
+        self.by_name: dict[str, set[uuid.UUID]] = defaultdict(set)
+        self.by_student_id: dict[str, uuid.UUID] = {}
+        self.by_suffix: dict[str, list[uuid.UUID]] = defaultdict(list)
+
+        for user_id, name, student_id in db.execute(
+            select(User.id, User.name, User.student_id)
+            .where(User.role.in_([Role.MEMBER, Role.ADMIN]))
+        ):
+            self.members[user_id] = {"user_id": user_id, "name": name, "student_id": student_id}
+            self.by_name[normalize_name(name)].add(user_id)
+            self.by_student_id[student_id] = user_id
+            if len(student_id) >= SUFFIX_LEN:
+                self.by_suffix[student_id[-SUFFIX_LEN:]].append(user_id)
+
+        outstanding = DuesCharge.amount - func.coalesce(DuesBalance.paid_amount, 0)
+        self.open_charges: dict[uuid.UUID, list[list]] = {}
+        for user_id, periods, remaining in db.execute(
+            select(
+                User.id,
+                func.array_agg(aggregate_order_by(DuesCharge.period, DuesCharge.period)),
+                func.array_agg(aggregate_order_by(outstanding, DuesCharge.period)),
+            )
+            .select_from(User)
+            .join(DuesCharge, (DuesCharge.amount > 0) & DuesCharge.closed_at.is_(None))
+            .outerjoin(
+                DuesBalance,
+                (DuesBalance.user_id == User.id) & (DuesBalance.charge_id == DuesCharge.id),
+            )
+            .where(User.role.in_([Role.MEMBER, Role.ADMIN]))
+            .where(outstanding > 0)
+            .group_by(User.id)
+        ):
+            self.open_charges[user_id] = [[p, int(r)] for p, r in zip(periods, remaining)]
+
+    # 입금 한 줄의 회원 식별 → (user_id, 근거) 또는 (None, 실패 사유)
+    def match_member(self, depositor: str | None, memo: str | None) -> tuple[uuid.UUID | None, str]:
+        fragments = [
+            t for t in _ID_TOKEN_RE.findall(f"{depositor or ''} {memo or ''}")
+            if len(t) >= SUFFIX_LEN
+        ]
+
+        # 1) 학번 전체가 적힌 경우
+        for frag in fragments:
+            user_id = self.by_student_id.get(frag)
+            if user_id:
+                return user_id, "student_id"
+
+        # 2) 이름 일치 (동명이인은 학번 끝자리로 구분)
+        name_hits = self.by_name.get(normalize_name(depositor), set())
+        if len(name_hits) == 1:
+            return next(iter(name_hits)), "name"
+
+        suffix_hits = {
+            user_id
+            for frag in fragments
+            for user_id in self.by_suffix.get(frag[-SUFFIX_LEN:], [])
+        }
+        if name_hits:
+            both = [u for u in suffix_hits if u in name_hits]
+            if len(both) == 1:
+                return both[0], "name+student_id_suffix"
+            return None, "ambiguous name"
+
+        # 3) 이름은 다르지만 학번 끝자리만으로 유일하게 식별되는 경우
+        if len(suffix_hits) == 1:
+            return next(iter(suffix_hits)), "student_id_suffix"
+
+        return None, "member not found"
+
+    # 입금액을 미납 청구에 배정 → ([(period, amount)], 남은 금액)
+    # - 미납액과 금액이 정확히 같은 청구가 있으면 그 청구 하나에 전액
+    # - 없으면 오래된 청구부터 미납액만큼 나눠 배정 (FIFO, 청구당 미납액 초과 배정 없음)
+    # - 배정된 청구의 미납액은 메모리에서 차감 (같은 대사 안에서 중복 배정 방지)
+    def take_open_charges(self, user_id: uuid.UUID, amount: int) -> tuple[list[tuple[str, int]], int]:
+        charges = self.open_charges.get(user_id)
+        if not charges:
+            return [], amount
+
+        exact = next((c for c in charges if c[1] == amount), None)
+        targets = [exact] if exact else list(charges)
+
+        allocations = []
+        remaining = amount
+        for charge in targets:
+            if remaining <= 0:
+                break
+            take = min(charge[1], remaining)
+            allocations.append((charge[0], take))
+            remaining -= take
+            charge[1] -= take
+            if charge[1] <= 0:
+                charges.remove(charge)
+        return allocations, remaining
+
+
+"""
+은행 거래내역 대사
+
+- lines: parse_bank_csv 결과
+- 반환: {"suggestions": [...], "unmatched": [...]}
+  suggestion: 확정 API(/reconcile/confirm)에 그대로 넘길 수 있는 납부 후보
+              (입금 한 줄이 여러 청구에 나뉘면 청구마다 하나, line 은 같음)
+  unmatched : 회원 / 청구를 찾지 못한 입금 줄과 사유
+              (미납액 합계를 넘는 입금은 남은 금액(amount)만 "exceeds open charges")
+
+"""
+
+def reconcile_bank_lines(db: Session, *, lines: list[dict]) -> dict:
+    index = BankMatchIndex(db)
+
+    suggestions = []
+    unmatched = []
+    for line in lines:
+        amount = line["amount"]
+        if amount is None or amount <= 0:
+            unmatched.append({**line, "reason": "not a deposit"})
+            continue
+
+        user_id, matched_by = index.match_member(line["depositor"], line["memo"])
+        if user_id is None:
+            unmatched.append({**line, "reason": matched_by})
+            continue
+
+        allocations, remaining = index.take_open_charges(user_id, amount)
+        if not allocations:
+            unmatched.append({**line, "reason": "no open charge"})
+            continue
+
+        member = index.members[user_id]
+        memo = " ".join(x for x in ["은행입금", line["date"], line["depositor"]] if x)
+        for period, part in allocations:
+            suggestions.append({
+                "line": line["line"],
+                "user_id": str(user_id),
+                "name": member["name"],
+                "student_id": member["student_id"],
+                "period": period,
+                "amount": part,
+                "method": "TRANSFER",
+                "memo": memo[:255],
+                "matched_by": matched_by,
+            })
+        if remaining > 0:
+            unmatched.append({**line, "amount": remaining, "reason": "exceeds open charges"})
+
+    return {"suggestions": suggestions, "unmatched": unmatched}
@@ -0,0 +1,628 @@
+"""
+services/dues_cache.py
+
+회비 청구(DuesCharge) / 수납 통계 프로세스 내 캐시.
+
+회비 청구는 한 달에 한 번 생성되고 이후 변경되지 않으므로,
+회원/관리자 회비 API가 매 요청마다 청구를 DB에서 다시 읽을 필요가 없다.
+이 파일은 청구 전체를 한 번 읽어 period 순으로 보관하는
+read-through 캐시를 제공한다.
+
+주요 기능:
+- period → 청구 조회 / 가장 최신 청구 / period 내림차순 목록
+- create_charge 시 무효화 (commit / rollback 이후 한 번 더 무효화)
+- 선택적 워커 간 무효화: Postgres LISTEN / NOTIFY (DUES_CACHE_NOTIFY=true)
+- TTL(DUES_CHARGE_CACHE_TTL 초) 경과 시 자동 재적재
+- 마감된 period 의 수납 통계 캐시 (납부 / 회원 구성 변경 commit 시 무효화)
+- 관리자 납부 현황 / export 집계 요청 병합(single-flight) + 짧은 TTL 캐시
+- 청구별 회원 완납 비트셋 (연체 패턴 조회, 납부 commit 시 비트 갱신)
+- hit / miss 카운터 제공 (관리자 API에서 노출)
+
+설계 원칙:
+- 캐시에는 ORM 객체가 아닌 불변 스냅샷(ChargeInfo)만 보관 (세션과 무관)
+- 캐시에 없는 period 는 DB를 한 번 더 확인 (다른 워커가 막 만든 청구 대비)
+- 쓰기 경로(중복 청구 검사)는 캐시를 사용하지 않음
+
+관련 파일:
+- app.services.dues        : get_charge_by_period / create_charge / 납부 반영
+- app.services.dues_analytics : 기간별 수납 통계
+- app.routers.admin_dues   : 청구 목록 / 캐시 통계 API
+- app.main                 : NOTIFY 리스너 시작 / 종료
+
+"""
+
+import logging
+import select as _select
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.dues import DuesCharge, DuesBalance
+from app.models.user import User, Role
+
+
+logger = logging.getLogger(__name__)
+
+CHARGES_CHANNEL = "dues_charges_changed"
+
+# NOTIFY payload 상한 (Postgres 기본 8000 바이트보다 약간 작게)
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+@dataclass(frozen=True)
+class ChargeInfo:
+    """캐시에 보관하는 회비 청구 스냅샷 (DuesCharge 와 같은 필드)."""
+
+    id: uuid.UUID
+    period: str
+    amount: int
+    created_by: uuid.UUID
+    created_at: datetime
+    closed_at: datetime | None = None
+
+
+def _snapshot(charge: DuesCharge) -> ChargeInfo:
+    return ChargeInfo(
+        id=charge.id,
+        period=charge.period,
+        amount=charge.amount,
+        created_by=charge.created_by,
+        created_at=charge.created_at,
+        closed_at=charge.closed_at,
+    )
+
+
+"""
+회비 청구 read-through 캐시
+
+- 첫 조회(또는 무효화 / TTL 만료 후 첫 조회) 시 청구 전체를 period 순으로 적재
+- by_period / latest / ordered 는 적재된 스냅샷에서만 응답
+- 스레드 안전 (적재 / 무효화는 lock 으로 보호)
+
+"""
+
+class ChargeCache:
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._ordered: tuple[ChargeInfo, ...] | None = None
+        self._by_period: dict[str, ChargeInfo] = {}
+        self._loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _fresh(self) -> bool:
+        if self._ordered is None:
+            return False
+        return self.ttl_seconds <= 0 or (time.monotonic() - self._loaded_at) < self.ttl_seconds
+
+    # 청구 전체 (period 오름차순)
+    def _charges(self, db: Session) -> tuple[ChargeInfo, ...]:
+        ordered = self._ordered
+        if ordered is not None and self._fresh():
+            self.hits += 1
+            return ordered
+
+        with self._lock:
+            if self._ordered is not None and self._fresh():
+                self.hits += 1
+                return self._ordered
+
+            self.misses += 1
+            charges = db.scalars(select(DuesCharge).order_by(DuesCharge.period)).all()
+            ordered = tuple(_snapshot(c) for c in charges)
+            self._by_period = {c.period: c for c in ordered}
+            self._ordered = ordered
+            self._loaded_at = time.monotonic()
+            return ordered
+
+    def by_period(self, db: Session, period: str) -> ChargeInfo | None:
+        self._charges(db)
+        charge = self._by_period.get(period)
+        if charge is not None:
+            return charge
+
+        # 캐시에 없는 period: 다른 워커가 방금 만든 청구일 수 있으므로 DB 확인
+        found = db.scalar(select(DuesCharge).where(DuesCharge.period == period))
+        if found is None:
+            return None
+        self.invalidate()
+        return _snapshot(found)
+
+    def latest(self, db: Session) -> ChargeInfo | None:
+        charges = self._charges(db)
+        return charges[-1] if charges else None
+
+    def ordered_desc(self, db: Session) -> list[ChargeInfo]:
+        return list(reversed(self._charges(db)))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._ordered = None
+            self._by_period = {}
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._ordered) if self._ordered is not None else 0,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+charge_cache = ChargeCache(ttl_seconds=settings.DUES_CHARGE_CACHE_TTL)
+
+
+"""
+기간별 수납 통계 캐시 (analytics)
+
+- period → 통계 dict (청구 id 와 함께 보관)
+- 마감된(현재 월 이전) period 만 저장, TTL(DUES_ANALYTICS_CACHE_TTL 초) 적용
+- 해당 청구의 납부 / 회원 구성 변경이 commit 되면 무효화
+
+"""
+
+class AnalyticsCache:
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[uuid.UUID, float, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, period: str, charge_id: uuid.UUID) -> dict | None:
+        entry = self._entries.get(period)
+        if entry is not None:
+            cached_charge_id, stored_at, value = entry
+            expired = self.ttl_seconds > 0 and (time.monotonic() - stored_at) >= self.ttl_seconds
+            if cached_charge_id == charge_id and not expired:
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, period: str, charge_id: uuid.UUID, value: dict) -> None:
+        with self._lock:
+            self._entries[period] = (charge_id, time.monotonic(), value)
+
+    def invalidate_charges(self, charge_ids) -> None:
+        charge_ids = set(charge_ids)
+        with self._lock:
+            for period in [p for p, (cid, _, _) in self._entries.items() if cid in charge_ids]:
+                del self._entries[period]
+            self.invalidations += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+analytics_cache = AnalyticsCache(ttl_seconds=settings.DUES_ANALYTICS_CACHE_TTL)
+
+
+"""
+관리자 집계 요청 병합 (single-flight) 캐시
+
+- (operation, period) 키마다 진행 중인 계산은 하나만 실행, 동시에 들어온 같은 요청은 그 결과를 기다려 공유
+- 계산 결과는 짧은 TTL(DUES_STATUS_CACHE_TTL 초) 동안 재사용 (청구 id 와 함께 보관)
+- 해당 청구의 납부 / 회원 구성 변경이 commit 되면 무효화
+- 계산 도중 무효화가 일어나면 결과는 기다리던 요청에만 돌려주고 저장하지 않음
+- 계산이 실패하면 기다리던 요청에도 같은 예외 전달
+
+"""
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class CoalescingCache:
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], tuple[uuid.UUID, float, object]] = {}
+        self._flights: dict[tuple[str, str], _Flight] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key: tuple[str, str], charge_id: uuid.UUID, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                cached_charge_id, stored_at, value = entry
+                if cached_charge_id == charge_id and (time.monotonic() - stored_at) < self.ttl_seconds:
+                    self.hits += 1
+                    return value
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and self.ttl_seconds > 0 and generation == self._generation:
+                    self._entries[key] = (charge_id, time.monotonic(), flight.value)
+            flight.done.set()
+        return flight.value
+
+    # 계산하지 않고 저장된 결과만 조회 (없거나 만료면 None)
+    def peek(self, key: tuple[str, str], charge_id: uuid.UUID):
+        entry = self._entries.get(key)
+        if entry is not None:
+            cached_charge_id, stored_at, value = entry
+            if cached_charge_id == charge_id and (time.monotonic() - stored_at) < self.ttl_seconds:
+                self.hits += 1
+                return value
+        return None
+
+    def invalidate_charges(self, charge_ids) -> None:
+        charge_ids = set(charge_ids)
+        with self._lock:
+            for key in [k for k, (cid, _, _) in self._entries.items() if cid in charge_ids]:
+                del self._entries[key]
+            self._generation += 1
+            self.invalidations += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "in_flight": len(self._flights),
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+status_cache = CoalescingCache(ttl_seconds=settings.DUES_STATUS_CACHE_TTL)
+
+
+"""
+회원별 완납 비트셋 (연체 패턴 조회용)
+
+- 현재 MEMBER / ADMIN 회원을 학번 순 서수(ordinal)로 번호 매김
+- 청구마다 완납(PAID) 회원의 비트를 켠 정수 비트셋 보관 (회원 1명 = 1 bit)
+- 첫 조회 시 회원 목록 1회 + 잔액 원장(dues_balances) 1회로 필요한 청구 전체를 적재
+- 납부 commit 시 완납이 된 (회원, 청구) 비트만 켬 (재적재 없음)
+- 잔액 보정 / 다른 워커의 납부는 해당 청구만 다시 적재, 청구 / 회원 구성 변경은 전체 재적재
+- 금액이 0 인 청구는 전원 완납으로 간주
+- TTL(DUES_CHARGE_CACHE_TTL 초) 경과 시 회원 목록부터 전체 재적재
+  (LISTEN / NOTIFY 없이 여러 워커로 운영할 때 다른 워커의 납부 반영 상한)
+
+"""
+
+class PaidBitsets:
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self._members: tuple[uuid.UUID, ...] | None = None
+        self._ordinal: dict[uuid.UUID, int] = {}
+        self._paid: dict[uuid.UUID, int] = {}
+        self.hits = 0
+        self.loads = 0
+        self.updates = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    def _fresh(self) -> bool:
+        return self.ttl_seconds <= 0 or (time.monotonic() - self._loaded_at) < self.ttl_seconds
+
+    # (회원 서수 목록, {charge_id: 완납 비트셋})
+    def snapshot(self, db: Session, charges) -> tuple[tuple[uuid.UUID, ...], dict[uuid.UUID, int]]:
+        with self._lock:
+            if self._members is not None and not self._fresh():
+                self.expirations += 1
+                self._members = None
+            if self._members is None:
+                self._loaded_at = time.monotonic()
+                self._members = tuple(db.scalars(
+                    select(User.id)
+                    .where(User.role.in_([Role.MEMBER, Role.ADMIN]))
+                    .order_by(User.student_id)
+                ))
+                self._ordinal = {user_id: i for i, user_id in enumerate(self._members)}
+                self._paid = {}
+
+            missing = [c for c in charges if c.id not in self._paid]
+            if missing:
+                self._load(db, missing)
+            else:
+                self.hits += 1
+            return self._members, {c.id: self._paid[c.id] for c in charges}
+
+    def _load(self, db: Session, charges) -> None:
+        self.loads += 1
+        size = len(self._members)
+        full = (1 << size) - 1
+        buffers = {c.id: bytearray((size + 7) // 8) for c in charges if c.amount > 0}
+
+        if buffers:
+            rows = db.execute(
+                select(DuesBalance.user_id, DuesBalance.charge_id)
+                .where(DuesBalance.charge_id.in_(list(buffers)))
+                .where(DuesBalance.status == "PAID")
+            )
+            for user_id, charge_id in rows:
+                i = self._ordinal.get(user_id)
+                if i is not None:
+                    buffers[charge_id][i >> 3] |= 1 << (i & 7)
+
+        for c in charges:
+            buf = buffers.get(c.id)
+            self._paid[c.id] = full if buf is None else int.from_bytes(buf, "little")
+
+    def set_paid(self, pairs) -> None:
+        with self._lock:
+            for user_id, charge_id in pairs:
+                i = self._ordinal.get(user_id)
+                if i is not None and charge_id in self._paid:
+                    self._paid[charge_id] |= 1 << i
+            self.updates += 1
+
+    def invalidate_charges(self, charge_ids) -> None:
+        with self._lock:
+            for charge_id in charge_ids:
+                self._paid.pop(charge_id, None)
+            self.invalidations += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._members = None
+            self._ordinal = {}
+            self._paid = {}
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "loads": self.loads,
+            "updates": self.updates,
+            "invalidations": self.invalidations,
+            "expirations": self.expirations,
+            "ttl_seconds": self.ttl_seconds,
+            "members": len(self._members) if self._members is not None else 0,
+            "charges": len(self._paid),
+            "bytes": sum((bits.bit_length() + 7) // 8 for bits in self._paid.values()),
+        }
+
+
+paid_bitsets = PaidBitsets(ttl_seconds=settings.DUES_CHARGE_CACHE_TTL)
+
+
+def clear_all() -> None:
+    charge_cache.invalidate()
+    analytics_cache.invalidate()
+    status_cache.invalidate()
+    paid_bitsets.invalidate()
+
+
+"""
+회비 데이터 변경 알림
+
+- invalidate_charges : 청구 생성 (현재 프로세스 청구 캐시 즉시 무효화)
+- mark_payments      : 납부 반영 (해당 청구의 통계 / 납부 현황 캐시 무효화 대상 표시)
+- mark_paid_members  : 납부로 완납이 된 (회원, 청구) 표시 (commit 후 완납 비트셋에 반영)
+- 회원 역할 / 학년 / 탈퇴 변경은 before_flush 에서 자동 감지
+- 세션에 표시를 남겨 commit / rollback 직후 한 번 더 무효화
+  (트랜잭션 도중 다른 요청이 이전 상태로 다시 적재하는 경우 대비)
+- DUES_CACHE_NOTIFY=true 이면 commit 직전 pg_notify 전송
+  (Postgres 는 commit 시점에 다른 워커로 전달)
+
+"""
+
+def invalidate_charges(db: Session) -> None:
+    charge_cache.invalidate()
+    db.info["dues_charges_changed"] = True
+
+
+def mark_payments(db: Session, charge_ids) -> None:
+    db.info.setdefault("dues_paid_charges", set()).update(charge_ids)
+
+
+# 납부 반영 결과: 이 청구들의 잔액은 증가만 했고, fully_paid 는 완납이 된 (user_id, charge_id)
+def mark_paid_members(db: Session, charge_ids, fully_paid) -> None:
+    db.info.setdefault("dues_incremental_charges", set()).update(charge_ids)
+    db.info.setdefault("dues_fully_paid", set()).update(fully_paid)
+
+
+_MEMBER_FIELDS = ("role", "grade", "is_deleted")
+
+
+@event.listens_for(Session, "before_flush")
+def _detect_member_changes(session: Session, flush_context, instances) -> None:
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if obj in session.new or any(state.attrs[f].history.has_changes() for f in _MEMBER_FIELDS):
+            session.info["dues_members_changed"] = True
+            return
+
+
+# 세션 표시 → NOTIFY payload ("charges" / "members" / "paid:<charge_id>,...")
+def _pending_payloads(info: dict) -> list[str]:
+    payloads = []
+    if info.get("dues_charges_changed"):
+        payloads.append("charges")
+    if info.get("dues_members_changed"):
+        payloads.append("members")
+    paid = info.get("dues_paid_charges")
+    if paid:
+        payloads.append("paid:" + ",".join(str(c) for c in paid))
+    return payloads
+
+
+def _apply_payload(payload: str, *, bitsets: bool = True) -> None:
+    if payload == "charges":
+        charge_cache.invalidate()
+        analytics_cache.invalidate()
+        status_cache.invalidate()
+        paid_bitsets.invalidate()
+    elif payload.startswith("paid:"):
+        charge_ids = [uuid.UUID(c) for c in payload[5:].split(",") if c]
+        analytics_cache.invalidate_charges(charge_ids)
+        status_cache.invalidate_charges(charge_ids)
+        if bitsets:
+            paid_bitsets.invalidate_charges(charge_ids)
+    else:
+        analytics_cache.invalidate()
+        status_cache.invalidate()
+        paid_bitsets.invalidate()
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session) -> None:
+    if not settings.DUES_CACHE_NOTIFY:
+        return
+    for payload in _notify_payloads(session.info):
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHARGES_CHANNEL, "payload": payload},
+        )
+
+
+# 다른 워커로 보낼 payload: 상한을 넘는 청구 id 목록은 잘라 보내지 않고(잘린 UUID / 누락 방지)
+# "members"(수납 통계 / 납부 현황 / 비트셋 전체 무효화)로 대체
+def _notify_payloads(info: dict) -> list[str]:
+    payloads = []
+    for payload in _pending_payloads(info):
+        if len(payload.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+            payload = "members"
+        if payload not in payloads:
+            payloads.append(payload)
+    return payloads
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    info = session.info
+    for payload in _pending_payloads(info):
+        _apply_payload(payload, bitsets=False)
+
+    # 완납 비트셋: 납부로 증가만 한 청구는 비트만 켜고, 그 외(잔액 보정 등)는 해당 청구 재적재
+    incremental = info.get("dues_incremental_charges", set())
+    paid_bitsets.invalidate_charges(info.get("dues_paid_charges", set()) - incremental)
+    if info.get("dues_fully_paid"):
+        paid_bitsets.set_paid(info["dues_fully_paid"])
+    _clear_marks(info)
+
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_after_rollback(session: Session) -> None:
+    for payload in _pending_payloads(session.info):
+        _apply_payload(payload)
+    _clear_marks(session.info)
+
+
+def _clear_marks(info: dict) -> None:
+    for key in (
+        "dues_charges_changed",
+        "dues_members_changed",
+        "dues_paid_charges",
+        "dues_incremental_charges",
+        "dues_fully_paid",
+    ):
+        info.pop(key, None)
+
+
+"""
+워커 간 무효화 리스너 (LISTEN dues_charges_changed)
+
+- 전용 DB 연결 하나로 LISTEN 후 백그라운드 스레드에서 알림 대기
+- 알림 payload 에 따라 현재 프로세스의 청구 / 통계 캐시를 무효화
+- stop() 호출 시 스레드 종료 및 연결 반환
+
+"""
+
+class ChargeCacheListener:
+    def __init__(self, engine, poll_seconds: float = 5.0):
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="dues-charge-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("dues charge cache listener failed; retrying")
+                clear_all()
+                self._stop.wait(self.poll_seconds)
+
+    def _listen(self) -> None:
+        raw = self.engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHARGES_CHANNEL}")
+
+            while not self._stop.is_set():
+                ready, _, _ = _select.select([conn], [], [], self.poll_seconds)
+                if not ready:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _apply_payload(conn.notifies.pop(0).payload or "charges")
+        finally:
+            raw.close()
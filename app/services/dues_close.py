@@ -0,0 +1,117 @@
+"""
+services/dues_close.py
+
+회비 기간 마감(Period Close) 서비스.
+
+총무가 기간을 마감하면 해당 청구에는 더 이상 납부를 받지 않으며,
+마감 시점의 회원별 납부 현황과 기간 합계를 스냅샷으로 남긴다.
+마감 이후 관리자 납부 현황 / export / 수납 통계는
+납부 원본 대신 스냅샷을 읽으므로 납부 건수가 아닌 회원 수에 비례한다.
+
+주요 기능:
+- 청구 행 잠금(FOR UPDATE) 후 마감 (동시 납부는 마감 전후 한쪽으로 정렬)
+- 회원별 스냅샷: INSERT ... SELECT (회원 LEFT JOIN 잔액 원장) 1회
+- 기간 합계: 스냅샷 집계 + 수납 통계(by_method / by_grade) 1회씩
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 트랜잭션 제어(commit / rollback)는 라우터에서 수행
+- 마감은 되돌리지 않음 (스냅샷은 수정 / 삭제하지 않음)
+
+관련 파일:
+- app.models.dues          : DuesPeriodSnapshot / DuesPeriodTotal
+- app.services.dues        : 마감 청구 납부 거부 / 스냅샷 기반 납부 현황
+- app.services.dues_analytics : 마감 기간 수납 통계
+- app.routers.admin_dues   : 기간 마감 API
+
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.dues import DuesCharge, DuesBalance, DuesPeriodSnapshot, DuesPeriodTotal
+from app.models.user import User, Role
+from app.services.dues import validate_period, dues_status_case
+from app.services.dues_analytics import analytics_stmt, collect_analytics
+from app.services.dues_cache import invalidate_charges
+
+
+"""
+기간 마감
+
+- 청구가 없거나 이미 마감되었으면 ValueError
+- 회원별 스냅샷 / 기간 합계 저장 후 청구에 closed_at / closed_by 기록
+- 청구 캐시 무효화 (commit 후 다른 요청에도 마감 상태 반영)
+- 반환: DuesPeriodTotal
+
+"""
+
+def close_period(db: Session, *, period: str, closed_by: uuid.UUID) -> DuesPeriodTotal:
+    validate_period(period)
+
+    # 청구 행 잠금: 진행 중인 납부(FK KEY SHARE 잠금)가 끝난 뒤 마감, 이후 납부는 closed_at 으로 거부
+    charge = db.scalar(select(DuesCharge).where(DuesCharge.period == period).with_for_update())
+    if charge is None:
+        raise ValueError("charge not found for that period")
+    if charge.closed_at is not None:
+        raise ValueError("period is already closed")
+
+    closed_at = datetime.now(timezone.utc)
+    paid_amount = func.coalesce(DuesBalance.paid_amount, 0)
+
+    db.execute(
+        pg_insert(DuesPeriodSnapshot).from_select(
+            ["charge_id", "user_id", "name", "student_id", "grade", "amount_due", "paid_amount", "status"],
+            select(
+                literal(charge.id, DuesCharge.id.type),
+                User.id,
+                User.name,
+                User.student_id,
+                User.grade,
+                literal(charge.amount),
+                paid_amount,
+                dues_status_case(paid_amount, literal(charge.amount)),
+            )
+            .select_from(User)
+            .outerjoin(
+                DuesBalance,
+                (DuesBalance.user_id == User.id) & (DuesBalance.charge_id == charge.id),
+            )
+            .where(User.role.in_([Role.MEMBER, Role.ADMIN])),
+        )
+    )
+
+    counts = db.execute(
+        select(
+            func.count().filter(DuesPeriodSnapshot.status == "PAID"),
+            func.count().filter(DuesPeriodSnapshot.status == "PARTIAL"),
+            func.count().filter(DuesPeriodSnapshot.status == "UNPAID"),
+        ).where(DuesPeriodSnapshot.charge_id == charge.id)
+    ).one()
+
+    stats = collect_analytics(db.execute(analytics_stmt([period])).all(), {period: charge.amount})[period]
+
+    total = DuesPeriodTotal(
+        charge_id=charge.id,
+        members=stats["members"],
+        expected_total=stats["expected_total"],
+        collected_total=stats["collected_total"],
+        payments=stats["payments"],
+        paid_count=counts[0],
+        partial_count=counts[1],
+        unpaid_count=counts[2],
+        breakdown={"by_method": stats["by_method"], "by_grade": stats["by_grade"]},
+        closed_at=closed_at,
+    )
+    db.add(total)
+
+    charge.closed_at = closed_at
+    charge.closed_by = closed_by
+    db.flush()
+
+    invalidate_charges(db)
+    return total
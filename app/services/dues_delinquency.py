@@ -0,0 +1,128 @@
+"""
+services/dues_delinquency.py
+
+회비 연체 패턴(Delinquency) 조회 서비스.
+
+이 파일은 최근 청구들에 대한 회원별 완납 여부로
+"N개월 연속 미납" / "최근 M개월 중 K개월 이상 미납" 회원을 찾는다.
+
+주요 기능:
+- 청구별 완납 비트셋(dues_cache.paid_bitsets)에서 미납 비트셋(= 전체 & ~완납)을 만들어
+  비트 연산만으로 패턴 판정 (회원 수 / 64 워드 단위 연산)
+- 연속 미납: 최근 N개 청구의 미납 비트셋 AND
+- K / M 미납: 비트 단위 카운터(ge[j] = j개 이상 미납)를 청구마다 갱신
+- 일치한 회원만 이름 / 학번 / 학년 조회 (쿼리 1회)
+
+집계 기준:
+- 대상 회원은 현재 MEMBER / ADMIN (관리자 납부 현황과 동일)
+- 완납 기준은 잔액 원장(dues_balances)의 PAID 상태, 금액 0 청구는 전원 완납
+- 기간은 달력 월이 아닌 청구 단위 (to_period 이하 최근 청구부터)
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 잘못된 입력은 ValueError 로 알림
+
+관련 파일:
+- app.services.dues_cache  : 완납 비트셋 (PaidBitsets)
+- app.routers.admin_dues   : 연체 회원 조회 API
+
+"""
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.services.dues import validate_period, MAX_SCHEDULE_PERIODS
+from app.services.dues_cache import charge_cache, paid_bitsets
+
+
+# 비트셋에서 켜진 비트의 위치(회원 서수) 목록
+def _ordinals(bits: int) -> list[int]:
+    result = []
+    while bits:
+        low = bits & -bits
+        result.append(low.bit_length() - 1)
+        bits ^= low
+    return result
+
+
+"""
+연체 회원 조회
+
+- consecutive 지정  : 최근 consecutive 개 청구를 모두 미납
+- missed + window   : 최근 window 개 청구 중 missed 개 이상 미납
+- 두 패턴 중 하나만 지정 가능, 범위는 1 ~ MAX_SCHEDULE_PERIODS
+- to_period 지정 시 그 period 이하 청구만 대상 (기본: 최신 청구까지)
+- 청구가 패턴 길이보다 적으면 연속 미납은 빈 결과, K / M 미납은 있는 청구만으로 판정
+- 반환: (periods, members)
+  periods : 판정에 사용한 청구 period 목록 (오름차순)
+  members : [{user_id, name, student_id, grade, missed_count, missed_periods}] (학번 순)
+
+"""
+
+def find_delinquent_members(
+    db: Session,
+    *,
+    consecutive: int | None = None,
+    missed: int | None = None,
+    window: int | None = None,
+    to_period: str | None = None,
+) -> tuple[list[str], list[dict]]:
+    if (consecutive is None) == (missed is None and window is None):
+        raise ValueError("either consecutive or missed/window is required")
+    if consecutive is None and (missed is None or window is None):
+        raise ValueError("missed and window must be given together")
+    for value in (consecutive, missed, window):
+        if value is not None and not 1 <= value <= MAX_SCHEDULE_PERIODS:
+            raise ValueError(f"months must be between 1 and {MAX_SCHEDULE_PERIODS}")
+    if missed is not None and missed > window:
+        raise ValueError("missed must not exceed window")
+    if to_period is not None:
+        validate_period(to_period)
+
+    charges = [
+        c for c in charge_cache.ordered_desc(db)
+        if to_period is None or c.period <= to_period
+    ][: consecutive or window]
+    periods = [c.period for c in reversed(charges)]
+    if not charges or (consecutive is not None and len(charges) < consecutive):
+        return periods, []
+
+    members, paid = paid_bitsets.snapshot(db, charges)
+    full = (1 << len(members)) - 1
+    unpaid = [full & ~paid[c.id] for c in reversed(charges)]
+
+    if consecutive is not None:
+        matched = full
+        for bits in unpaid:
+            matched &= bits
+    else:
+        # ge[j]: 지금까지 j개 이상 미납한 회원
+        ge = [full] + [0] * missed
+        for bits in unpaid:
+            for j in range(missed, 0, -1):
+                ge[j] |= ge[j - 1] & bits
+        matched = ge[missed]
+
+    by_user = {}
+    for i in _ordinals(matched):
+        by_user[members[i]] = [p for p, bits in zip(periods, unpaid) if bits >> i & 1]
+    if not by_user:
+        return periods, []
+
+    users = db.execute(
+        select(User.id, User.name, User.student_id, User.grade)
+        .where(User.id.in_(list(by_user)))
+        .order_by(User.student_id)
+    ).all()
+    return periods, [
+        {
+            "user_id": u.id,
+            "name": u.name,
+            "student_id": u.student_id,
+            "grade": u.grade,
+            "missed_count": len(by_user[u.id]),
+            "missed_periods": by_user[u.id],
+        }
+        for u in users
+    ]
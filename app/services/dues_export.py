@@ -0,0 +1,306 @@
+"""
+services/dues_export.py
+
+회비 export 파일(XLSX / CSV) 생성 유틸리티.
+
+관리자 납부 현황 / 납부 내역 / 매트릭스 다운로드에서 사용한다.
+XLSX 는 openpyxl write-only 모드로 행을 한 줄씩 기록하고,
+완성된 파일은 메모리가 아닌 SpooledTemporaryFile 에 저장하여
+일정 크기 이상이면 디스크로 넘긴 뒤 청크 단위로 읽어 내보낸다.
+CSV 는 Postgres 에서 COPY (SELECT ...) TO STDOUT 결과 바이트를 그대로 내보내고,
+Postgres(psycopg2)가 아니면 행 묶음(batch)마다 문자열 하나를 만들어 내보낸다.
+
+주요 기능:
+- 여러 시트(sheet)를 한 워크북에 기록 (시트마다 헤더 + 행 iterable)
+- 행은 iterable 로 받아 한 번에 한 행만 메모리에 유지
+- 저장된 파일을 고정 크기 청크로 읽는 iterator (응답 스트리밍용)
+- 행 묶음 iterable → CSV 문자열 iterator (BOM + 헤더를 먼저 전송)
+- COPY ... TO STDOUT (copy_expert) 바이트 스트리밍 (백그라운드 스레드 + 크기 제한 큐)
+- 납부 현황 / 납부 내역 CSV: COPY 우선, 그 외 DB 는 서버 측 커서 + csv.writer
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음 (라우터가 StreamingResponse 로 감쌈)
+- 임시 파일은 청크 iterator 가 끝나거나 닫힐 때 정리
+
+관련 파일:
+- app.routers.admin_dues   : 납부 현황 / 납부 내역 / 매트릭스 다운로드 API
+
+"""
+
+import csv
+import io
+import queue
+import tempfile
+import threading
+from typing import IO, Iterable, Iterator
+
+from openpyxl import Workbook
+from sqlalchemy.orm import Session
+
+from app.services.dues import (
+    ChargeInfo,
+    admin_status_export_stmt,
+    payment_export_stmt,
+    iter_admin_status_rows,
+    iter_payment_rows,
+    STREAM_BATCH_SIZE,
+)
+from app.services.dues_cache import status_cache
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# 이 크기까지는 메모리, 넘으면 디스크 임시 파일
+XLSX_SPOOL_MAX_SIZE = 1024 * 1024
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+"""
+XLSX 워크북 작성
+
+- sheets: [(시트 이름, 헤더, 행 iterable)] 순서대로 시트 생성
+- write-only 워크북이라 행은 기록 즉시 시트 임시 파일로 내려가고 메모리에 쌓이지 않음
+- 반환: 처음 위치로 되감은 SpooledTemporaryFile (호출 측에서 닫음)
+
+"""
+
+def write_xlsx(sheets: Iterable[tuple[str, list, Iterable[list]]]) -> IO[bytes]:
+    spool = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE)
+    try:
+        save_xlsx(sheets, spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+# 시트를 기록한 워크북을 fileobj(경로 또는 파일 객체)에 저장
+def save_xlsx(sheets: Iterable[tuple[str, list, Iterable[list]]], fileobj) -> None:
+    wb = Workbook(write_only=True)
+    for title, header, rows in sheets:
+        ws = wb.create_sheet(title=title)
+        ws.append(header)
+        for row in rows:
+            ws.append(row)
+    wb.save(fileobj)
+
+
+# 파일을 청크 단위로 읽어 반환, 끝나면(또는 중단되면) 파일을 닫음
+def iter_file_chunks(fileobj: IO[bytes], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    try:
+        while chunk := fileobj.read(chunk_size):
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+"""
+CSV 스트리밍
+
+- Excel에서 UTF-8 CSV 한글 깨짐 방지를 위해 BOM 과 헤더를 첫 청크로 먼저 반환
+- batches: 행 목록의 iterable, 행 묶음마다 문자열 하나를 반환 (행마다 yield 하지 않음)
+
+"""
+
+def iter_csv(header: list, batches: Iterable[Iterable[list]]) -> Iterator[str]:
+    output = io.StringIO()
+    writer = csv.writer(output)
+
+    writer.writerow(header)
+    yield "\ufeff" + output.getvalue()
+
+    for batch in batches:
+        output.seek(0)
+        output.truncate(0)
+        writer.writerows(batch)
+        yield output.getvalue()
+
+
+"""
+Postgres COPY CSV 스트리밍
+
+- COPY (SELECT ...) TO STDOUT WITH (FORMAT csv, HEADER) 를 현재 세션 연결에서 실행
+- copy_expert 는 블로킹 호출이므로 백그라운드 스레드에서 실행하고,
+  받은 바이트는 EXPORT_CHUNK_SIZE 단위로 모아 크기 제한 큐로 넘김 (메모리 상한 = 큐 크기 × 청크)
+- 소비 측이 중단되면(클라이언트 연결 종료 등) 다음 write 에서 COPY 를 중단
+  중단된 연결은 COPY 출력이 남은 상태(다음 문장이 남은 출력을 모두 읽어야 함)이므로
+  연결을 폐기(invalidate)하고 세션 트랜잭션을 rollback (세션은 새 연결로 계속 사용 가능)
+- SELECT 문은 literal_binds 로 컴파일 (값은 서비스 계층에서 만든 UUID / 정수 / period 뿐)
+
+"""
+
+COPY_QUEUE_CHUNKS = 16
+
+_COPY_DONE = object()
+
+# psycopg2.extensions.TRANSACTION_STATUS_ACTIVE: 명령 실행 중 (COPY 출력이 남아 있음)
+_TRANSACTION_STATUS_ACTIVE = 1
+
+
+class _CopyAborted(Exception):
+    pass
+
+
+class _QueueWriter:
+    def __init__(self, chunks: queue.Queue, stop: threading.Event):
+        self._chunks = chunks
+        self._stop = stop
+        self._buf = bytearray()
+
+    def write(self, data) -> None:
+        self._buf += data
+        if len(self._buf) >= EXPORT_CHUNK_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buf:
+            _put(self._chunks, bytes(self._buf), self._stop)
+            self._buf.clear()
+
+
+# 큐가 가득 차 있으면 기다리되, 소비 측이 중단되면 COPY 를 멈추도록 예외
+def _put(chunks: queue.Queue, item, stop: threading.Event) -> None:
+    while True:
+        if stop.is_set():
+            raise _CopyAborted()
+        try:
+            chunks.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+# 현재 세션 연결이 COPY TO STDOUT 을 지원하는지 (Postgres + psycopg2)
+def copy_supported(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def iter_copy_csv(db: Session, stmt, *, prefix: bytes = b"\xef\xbb\xbf") -> Iterator[bytes]:
+    dialect = db.get_bind().dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    copy_sql = f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)"
+
+    # 연결은 요청 스레드에서 확보 (세션 트랜잭션 안에서 실행)
+    raw = db.connection().connection.driver_connection
+    chunks: queue.Queue = queue.Queue(maxsize=COPY_QUEUE_CHUNKS)
+    stop = threading.Event()
+
+    def run():
+        try:
+            writer = _QueueWriter(chunks, stop)
+            with raw.cursor() as cur:
+                cur.copy_expert(copy_sql, writer, size=EXPORT_CHUNK_SIZE)
+            writer.flush()
+            _put(chunks, _COPY_DONE, stop)
+        except _CopyAborted:
+            pass
+        except BaseException as e:
+            try:
+                _put(chunks, e, stop)
+            except _CopyAborted:
+                pass
+
+    yield prefix
+
+    thread = threading.Thread(target=run, name="dues-copy-export", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _COPY_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+        if raw.get_transaction_status() == _TRANSACTION_STATUS_ACTIVE:
+            db.connection().invalidate()
+            db.rollback()
+
+
+STATUS_CSV_HEADER = ["period", "name", "student_id", "status", "amount_due", "paid_amount"]
+PAYMENTS_CSV_HEADER = ["period", "payment_id", "user_id", "amount", "method", "memo", "created_by", "created_at"]
+
+
+# 회원 × 기간 매트릭스 → (헤더, 행 목록) : 이름, 학번, 기간마다 납부 금액 / 상태
+def matrix_table(periods: list[str], rows) -> tuple[list, list[list]]:
+    header = ["name", "student_id"]
+    for p in periods:
+        header += [f"{p}_paid", f"{p}_status"]
+
+    table = []
+    for r in rows:
+        cells = [r.name, r.student_id]
+        for paid, st in zip(r.paid_amounts, r.statuses):
+            cells += [paid, st]
+        table.append(cells)
+    return header, table
+
+
+"""
+관리자 납부 현황 CSV
+
+- 청구가 없으면 헤더만
+- 요청 병합 캐시(status_cache)에 결과가 있으면 캐시에서, 없으면 COPY 로 생성
+- use_cache=False 면 캐시를 보지 않음 (백그라운드 export 작업)
+- COPY 를 쓸 수 없는 DB 는 서버 측 커서 + csv.writer
+
+"""
+
+def iter_status_csv(db: Session, *, period: str, charge: ChargeInfo | None, use_cache: bool = True) -> Iterator:
+    if charge is None:
+        return iter_csv(STATUS_CSV_HEADER, [])
+
+    cached = status_cache.peek(("status", period), charge.id) if use_cache else None
+    if cached is None and copy_supported(db):
+        return iter_copy_csv(db, admin_status_export_stmt(charge))
+
+    if cached is not None:
+        batches = (cached[i:i + STREAM_BATCH_SIZE] for i in range(0, len(cached), STREAM_BATCH_SIZE))
+    else:
+        batches = iter_admin_status_rows(db, charge=charge, use_cache=False)
+    return iter_csv(
+        STATUS_CSV_HEADER,
+        ([[period, r.name, r.student_id, r.status, r.amount_due, r.paid_amount] for r in batch] for batch in batches),
+    )
+
+
+"""
+관리자 납부 내역 CSV
+
+- 청구가 없으면 헤더만
+- Postgres 는 COPY, 그 외 DB 는 서버 측 커서 + csv.writer
+- CSV는 문자열 기반 포맷이므로 UUID / datetime은 문자열로 변환 (일시는 ISO-8601)
+
+"""
+
+def iter_payments_csv(db: Session, *, period: str, charge: ChargeInfo | None) -> Iterator:
+    if charge is None:
+        return iter_csv(PAYMENTS_CSV_HEADER, [])
+    if copy_supported(db):
+        return iter_copy_csv(db, payment_export_stmt(charge))
+
+    return iter_csv(
+        PAYMENTS_CSV_HEADER,
+        (
+            [
+                [
+                    period,
+                    str(p.id),
+                    str(p.user_id),
+                    p.amount,
+                    p.method,
+                    p.memo or "",
+                    str(p.created_by),
+                    p.created_at.isoformat() if p.created_at else "",
+                ]
+                for p in batch
+            ]
+            for batch in iter_payment_rows(db, charge_id=charge.id)
+        ),
+    )
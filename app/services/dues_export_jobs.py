@@ -0,0 +1,446 @@
+"""
+services/dues_export_jobs.py
+
+회비 export 백그라운드 작업(Export Job) 서비스.
+
+연간 / 여러 기간 XLSX 보고서처럼 생성이 오래 걸리는 파일을
+요청 워커에서 만들지 않고 작업으로 등록한 뒤 워커 풀이 디스크에 생성한다.
+
+흐름:
+1) normalize_export_request : 작업 종류별 파라미터 검증 / 정규화
+2) submit_export            : 같은 요청 + 같은 데이터의 살아있는 작업이 있으면 재사용, 없으면 QUEUED 작업 등록
+3) (라우터 commit 후) export_runner.submit : 워커 풀에 작업 실행 요청
+4) run_export_job           : QUEUED → RUNNING 선점, 파일 생성, DONE / FAILED 기록
+
+작업 종류:
+- status_csv   : 납부 현황 CSV (period 1개)
+- payments_csv : 납부 내역 CSV (period 1개)
+- status_xlsx  : 납부 현황 XLSX (period 마다 시트)
+- year_xlsx    : 연간 보고서 XLSX (회원 × 기간 매트릭스 시트 + 청구 월마다 납부 현황 시트)
+
+재사용 기준 (cache_key):
+- 작업 종류 + 정규화된 파라미터
+- 대상 청구(id / 금액 / 마감 여부)
+- 회원 데이터 지문 (이름 / 학번 / 학년 / 역할 / 삭제 여부 / 회비 버전)
+  회비 버전(dues_version)은 청구 / 납부 반영 시 증가하므로 납부 변경도 지문에 반영됨
+
+실행 위치:
+- CSV 는 COPY 대기 위주라 스레드 풀
+- XLSX 는 openpyxl 이 CPU 를 쓰므로 프로세스 풀 (API 워커와 GIL 을 다투지 않음)
+- 작업 함수는 DB URL / 저장 디렉터리 / 작업 id 만 받고 프로세스마다 자체 엔진 사용
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 작업 상태는 DB(export_jobs)에 저장하여 어느 API 워커에서도 조회 가능
+- 잘못된 입력은 ValueError 로 알림
+- 트랜잭션 제어(commit)는 submit_export 는 라우터, run_export_job 은 작업 함수에서 수행
+
+관련 파일:
+- app.models.export_job    : export_jobs 테이블
+- app.services.dues_export : CSV / XLSX 생성
+- app.routers.admin_exports : 작업 등록 / 상태 조회 / 다운로드 API
+- scripts.purge_export_jobs : 만료 작업 / 파일 정리
+
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.dues import DuesCharge
+from app.models.export_job import ExportJob
+from app.models.user import User
+from app.services.dues import (
+    validate_period,
+    dues_matrix,
+    _status_rows,
+    MAX_SCHEDULE_PERIODS,
+)
+from app.services.dues_cache import ChargeInfo, _snapshot
+from app.services.dues_export import (
+    iter_status_csv,
+    iter_payments_csv,
+    save_xlsx,
+    matrix_table,
+    STATUS_CSV_HEADER,
+    XLSX_MEDIA_TYPE,
+)
+
+
+CSV_KINDS = ("status_csv", "payments_csv")
+XLSX_KINDS = ("status_xlsx", "year_xlsx")
+EXPORT_KINDS = CSV_KINDS + XLSX_KINDS
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+
+"""
+export 요청 정규화
+
+- CSV 작업      : periods 정확히 1개
+- status_xlsx   : periods 1 ~ MAX_SCHEDULE_PERIODS 개 (중복 제거, 순서 유지)
+- year_xlsx     : year 필수
+- 반환: params dict ({"periods": [...]} 또는 {"year": 2026}), 같은 요청이면 같은 dict
+
+"""
+
+def normalize_export_request(kind: str, *, periods: list[str] | None = None, year: int | None = None) -> dict:
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"kind must be one of {', '.join(EXPORT_KINDS)}")
+
+    if kind == "year_xlsx":
+        if year is None:
+            raise ValueError("year is required for year_xlsx")
+        validate_period(f"{year:04d}-01")
+        return {"year": year}
+
+    periods = list(dict.fromkeys(periods or []))
+    if not periods:
+        raise ValueError("periods is required")
+    for p in periods:
+        validate_period(p)
+    if kind in CSV_KINDS and len(periods) != 1:
+        raise ValueError(f"{kind} takes exactly one period")
+    if len(periods) > MAX_SCHEDULE_PERIODS:
+        raise ValueError(f"at most {MAX_SCHEDULE_PERIODS} periods per export")
+    return {"periods": periods}
+
+
+# 작업 종류 + 파라미터 → (다운로드 파일 이름, media type)
+def _file_meta(kind: str, params: dict) -> tuple[str, str]:
+    if kind == "year_xlsx":
+        return f"dues_{params['year']}.xlsx", XLSX_MEDIA_TYPE
+    periods = params["periods"]
+    suffix = periods[0] if len(periods) == 1 else f"{periods[0]}_{periods[-1]}"
+    if kind == "status_csv":
+        return f"dues_status_{suffix}.csv", CSV_MEDIA_TYPE
+    if kind == "payments_csv":
+        return f"dues_payments_{suffix}.csv", CSV_MEDIA_TYPE
+    return f"dues_status_{suffix}.xlsx", XLSX_MEDIA_TYPE
+
+
+"""
+데이터 지문
+
+- 대상 청구 (id / period / 금액 / 마감 시각)
+- 회원 전체의 (id, 이름, 학번, 학년, 역할, 삭제 여부, 회비 버전) MD5 (DB 에서 계산)
+- 둘 중 하나라도 바뀌면 다른 지문 → 새 파일 생성
+
+"""
+
+def data_fingerprint(db: Session, params: dict) -> str:
+    if "year" in params:
+        in_scope = DuesCharge.period.between(f"{params['year']:04d}-01", f"{params['year']:04d}-12")
+    else:
+        in_scope = DuesCharge.period.in_(params["periods"])
+    charges = db.execute(
+        select(DuesCharge.id, DuesCharge.period, DuesCharge.amount, DuesCharge.closed_at)
+        .where(in_scope)
+        .order_by(DuesCharge.period)
+    ).all()
+
+    member = func.concat_ws(
+        ":", User.id, User.name, User.student_id, User.grade, User.role, User.is_deleted, User.dues_version
+    )
+    members = db.scalar(select(func.md5(func.string_agg(member, aggregate_order_by(literal(","), User.id)))))
+
+    raw = json.dumps(
+        [
+            [[str(c.id), c.period, c.amount, c.closed_at.isoformat() if c.closed_at else None] for c in charges],
+            members,
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_key(kind: str, params: dict, fingerprint: str) -> str:
+    raw = json.dumps([kind, params, fingerprint], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+"""
+export 작업 등록
+
+- 같은 cache_key 의 작업이 있으면 재사용 (반환: (작업, True))
+  · DONE    : 만료 전이고 파일이 남아 있을 때
+  · QUEUED / RUNNING : EXPORT_JOB_TIMEOUT_MINUTES 안에 만들어진 작업
+- 없으면 QUEUED 작업 추가 후 flush (반환: (작업, False), 실행 요청은 commit 후 호출 측에서)
+- 같은 cache_key 동시 등록은 트랜잭션 advisory lock 으로 직렬화
+
+"""
+
+def submit_export(db: Session, *, kind: str, params: dict, created_by: uuid.UUID) -> tuple[ExportJob, bool]:
+    cache_key = _cache_key(kind, params, data_fingerprint(db, params))
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(cache_key))))
+
+    now = datetime.now(timezone.utc)
+    candidates = db.scalars(
+        select(ExportJob)
+        .where(ExportJob.cache_key == cache_key)
+        .where(ExportJob.status != "FAILED")
+        .where(ExportJob.expires_at > now)
+        .order_by(ExportJob.created_at.desc())
+    ).all()
+    stale_before = now - timedelta(minutes=settings.EXPORT_JOB_TIMEOUT_MINUTES)
+    for job in candidates:
+        if job.status == "DONE" and job.file_path and os.path.exists(job.file_path):
+            return job, True
+        if job.status in ("QUEUED", "RUNNING") and job.created_at > stale_before:
+            return job, True
+
+    filename, media_type = _file_meta(kind, params)
+    job = ExportJob(
+        id=uuid.uuid4(),
+        kind=kind,
+        params=params,
+        cache_key=cache_key,
+        status="QUEUED",
+        progress=0,
+        filename=filename,
+        media_type=media_type,
+        created_by=created_by,
+        created_at=now,
+        expires_at=now + timedelta(hours=settings.EXPORT_JOB_TTL_HOURS),
+    )
+    db.add(job)
+    db.flush()
+    return job, False
+
+
+# 작업 조회 (만료된 작업은 없는 것으로 취급, 진행률 폴링을 위해 항상 DB 값으로 갱신)
+def get_export_job(db: Session, job_id: uuid.UUID) -> ExportJob | None:
+    return db.scalar(
+        select(ExportJob)
+        .where(ExportJob.id == job_id)
+        .where(ExportJob.expires_at > func.now())
+        .execution_options(populate_existing=True)
+    )
+
+
+"""
+만료 작업 정리
+
+- expires_at 이 지난 작업 삭제 후 남은 파일 삭제
+- 반환: 삭제된 작업 수
+
+"""
+
+def purge_expired_exports(db: Session) -> int:
+    paths = db.scalars(
+        delete(ExportJob).where(ExportJob.expires_at <= func.now()).returning(ExportJob.file_path)
+    ).all()
+    for path in paths:
+        if path:
+            _remove(path)
+    return len(paths)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+"""
+파일 생성기
+
+- (db, params, path, progress) → path 에 파일 기록
+- progress(0 ~ 100) 는 별도 연결에서 바로 commit 되어 조회 API 에 반영
+- 청구 / 납부 현황은 항상 DB 에서 읽음 (charge_cache / status_cache 미사용)
+  작업 프로세스의 캐시는 API 워커의 commit 으로 무효화되지 않기 때문
+
+"""
+
+def _write_chunks(path: str, chunks) -> None:
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+
+
+# 청구를 DB 에서 직접 조회 (작업은 다른 워커 / 프로세스에서 돌므로 프로세스 내 캐시를 쓰지 않음)
+def _load_charges(db: Session, periods: list[str]) -> dict[str, ChargeInfo]:
+    charges = db.scalars(select(DuesCharge).where(DuesCharge.period.in_(periods))).all()
+    return {c.period: _snapshot(c) for c in charges}
+
+
+def _build_status_csv(db: Session, params: dict, path: str, progress) -> None:
+    period = params["periods"][0]
+    charge = _load_charges(db, [period]).get(period)
+    _write_chunks(path, iter_status_csv(db, period=period, charge=charge, use_cache=False))
+
+
+def _build_payments_csv(db: Session, params: dict, path: str, progress) -> None:
+    period = params["periods"][0]
+    charge = _load_charges(db, [period]).get(period)
+    _write_chunks(path, iter_payments_csv(db, period=period, charge=charge))
+
+
+# 시트 하나를 만들 때마다 진행률 갱신, 한 번에 한 period 의 현황만 메모리에 유지
+def _status_sheets(db: Session, periods: list[str], progress, *, done: int = 0, total: int | None = None):
+    total = total or len(periods)
+    charges = _load_charges(db, periods)
+    for i, p in enumerate(periods):
+        progress((done + i) * 100 // total)
+        charge = charges.get(p)
+        yield p, STATUS_CSV_HEADER, (
+            [p, r.name, r.student_id, r.status, r.amount_due, r.paid_amount]
+            for r in (_status_rows(db, charge) if charge else [])
+        )
+
+
+def _build_status_xlsx(db: Session, params: dict, path: str, progress) -> None:
+    save_xlsx(_status_sheets(db, params["periods"], progress), path)
+
+
+def _build_year_xlsx(db: Session, params: dict, path: str, progress) -> None:
+    year = params["year"]
+    charges, rows = dues_matrix(db, from_period=f"{year:04d}-01", to_period=f"{year:04d}-12")
+    periods = [c.period for c in charges]
+
+    def sheets():
+        header, table = matrix_table(periods, rows)
+        yield f"{year}", header, table
+        yield from _status_sheets(db, periods, progress, done=1, total=len(periods) + 1)
+
+    save_xlsx(sheets(), path)
+
+
+_BUILDERS = {
+    "status_csv": _build_status_csv,
+    "payments_csv": _build_payments_csv,
+    "status_xlsx": _build_status_xlsx,
+    "year_xlsx": _build_year_xlsx,
+}
+
+
+# 프로세스마다 DB URL 별 엔진 하나 (프로세스 풀 워커는 부모 엔진을 물려받지 않음)
+_engines: dict = {}
+_engines_lock = threading.Lock()
+
+
+def _engine(database_url: str):
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            engine = _engines[database_url] = create_engine(database_url, pool_pre_ping=True)
+        return engine
+
+
+"""
+작업 실행 (워커 스레드 / 프로세스에서 호출)
+
+- QUEUED → RUNNING 조건부 UPDATE 로 선점 (이미 다른 워커가 가져갔으면 None 반환)
+- export_dir/<id>.part 에 기록한 뒤 rename 으로 완성 (중간 파일이 다운로드되지 않음)
+- 성공: DONE / progress 100 / 파일 경로 / 크기, 실패: FAILED / 오류 메시지
+- 반환: 최종 상태
+
+"""
+
+def run_export_job(database_url: str, export_dir: str, job_id: uuid.UUID) -> str | None:
+    engine = _engine(database_url)
+
+    def progress(value: int) -> None:
+        with engine.begin() as conn:
+            conn.execute(update(ExportJob).where(ExportJob.id == job_id).values(progress=value))
+
+    with Session(engine) as db:
+        claimed = db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id)
+            .where(ExportJob.status == "QUEUED")
+            .values(status="RUNNING", started_at=func.now())
+            .returning(ExportJob.kind, ExportJob.params, ExportJob.filename)
+        ).first()
+        db.commit()
+        if claimed is None:
+            return None
+
+        os.makedirs(export_dir, exist_ok=True)
+        path = os.path.join(export_dir, f"{job_id}{os.path.splitext(claimed.filename)[1]}")
+        partial = f"{path}.part"
+        try:
+            _BUILDERS[claimed.kind](db, claimed.params, partial, progress)
+            os.replace(partial, path)
+            done = {"status": "DONE", "progress": 100, "file_path": path, "size": os.path.getsize(path)}
+        except Exception as e:
+            db.rollback()
+            _remove(partial)
+            done = {"status": "FAILED", "error": f"{type(e).__name__}: {e}"[:500]}
+
+        db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id)
+            .values(finished_at=func.now(), **done)
+        )
+        db.commit()
+        return done["status"]
+
+
+"""
+작업 실행기
+
+- CSV 작업은 스레드 풀, XLSX 작업은 프로세스 풀(spawn)에서 run_export_job 실행
+- 풀은 처음 submit 할 때 생성 (EXPORT_JOB_PROCESSES=0 이면 XLSX 도 스레드 풀)
+- configure 로 DB URL / 저장 디렉터리 / 풀 크기 변경 (테스트 DB 등), 기존 풀은 종료
+- shutdown : 앱 종료 시 호출
+
+"""
+
+class ExportJobRunner:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self.configure()
+
+    def configure(
+        self,
+        *,
+        database_url: str | None = None,
+        export_dir: str | None = None,
+        threads: int | None = None,
+        processes: int | None = None,
+    ) -> None:
+        self.shutdown()
+        self.database_url = database_url or settings.DATABASE_URL
+        self.export_dir = os.path.abspath(export_dir or settings.EXPORT_DIR)
+        self.threads = settings.EXPORT_JOB_THREADS if threads is None else threads
+        self.processes = settings.EXPORT_JOB_PROCESSES if processes is None else processes
+
+    def _pool(self, kind: str):
+        with self._lock:
+            if kind in XLSX_KINDS and self.processes > 0:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="dues-export")
+            return self._threads
+
+    def submit(self, job: ExportJob) -> Future:
+        return self._pool(job.kind).submit(run_export_job, self.database_url, self.export_dir, job.id)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._lock:
+            pools = [p for p in (self._threads, self._processes) if p is not None]
+            self._threads = self._processes = None
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+export_runner = ExportJobRunner()
@@ -0,0 +1,332 @@
+"""
+services/dues_import.py
+
+회비 납부 일괄 등록(Bulk Import) 서비스.
+
+이 파일은 관리자가 업로드한 CSV / JSON-lines / XLSX 파일을
+한 줄씩 스트리밍으로 파싱하여 회비 납부 기록을 대량으로 생성한다.
+
+주요 기능:
+- CSV / JSON-lines / XLSX(openpyxl read-only) 스트리밍 파서
+- user_id 또는 student_id 로 회원 식별 (회원 / 청구 맵을 한 번만 조회)
+- 검증을 통과한 행은 batch_size 단위 multi-row INSERT
+- 잔액 원장(dues_balances)은 업로드 전체 증분을 모아 한 번에 반영
+- 행별 검증 결과(오류 목록) 리포트 반환
+
+등록 모드:
+- atomic      : 한 행이라도 오류가 있으면 아무것도 저장하지 않음
+- best_effort : 오류 행만 건너뛰고 나머지는 저장
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 트랜잭션 제어(commit / rollback)는 라우터에서 수행
+- 행 단위 쿼리 없이 미리 읽어둔 맵으로만 검증 (청구 마감 여부만 청구당 1회 재확인)
+
+관련 파일:
+- app.services.dues        : period 검증 / 잔액 원장 반영
+- app.routers.admin_dues   : 일괄 등록 API
+
+"""
+
+import csv
+import io
+import json
+import uuid
+import zipfile
+from collections import defaultdict
+from typing import IO, Iterator
+
+from openpyxl import load_workbook
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+
+from app.models.dues import DuesCharge, DuesPayment, PAYMENT_METHOD_CODES
+from app.models.user import User
+from app.services.dues import validate_period, apply_balance_deltas
+from app.services.dues_cache import ChargeInfo, charge_cache
+
+
+PAYMENT_METHODS = tuple(PAYMENT_METHOD_CODES)
+
+
+# 업로드 Content-Type → 파서 형식
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "xlsx",
+}
+
+
+"""
+업로드 행 스트리밍 파서
+
+- 모든 파서는 (행 번호, dict) 를 하나씩 yield
+- 행 번호는 파일 기준 (CSV/XLSX 헤더가 1행, JSON-lines 는 1번째 줄부터)
+- 파일 전체를 메모리에 올리지 않음
+
+"""
+
+def iter_csv_rows(fileobj: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_jsonl_rows(fileobj: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig")
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else {"__error__": "invalid json line"}
+
+
+def iter_xlsx_rows(fileobj: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    wb = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = [str(h).strip() if h is not None else "" for h in header]
+        for row_no, values in enumerate(rows, start=2):
+            if values is None or all(v is None for v in values):
+                continue
+            yield row_no, dict(zip(keys, values))
+    finally:
+        wb.close()
+
+
+PARSERS = {
+    "csv": iter_csv_rows,
+    "jsonl": iter_jsonl_rows,
+    "xlsx": iter_xlsx_rows,
+}
+
+
+class UploadParseError(ValueError):
+    """업로드 파일 자체를 읽을 수 없음 (라우터에서 400 으로 변환)."""
+
+
+"""
+파서 예외 변환
+
+- 파일 자체를 읽을 수 없는 경우(깨진 CSV / XLSX, 인코딩 오류 등) UploadParseError 로 변환
+- 행 검증 / 잔액 반영에서 나는 ValueError 와 구분하기 위해 파서 반복에만 적용
+
+"""
+
+def _guard_parse(rows: Iterator[tuple[int, dict]]) -> Iterator[tuple[int, dict]]:
+    try:
+        yield from rows
+    except (csv.Error, zipfile.BadZipFile, ValueError, KeyError) as e:
+        raise UploadParseError(type(e).__name__) from e
+
+
+# 셀 값을 문자열로 정규화 (빈 값은 None)
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+# 금액 셀을 양의 정수로 변환 ("10,000" / 10000.0 허용)
+def _amount(value) -> int:
+    if isinstance(value, bool):
+        raise ValueError
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError
+        value = int(value)
+    if isinstance(value, str):
+        value = int(value.replace(",", "").strip())
+    if not isinstance(value, int):
+        raise ValueError
+    return value
+
+
+"""
+회원 / 청구 조회 맵 생성
+
+- 업로드 한 번에 회원 쿼리 1회 (청구는 프로세스 내 청구 캐시 사용)
+- users    : user_id 문자열 / student_id → user UUID (활성 회원만)
+- charges  : period → 청구 스냅샷(ChargeInfo)
+
+"""
+
+def load_lookup_maps(db: Session) -> tuple[dict[str, uuid.UUID], dict[str, uuid.UUID], dict[str, ChargeInfo]]:
+    by_id: dict[str, uuid.UUID] = {}
+    by_student_id: dict[str, uuid.UUID] = {}
+    for user_id, student_id in db.execute(
+        select(User.id, User.student_id).where(User.is_deleted.is_(False))
+    ):
+        by_id[str(user_id)] = user_id
+        by_student_id[student_id] = user_id
+
+    charges = {c.period: c for c in charge_cache.ordered_desc(db)}
+    return by_id, by_student_id, charges
+
+
+"""
+업로드 한 행 검증
+
+- 성공 시 DuesPayment INSERT 용 dict 반환
+- 실패 시 ValueError(사유) 발생
+
+"""
+
+def _validate_row(row: dict, *, by_id, by_student_id, charges, created_by: uuid.UUID) -> dict:
+    if "__error__" in row:
+        raise ValueError(row["__error__"])
+
+    raw_user_id = _text(row.get("user_id"))
+    raw_student_id = _text(row.get("student_id"))
+    if raw_user_id:
+        try:
+            user_id = by_id.get(str(uuid.UUID(raw_user_id)))
+        except ValueError:
+            raise ValueError("invalid user_id")
+    elif raw_student_id:
+        user_id = by_student_id.get(raw_student_id)
+    else:
+        raise ValueError("user_id or student_id is required")
+    if user_id is None:
+        raise ValueError("user not found")
+
+    period = _text(row.get("period"))
+    if not period:
+        raise ValueError("period is required")
+    validate_period(period)
+    charge = charges.get(period)
+    if charge is None:
+        raise ValueError("charge not found for that period")
+    if charge.closed_at is not None:
+        raise ValueError("period is closed")
+
+    try:
+        amount = _amount(row.get("amount"))
+    except (ValueError, TypeError):
+        raise ValueError("amount must be an integer")
+    if amount <= 0:
+        raise ValueError("amount must be greater than 0")
+
+    method = (_text(row.get("method")) or "TRANSFER").upper()
+    if method not in PAYMENT_METHODS:
+        raise ValueError("method must be one of CASH, TRANSFER, ETC")
+
+    memo = _text(row.get("memo"))
+    if memo and len(memo) > 255:
+        raise ValueError("memo is too long")
+
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "charge_id": charge.id,
+        "amount": amount,
+        "method": method,
+        "memo": memo,
+        "created_by": created_by,
+    }
+
+
+# 청구 마감 여부 재확인: 공유 잠금으로 마감(FOR UPDATE)과 직렬화, commit 까지 마감 대기
+def _charge_is_open(db: Session, charge_id: uuid.UUID) -> bool:
+    return db.scalar(
+        select(DuesCharge.id)
+        .where(DuesCharge.id == charge_id, DuesCharge.closed_at.is_(None))
+        .with_for_update(read=True)
+    ) is not None
+
+
+"""
+회비 납부 일괄 등록
+
+- rows: (행 번호, dict) 이터레이터 (PARSERS 결과)
+- mode: atomic / best_effort
+- 검증된 행은 batch_size 개씩 multi-row INSERT
+- 청구마다 처음 쓰일 때 한 번 마감 여부를 DB 에서 다시 확인 (청구 캐시가 늦게 갱신된 경우 행 오류로 보고)
+- 파일을 읽을 수 없으면 UploadParseError
+- atomic 모드에서 오류가 발견되면 이후 INSERT를 중단 (rollback은 호출 측)
+- 반환: {"mode", "total", "inserted", "failed", "committed", "errors"}
+
+"""
+
+def import_payments(
+    db: Session,
+    *,
+    rows: Iterator[tuple[int, dict]],
+    mode: str,
+    created_by: uuid.UUID,
+    batch_size: int = 1000,
+) -> dict:
+    by_id, by_student_id, charges = load_lookup_maps(db)
+
+    errors: list[dict] = []
+    open_charges: dict[uuid.UUID, bool] = {}
+    batch: list[dict] = []
+    deltas: dict[tuple[uuid.UUID, uuid.UUID], int] = defaultdict(int)
+    total = 0
+    inserted = 0
+
+    def _flush():
+        nonlocal inserted
+        if batch:
+            db.execute(insert(DuesPayment), batch)
+            inserted += len(batch)
+            batch.clear()
+
+    for row_no, row in _guard_parse(rows):
+        total += 1
+        try:
+            payment = _validate_row(
+                row,
+                by_id=by_id,
+                by_student_id=by_student_id,
+                charges=charges,
+                created_by=created_by,
+            )
+        except ValueError as e:
+            errors.append({"row": row_no, "error": str(e)})
+            continue
+
+        charge_id = payment["charge_id"]
+        if charge_id not in open_charges:
+            open_charges[charge_id] = _charge_is_open(db, charge_id)
+        if not open_charges[charge_id]:
+            errors.append({"row": row_no, "error": "period is closed"})
+            continue
+
+        if mode == "atomic" and errors:
+            # 이미 실패가 확정된 업로드: 검증만 계속 진행
+            continue
+
+        batch.append(payment)
+        deltas[(payment["user_id"], payment["charge_id"])] += payment["amount"]
+        if len(batch) >= batch_size:
+            _flush()
+
+    committed = not (mode == "atomic" and errors)
+    if committed:
+        _flush()
+        apply_balance_deltas(db, dict(deltas))
+    else:
+        inserted = 0
+
+    return {
+        "mode": mode,
+        "total": total,
+        "inserted": inserted,
+        "failed": len(errors),
+        "committed": committed,
+        "errors": errors,
+    }
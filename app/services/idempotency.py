@@ -0,0 +1,125 @@
+"""
+services/idempotency.py
+
+멱등성 키(Idempotency-Key) 서비스.
+
+관리자 회비 쓰기 API가 같은 Idempotency-Key 로 재요청되었을 때
+회비 테이블을 건드리지 않고 처음 응답을 그대로 돌려주기 위한 로직.
+
+흐름:
+1) find_stored_response  : 살아있는 키가 있으면 저장된 응답 반환 (재요청)
+2) 실제 쓰기 수행 (같은 트랜잭션)
+3) store_response        : 키 + 응답 저장, 동시에 같은 키가 먼저 저장되었다면 False
+   → 호출 측은 rollback 후 1)을 다시 수행해 먼저 저장된 응답 반환
+
+설계 원칙:
+- HTTP / FastAPI 의존성 없음
+- 트랜잭션 제어(commit / rollback)는 라우터에서 수행
+- 같은 키에 다른 요청 본문이 오면 IdempotencyKeyMismatch
+
+관련 파일:
+- app.models.idempotency   : idempotency_keys 테이블
+- app.routers.admin_dues   : 청구 생성 / 납부 기록 API
+- scripts.purge_idempotency_keys : 만료 키 정리
+
+"""
+
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """같은 Idempotency-Key 가 다른 요청 본문으로 재사용된 경우."""
+
+
+# 요청자 + 요청 본문 → SHA-256 (키 순서와 무관)
+def request_fingerprint(actor_id: uuid.UUID, payload: dict) -> str:
+    raw = json.dumps([str(actor_id), payload], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+"""
+저장된 응답 조회
+
+- 만료되지 않은 (scope, key) 가 있으면 IdempotencyKey 반환, 없으면 None
+- request_hash 가 다르면 IdempotencyKeyMismatch 발생
+
+"""
+
+def find_stored_response(db: Session, *, scope: str, key: str, request_hash: str) -> IdempotencyKey | None:
+    stored = db.scalar(
+        select(IdempotencyKey)
+        .where(IdempotencyKey.scope == scope)
+        .where(IdempotencyKey.key == key)
+        .where(IdempotencyKey.expires_at > func.now())
+    )
+    if stored is None:
+        return None
+    if stored.request_hash != request_hash:
+        raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request")
+    return stored
+
+
+"""
+응답 저장
+
+- INSERT ... ON CONFLICT DO UPDATE (만료된 기존 키만 덮어씀)
+- 살아있는 같은 키가 이미 있으면(동시 요청) False 반환
+  (진행 중인 다른 트랜잭션이 있으면 그 트랜잭션이 끝날 때까지 대기)
+
+"""
+
+def store_response(
+    db: Session,
+    *,
+    scope: str,
+    key: str,
+    request_hash: str,
+    status_code: int,
+    body: dict,
+) -> bool:
+    now = datetime.now(timezone.utc)
+    stmt = pg_insert(IdempotencyKey).values(
+        scope=scope,
+        key=key,
+        request_hash=request_hash,
+        status_code=status_code,
+        response_body=body,
+        created_at=now,
+        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+        set_={
+            "request_hash": stmt.excluded.request_hash,
+            "status_code": stmt.excluded.status_code,
+            "response_body": stmt.excluded.response_body,
+            "created_at": stmt.excluded.created_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=IdempotencyKey.expires_at <= func.now(),
+    ).returning(IdempotencyKey.key)
+
+    return db.execute(stmt).first() is not None
+
+
+"""
+만료 키 정리
+
+- expires_at 이 지난 키 삭제 (expires_at 인덱스 사용)
+- 반환: 삭제된 행 수
+
+"""
+
+def purge_expired_keys(db: Session) -> int:
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now()))
+    return result.rowcount
@@ -0,0 +1,213 @@
+"""
+
+회비 export 성능 측정 스크립트.
+
+- 커밋 메시지에 기록한 측정 수치를 다시 재현하기 위한 도구이며,
+  비교 대상인 이전 구현(old)도 이 파일 안에 그대로 보존한다.
+- 측정 항목: 전체 시간, 초당 행 수, 첫 행까지의 시간, yield 횟수,
+  최대 RSS(ru_maxrss, 실행 직전 대비 증가량)
+- 최대 RSS 는 프로세스 단위 값이므로 구현마다 새 프로세스로 실행할 것
+
+csv : 납부 현황 / 납부 내역 CSV
+  old  - 전체 행을 읽은 뒤 행마다 yield (ORM 객체 / 목록 전체 메모리 적재)
+  new  - 서버 측 커서(yield_per) + 묶음 단위 csv.writer
+  copy - Postgres COPY (SELECT ...) TO STDOUT
+
+xlsx : 납부 현황 XLSX (합성 6열 행, DB 불필요)
+  old  - 일반 Workbook 에 전체 행을 쌓은 뒤 BytesIO 로 저장
+  new  - write_xlsx (write-only 워크북 + SpooledTemporaryFile) 후 청크 단위 읽기
+  tracemalloc 최대 할당량과 시간을 행 수별로 출력 (tracemalloc 때문에 시간은 실제보다 느림)
+
+사용 방법
+- 가상환경 접속, 벤치마크 DB 준비 (python -m scripts.bench_seed <url> --recreate)
+- (.venv) ~\backend~$ python -m scripts.bench_exports csv <url> {status,payments} {old,new,copy}
+- (.venv) ~\backend~$ python -m scripts.bench_exports xlsx [--rows 10000 50000 200000]
+
+"""
+
+import argparse
+import csv
+import io
+import resource
+import time
+import tracemalloc
+from dotenv import load_dotenv
+load_dotenv()
+
+from openpyxl import Workbook
+from sqlalchemy import create_engine, desc, select
+from sqlalchemy.orm import Session
+
+from app.models.dues import DuesPayment
+from app.services.dues import get_charge_by_period, _status_rows, iter_admin_status_rows, iter_payment_rows
+from app.services.dues_export import (
+    STATUS_CSV_HEADER,
+    PAYMENTS_CSV_HEADER,
+    iter_csv,
+    iter_status_csv,
+    iter_payments_csv,
+    iter_file_chunks,
+    write_xlsx,
+)
+from scripts.bench_seed import BENCH_PERIOD
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# 이전 구현: 납부 현황 전체를 읽고 행마다 yield
+def old_status_csv(db: Session, charge):
+    rows = _status_rows(db, charge)
+    yield "﻿"
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(STATUS_CSV_HEADER)
+    yield output.getvalue()
+    for r in rows:
+        output.seek(0)
+        output.truncate(0)
+        writer.writerow([charge.period, r.name, r.student_id, r.status, r.amount_due, r.paid_amount])
+        yield output.getvalue()
+
+
+# 이전 구현: 납부 ORM 객체 전체를 읽고 행마다 yield
+def old_payments_csv(db: Session, charge):
+    yield "﻿"
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(PAYMENTS_CSV_HEADER)
+    yield output.getvalue()
+    payments = db.scalars(
+        select(DuesPayment)
+        .where(DuesPayment.charge_id == charge.id)
+        .order_by(desc(DuesPayment.created_at))
+    ).all()
+    for p in payments:
+        output.seek(0)
+        output.truncate(0)
+        writer.writerow([
+            charge.period, str(p.id), str(p.user_id), p.amount, p.method, p.memo or "",
+            str(p.created_by), p.created_at.isoformat(),
+        ])
+        yield output.getvalue()
+
+
+def new_status_csv(db: Session, charge):
+    batches = (
+        [[charge.period, r.name, r.student_id, r.status, r.amount_due, r.paid_amount] for r in batch]
+        for batch in iter_admin_status_rows(db, charge=charge, use_cache=False)
+    )
+    return iter_csv(STATUS_CSV_HEADER, batches)
+
+
+def new_payments_csv(db: Session, charge):
+    batches = (
+        [
+            [charge.period, str(p.id), str(p.user_id), p.amount, p.method, p.memo or "",
+             str(p.created_by), p.created_at.isoformat()]
+            for p in batch
+        ]
+        for batch in iter_payment_rows(db, charge_id=charge.id)
+    )
+    return iter_csv(PAYMENTS_CSV_HEADER, batches)
+
+
+def copy_status_csv(db: Session, charge):
+    return iter_status_csv(db, period=charge.period, charge=charge, use_cache=False)
+
+
+def copy_payments_csv(db: Session, charge):
+    return iter_payments_csv(db, period=charge.period, charge=charge)
+
+
+CSV_IMPLS = {
+    "status": {"old": old_status_csv, "new": new_status_csv, "copy": copy_status_csv},
+    "payments": {"old": old_payments_csv, "new": new_payments_csv, "copy": copy_payments_csv},
+}
+
+
+def bench_csv(database_url: str, export: str, impl: str) -> None:
+    db = Session(create_engine(database_url))
+    charge = get_charge_by_period(db, BENCH_PERIOD)
+    if charge is None:
+        raise SystemExit(f"no charge for {BENCH_PERIOD}: run scripts.bench_seed first")
+
+    base_rss = _peak_rss_mb()
+    started = time.perf_counter()
+    first_row = None
+    chunks = lines = 0
+    for chunk in CSV_IMPLS[export][impl](db, charge):
+        chunks += 1
+        n = chunk.count(b"\n" if isinstance(chunk, bytes) else "\n")
+        if first_row is None and lines + n > 1:
+            first_row = time.perf_counter() - started
+        lines += n
+    elapsed = time.perf_counter() - started
+    db.close()
+
+    rows = lines - 1
+    print(
+        f"{export:8} {impl:4}: rows={rows} {rows / elapsed:,.0f} rows/s total={elapsed:.2f}s "
+        f"first-row={(first_row or elapsed) * 1000:,.0f}ms yields={chunks} "
+        f"peakRSS=+{_peak_rss_mb() - base_rss:,.0f}MB"
+    )
+
+
+def _synthetic_status_rows(n: int):
+    for i in range(n):
+        yield [BENCH_PERIOD, f"회원{i}", f"2023{i:06d}", "PARTIAL", 10000, i % 10000]
+
+
+# 이전 구현: 일반 Workbook 에 전체 행 적재 후 BytesIO 로 저장
+def old_xlsx(n: int) -> int:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(STATUS_CSV_HEADER)
+    for row in _synthetic_status_rows(n):
+        ws.append(row)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return len(buf.getvalue())
+
+
+def new_xlsx(n: int) -> int:
+    fileobj = write_xlsx([(BENCH_PERIOD, STATUS_CSV_HEADER, _synthetic_status_rows(n))])
+    return sum(len(chunk) for chunk in iter_file_chunks(fileobj))
+
+
+def bench_xlsx(row_counts: list[int]) -> None:
+    for n in row_counts:
+        for impl, fn in [("old", old_xlsx), ("new", new_xlsx)]:
+            tracemalloc.start()
+            started = time.perf_counter()
+            size = fn(n)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"xlsx {impl:3}: rows={n:>7} size={size / 1e6:6.2f}MB "
+                f"peak={peak / 1e6:8.2f}MB time={time.perf_counter() - started:6.2f}s"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dues export implementations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("csv", help="status / payments CSV export (needs a seeded benchmark DB)")
+    p.add_argument("database_url")
+    p.add_argument("export", choices=sorted(CSV_IMPLS))
+    p.add_argument("impl", choices=["old", "new", "copy"])
+
+    p = sub.add_parser("xlsx", help="status XLSX export from synthetic rows")
+    p.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+
+    args = parser.parse_args()
+    if args.command == "csv":
+        bench_csv(args.database_url, args.export, args.impl)
+    else:
+        bench_xlsx(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+
+API 응답 전송 성능 측정 스크립트.
+
+- 커밋 메시지에 기록한 측정 수치를 다시 재현하기 위한 도구
+- 벤치마크 DB 는 scripts.bench_seed 로 준비
+
+compression : 응답 압축 CPU 비용 / 압축률
+  납부 내역 CSV(COPY 출력, 최대 32 MiB)와 회원 목록 JSON(60,000 명)을 64 KiB 청크로 나눠
+  CompressionMiddleware 와 같은 방식(청크마다 flush)으로 압축
+  gzip 1 / 6 / 9, Brotli 1 / 4 / 6 / 9 (brotli 패키지가 설치된 경우만)
+  3회 중 가장 짧은 process_time 기준 MB/s, ms CPU/MB 출력
+
+list : 회원 전체 목록(/admin/users/all) 본문 생성
+  old    - User 엔티티 전체 조회 → jsonable_encoder → json.dumps 한 번 (이전 구현)
+  json   - 서버 측 커서 + {"data": [...], "meta": {...}} 봉투 스트리밍 (?stream=true)
+  ndjson - 서버 측 커서 + NDJSON (Accept: application/x-ndjson)
+  전체 시간, 첫 행까지의 시간, 최대 RSS 증가량 출력 (구현마다 새 프로세스로 실행할 것)
+
+사용 방법
+- 가상환경 접속, 벤치마크 DB 준비 (python -m scripts.bench_seed <url> --recreate)
+- (.venv) ~\backend~$ python -m scripts.bench_responses compression <url>
+- (.venv) ~\backend~$ python -m scripts.bench_responses list <url> {old,json,ndjson}
+
+"""
+
+import argparse
+import json
+import resource
+import time
+from dotenv import load_dotenv
+load_dotenv()
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.compression import _GzipEncoder, _BrotliEncoder, brotli
+from app.core.streaming import iter_batches, iter_json_envelope, iter_ndjson
+from app.models.user import User
+from app.routers.admin import _user_item
+from app.services.dues import get_charge_by_period
+from app.services.dues_export import iter_payments_csv
+from scripts.bench_seed import BENCH_PERIOD
+
+
+CHUNK_SIZE = 64 * 1024
+CSV_LIMIT = 32 * 2**20
+JSON_USERS = 60_000
+
+
+def _csv_chunks(db: Session) -> list[bytes]:
+    charge = get_charge_by_period(db, BENCH_PERIOD)
+    if charge is None:
+        raise SystemExit(f"no charge for {BENCH_PERIOD}: run scripts.bench_seed first")
+    chunks, size = [], 0
+    it = iter_payments_csv(db, period=BENCH_PERIOD, charge=charge)
+    for chunk in it:
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > CSV_LIMIT:
+            it.close()
+            break
+    return chunks
+
+
+def _json_chunks(db: Session) -> list[bytes]:
+    rows = db.execute(
+        select(User.id, User.email, User.name, User.student_id, User.phone, User.grade, User.role)
+        .order_by(User.student_id)
+        .limit(JSON_USERS)
+    ).all()
+    data = [
+        {"id": str(r.id), "email": r.email, "name": r.name, "student_id": r.student_id,
+         "phone": r.phone, "grade": r.grade, "role": r.role.value}
+        for r in rows
+    ]
+    body = json.dumps({"data": data, "meta": {"count": len(data)}}, ensure_ascii=False).encode("utf-8")
+    return [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+
+
+def _run(name: str, chunks: list[bytes], make_encoder) -> None:
+    total = sum(len(c) for c in chunks)
+    best = out = None
+    for _ in range(3):
+        encoder = make_encoder()
+        size = 0
+        started = time.process_time()
+        for i, chunk in enumerate(chunks):
+            size += len(encoder.compress(chunk, final=i == len(chunks) - 1))
+        elapsed = time.process_time() - started
+        if best is None or elapsed < best:
+            best, out = elapsed, size
+    mb = total / 2**20
+    print(f"  {name:8} {mb:6.1f}MB ratio={total / out:5.2f}x {mb / best:7.1f} MB/s {best * 1000 / mb:6.2f} ms CPU/MB")
+
+
+def bench_compression(database_url: str) -> None:
+    db = Session(create_engine(database_url))
+    inputs = [
+        ("payments CSV (64 KiB chunks)", _csv_chunks(db)),
+        ("users JSON (64 KiB chunks)", _json_chunks(db)),
+    ]
+    db.close()
+
+    for label, chunks in inputs:
+        print(label)
+        for level in (1, 6, 9):
+            _run(f"gzip-{level}", chunks, lambda: _GzipEncoder(level))
+        if brotli is None:
+            print("  (brotli not installed: br skipped)")
+            continue
+        for quality in (1, 4, 6, 9):
+            _run(f"br-{quality}", chunks, lambda: _BrotliEncoder(quality))
+
+
+# 이전 구현: 엔티티 전체를 읽어 응답 본문을 한 번에 직렬화
+def old_user_list(db: Session):
+    users = db.scalars(select(User).where(User.is_deleted.is_(False)).order_by(User.student_id)).all()
+    content = {
+        "data": [
+            {"id": str(u.id), "email": u.email, "name": u.name, "student_id": u.student_id,
+             "phone": u.phone, "grade": u.grade, "role": u.role.value}
+            for u in users
+        ],
+        "meta": {"count": len(users)},
+    }
+    yield json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":"))
+
+
+def _streamed_user_list(db: Session, serialize):
+    stmt = (
+        select(User.id, User.email, User.name, User.student_id, User.phone, User.grade, User.role)
+        .where(User.is_deleted.is_(False))
+        .order_by(User.student_id)
+    )
+    return serialize([_user_item(r) for r in batch] for batch in iter_batches(db, stmt))
+
+
+LIST_IMPLS = {
+    "old": old_user_list,
+    "json": lambda db: _streamed_user_list(db, iter_json_envelope),
+    "ndjson": lambda db: _streamed_user_list(db, iter_ndjson),
+}
+
+
+def bench_list(database_url: str, impl: str) -> None:
+    db = Session(create_engine(database_url))
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    first_row = None
+    size = 0
+    for chunk in LIST_IMPLS[impl](db):
+        size += len(chunk.encode("utf-8"))
+        # JSON 봉투의 여는 부분('{"data":[')만 담긴 첫 청크는 행으로 치지 않음
+        if first_row is None and len(chunk) > len('{"data":['):
+            first_row = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+    db.close()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        f"{impl:6}: bytes={size / 2**20:.1f}MB total={elapsed:.2f}s "
+        f"first-row={first_row * 1000:,.0f}ms peakRSS=+{(peak - base_rss) / 1024:,.0f}MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API response encoding")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("compression", help="gzip / Brotli CPU cost per MB (needs a seeded benchmark DB)")
+    p.add_argument("database_url")
+
+    p = sub.add_parser("list", help="member list body, buffered vs streamed (needs a seeded benchmark DB)")
+    p.add_argument("database_url")
+    p.add_argument("impl", choices=sorted(LIST_IMPLS))
+
+    args = parser.parse_args()
+    if args.command == "compression":
+        bench_compression(args.database_url)
+    else:
+        bench_list(args.database_url, args.impl)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+
+성능 측정용 합성 데이터 생성 스크립트.
+
+- 지정한 벤치마크 DB 를 새로 만들고(--recreate) 테이블을 생성한 뒤
+  회원 N 명, 청구 1건(2026-01, 10,000원), 회원마다 납부 M 건(1,000원, 적요 포함),
+  잔액 원장(dues_balances)을 SQL 한 번씩으로 채운다.
+- 마지막에 VACUUM ANALYZE 로 통계를 갱신한다.
+- 기본값(회원 200,000 명 × 납부 5 건 = 납부 1,000,000 건)은
+  CSV export / 목록 스트리밍 / 응답 압축 커밋 메시지의 측정 수치와 같은 규모이다.
+
+주의:
+- 운영 / 개발 DB 가 아닌 전용 DB URL 을 지정할 것 (--recreate 는 DB 를 DROP 한다)
+
+사용 방법
+- 가상환경 접속
+- (.venv) ~\backend~$ python -m scripts.bench_seed postgresql+psycopg2://postgres@localhost/benchcsv --recreate
+  [--users 200000] [--payments-per-user 5]
+- 이어서 scripts.bench_exports / scripts.bench_responses 를 같은 URL 로 실행
+
+"""
+
+import argparse
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.db.base import Base
+from app.models.user import User  # noqa: F401
+from app.models.dues import DuesCharge, DuesPayment, DuesBalance  # noqa: F401
+from app.models.admin_log import AdminActionLog  # noqa: F401
+from app.models.idempotency import IdempotencyKey  # noqa: F401
+from app.models.export_job import ExportJob  # noqa: F401
+
+
+BENCH_PERIOD = "2026-01"
+
+
+def recreate_database(url: str) -> None:
+    target = make_url(url)
+    admin = create_engine(target.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{target.database}"'))
+        conn.execute(text(f'CREATE DATABASE "{target.database}"'))
+    admin.dispose()
+
+
+def seed(url: str, *, users: int, payments_per_user: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO users (id, email, password_hash, name, student_id, phone, grade, role,
+                               is_deleted, refresh_token_version, dues_version)
+            SELECT gen_random_uuid(), 'u' || g || '@bench.local', 'x', '회원' || g, lpad(g::text, 9, '0'),
+                   '010', 1 + g % 4, 'MEMBER', false, 0, 0
+            FROM generate_series(1, :users) g
+        """), {"users": users})
+        conn.execute(text("""
+            INSERT INTO dues_charges (id, period, amount, created_by, created_at)
+            SELECT gen_random_uuid(), :period, 10000, (SELECT id FROM users LIMIT 1), now()
+        """), {"period": int(BENCH_PERIOD.replace("-", ""))})
+        conn.execute(text("""
+            INSERT INTO dues_payments (id, user_id, charge_id, amount, method, memo, created_by, created_at)
+            SELECT gen_random_uuid(), u.id, ch.id, 1000, 2, 'memo', u.id, now() - g * interval '1 second'
+            FROM users u CROSS JOIN dues_charges ch CROSS JOIN generate_series(1, :n) g
+        """), {"n": payments_per_user})
+        conn.execute(text("""
+            INSERT INTO dues_balances (user_id, charge_id, paid_amount, status, updated_at)
+            SELECT user_id, charge_id, sum(amount),
+                   CASE WHEN sum(amount) >= 10000 THEN 'PAID' ELSE 'PARTIAL' END, now()
+            FROM dues_payments GROUP BY 1, 2
+        """))
+
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.autocommit = True
+        raw.driver_connection.cursor().execute("VACUUM ANALYZE")
+    finally:
+        raw.close()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a dedicated benchmark database with synthetic dues data")
+    parser.add_argument("database_url", help="benchmark database URL (never the app database)")
+    parser.add_argument("--recreate", action="store_true", help="DROP and CREATE the database first")
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--payments-per-user", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.recreate:
+        recreate_database(args.database_url)
+    seed(args.database_url, users=args.users, payments_per_user=args.payments_per_user)
+    print(f"✅ seeded {args.users} members, {args.users * args.payments_per_user} payments for {BENCH_PERIOD}")
+
+
+if __name__ == "__main__":
+    main()
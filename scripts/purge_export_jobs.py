@@ -0,0 +1,37 @@
+"""
+
+만료된 export 작업(export_jobs) 정리 스크립트.
+
+- expires_at 이 지난 export 작업 기록과 생성된 파일을 삭제한다.
+- 만료된 작업은 조회 / 재사용 시 이미 무시되므로, 이 스크립트는 디스크 / 테이블 크기 관리용이다.
+- cron 등으로 하루 한 번 정도 실행하는 것을 권장한다.
+
+사용 방법
+- 가상환경 접속
+- (.venv) ~\backend~$ python -m scripts.purge_export_jobs
+
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.db.session import SessionLocal
+from app.services.dues_export_jobs import purge_expired_exports
+
+
+
+def main():
+    db = SessionLocal()
+    try:
+        deleted = purge_expired_exports(db)
+        db.commit()
+        print(f"✅ purged {deleted} expired export jobs")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
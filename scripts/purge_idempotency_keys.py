@@ -0,0 +1,37 @@
+"""
+
+만료된 멱등성 키(idempotency_keys) 정리 스크립트.
+
+- expires_at 이 지난 Idempotency-Key 기록을 삭제한다.
+- 만료된 키는 조회 시 이미 무시되므로, 이 스크립트는 테이블 크기 관리용이다.
+- cron 등으로 하루 한 번 정도 실행하는 것을 권장한다.
+
+사용 방법
+- 가상환경 접속
+- (.venv) ~\backend~$ python -m scripts.purge_idempotency_keys
+
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.db.session import SessionLocal
+from app.services.idempotency import purge_expired_keys
+
+
+
+def main():
+    db = SessionLocal()
+    try:
+        deleted = purge_expired_keys(db)
+        db.commit()
+        print(f"✅ purged {deleted} expired idempotency keys")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
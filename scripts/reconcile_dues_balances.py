@@ -0,0 +1,60 @@
+"""
+
+회비 잔액 원장(dues_balances) 점검 / 재구축 스크립트.
+
+- dues_payments 원본을 기준으로 dues_balances 를 다시 계산하고
+  어긋난(drift) 행을 출력한다.
+- 청구(period) 단위 배치를 여러 스레드에서 병렬 처리한다.
+- 기본 동작은 어긋난 행을 원본 기준으로 바로잡는 것이며,
+  --dry-run 옵션을 주면 보고만 하고 수정하지 않는다.
+
+사용 목적:
+- 잔액 원장 도입(마이그레이션) 후 검증
+- 수동 DB 수정 등으로 원장과 원본이 어긋났을 때 복구
+
+사용 방법
+- 가상환경 접속
+- (.venv) ~\backend~$ python -m scripts.reconcile_dues_balances [--dry-run] [--workers 4] [--batch-size 12]
+
+"""
+
+import argparse
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.db.session import SessionLocal
+from app.services.dues_balance import reconcile_balances
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild dues_balances from dues_payments")
+    parser.add_argument("--dry-run", action="store_true", help="report drift only, do not fix")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=12, help="charges per batch")
+    args = parser.parse_args()
+
+    report = reconcile_balances(
+        SessionLocal,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        fix=not args.dry_run,
+    )
+
+    for d in report["drift"]:
+        print(
+            f"  drift {d['period']} user={d['user_id']} "
+            f"stored={d['stored_paid']}/{d['stored_status']} "
+            f"expected={d['expected_paid']}/{d['expected_status']}"
+        )
+
+    if report["drift_count"] == 0:
+        print(f"✅ dues_balances OK ({report['charges']} charges, {report['batches']} batches)")
+    elif report["fixed"]:
+        print(f"🔧 fixed {report['drift_count']} drifted rows ({report['charges']} charges)")
+    else:
+        print(f"⚠️ {report['drift_count']} drifted rows found ({report['charges']} charges, dry-run)")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,11 +21,14 @@ from app.main import app
 from app.core.config import settings
 from app.core.deps import get_db
 from app.db.base import Base
+from app.services import dues_cache
 
 
 from app.models.user import User  # noqa: F401
-from app.models.dues import DuesCharge, DuesPayment  # noqa: F401
+from app.models.dues import DuesCharge, DuesPayment, DuesBalance, DuesPeriodSnapshot, DuesPeriodTotal  # noqa: F401
 from app.models.admin_log import AdminActionLog  # noqa: F401
+from app.models.idempotency import IdempotencyKey  # noqa: F401
+from app.models.export_job import ExportJob  # noqa: F401
 
 
 @pytest.fixture(scope="function")
@@ -44,6 +47,14 @@ def test_engine():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_dues_cache():
+    """테스트마다 DB가 새로 만들어지므로 프로세스 내 회비 캐시도 비움"""
+    dues_cache.clear_all()
+    yield
+    dues_cache.clear_all()
+
+
 @pytest.fixture()
 def db_session(test_engine):
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
@@ -9,8 +9,10 @@
 """
 
 import uuid
+from contextlib import contextmanager
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, event
 
 from app.models.user import User, Role
 from app.core.security import get_password_hash
@@ -92,3 +94,22 @@ def setup_admin_and_member(client, db: Session):
 
 def get_user(db: Session, user_id: str) -> User:
     return db.scalar(select(User).where(User.id == uuid.UUID(user_id)))
+
+
+@contextmanager
+def count_queries(db: Session):
+    """
+    블록 안에서 실행된 SQL 문 개수를 세는 컨텍스트 매니저.
+    - 사용: with count_queries(db_session) as counter: ... / counter["count"]
+    """
+    engine = db.get_bind()
+    counter = {"count": 0}
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["count"] += 1
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
@@ -0,0 +1,127 @@
+"""
+응답 압축 미들웨어 테스트.
+- Accept-Encoding 협상(q 값 / br 선택), 스트리밍 응답의 청크별 즉시 압축,
+  작은 응답 / XLSX / 이미 인코딩된 응답 / Range 응답 제외, 실제 CSV export gzip 전송.
+"""
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip, deflate, br", brotli_available=True) == "br"
+    assert negotiate_encoding("gzip, deflate, br", brotli_available=False) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip", brotli_available=True) == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("*", brotli_available=True) == "br"
+    assert negotiate_encoding("*, gzip;q=0", brotli_available=False) is None
+    assert negotiate_encoding("") is None
+
+
+def _run(response, accept="gzip", **options):
+    """미들웨어를 거친 ASGI 메시지 목록"""
+    async def app(scope, receive, send):
+        await response(scope, receive, send)
+
+    middleware = CompressionMiddleware(app, **options)
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()  # 연결 유지 (StreamingResponse 는 disconnect 를 기다림)
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept.encode())] if accept else [],
+    }
+    asyncio.run(middleware(scope, receive, send))
+    return messages[0], messages[1:]
+
+
+def _headers(start) -> dict:
+    return {k.decode(): v.decode() for k, v in start["headers"]}
+
+
+def test_streaming_response_compressed_per_chunk():
+    chunks = [f"row-{i}," * 200 + "\n" for i in range(5)]
+    start, bodies = _run(StreamingResponse(iter(chunks), media_type="text/csv"))
+
+    headers = _headers(start)
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+
+    # 청크마다 바로 풀 수 있는 데이터가 나옴 (본문을 모으지 않음)
+    decoder = zlib.decompressobj(31)
+    decoded = []
+    for message, chunk in zip(bodies, chunks + [""]):
+        decoded.append(decoder.decompress(message["body"]).decode())
+        assert decoded[-1] == chunk
+    assert bodies[-1]["more_body"] is False
+    assert decoder.eof
+
+
+def test_small_response_and_excluded_types_not_compressed():
+    start, bodies = _run(PlainTextResponse("ok"), minimum_size=100)
+    assert "content-encoding" not in _headers(start)
+    assert bodies[0]["body"] == b"ok"
+
+    big = b"x" * 5000
+    start, bodies = _run(PlainTextResponse(big))
+    assert _headers(start)["content-encoding"] == "gzip"
+    assert gzip.decompress(bodies[0]["body"]) == big
+    assert _headers(start)["content-length"] == str(len(bodies[0]["body"]))
+
+    xlsx = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    for response in [
+        Response(big, media_type=xlsx),
+        Response(big, media_type="text/plain", headers={"Content-Encoding": "identity"}),
+        Response(big, status_code=206, media_type="text/plain", headers={"Content-Range": "bytes 0-4999/9999"}),
+    ]:
+        start, bodies = _run(response)
+        assert _headers(start).get("content-encoding") != "gzip"
+        assert bodies[0]["body"] == big
+
+    # 클라이언트가 압축을 지원하지 않음
+    start, bodies = _run(PlainTextResponse(big), accept=None)
+    assert "content-encoding" not in _headers(start)
+    assert bodies[0]["body"] == big
+
+
+def test_csv_export_sent_gzip(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    h = auth_header(ctx["admin_token"])
+    c = client.post("/admin/dues/charges", headers=h, json={"period": "2026-09", "amount": 10000})
+    assert c.status_code == 200, c.text
+
+    res = client.get("/admin/dues/export?period=2026-09", headers={**h, "Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.text.lstrip("﻿").startswith("period,name,student_id")
+
+    plain = client.get("/admin/dues/export?period=2026-09", headers={**h, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.text == res.text
+
+
+def test_brotli_when_installed():
+    brotli = pytest.importorskip("brotli")
+    chunks = ["a,b,c\n" * 500, "d,e,f\n" * 500]
+    start, bodies = _run(StreamingResponse(iter(chunks), media_type="text/csv"), accept="gzip, br")
+
+    assert _headers(start)["content-encoding"] == "br"
+    decoder = brotli.Decompressor()
+    assert decoder.process(bodies[0]["body"]).decode() == chunks[0]
+    assert b"".join(decoder.process(m["body"]) for m in bodies[1:]).decode() == chunks[1]
@@ -0,0 +1,103 @@
+"""
+
+
+
+관리자 회비 일괄 납부 자동 배분(/admin/dues/payments/allocate) 테스트.
+- 금액이 오래된 미납 / 부분 납부 청구부터 채워지는지,
+  마감 청구 제외 / 잔액 초과 거부와 요청 1회의 쿼리 수 상한,
+  이 워커의 청구 캐시에 없는 청구(다른 워커가 생성)로의 배분을 확인한다.
+
+
+
+"""
+
+import uuid
+
+from sqlalchemy import insert, select
+
+from app.models.dues import DuesCharge
+from app.models.user import User, Role
+from tests.helpers import auth_header, setup_admin_and_member, count_queries
+
+
+def _me(client, token, period):
+    return client.get(f"/dues/me?period={period}", headers=auth_header(token)).json()["data"]
+
+
+def test_allocate_payment_fifo(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_headers = auth_header(ctx["admin_token"])
+
+    for period in ["2026-01", "2026-02", "2026-03", "2026-04"]:
+        r = client.post("/admin/dues/charges", headers=admin_headers, json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+    r = client.post(
+        "/admin/dues/payments",
+        headers=admin_headers,
+        json={"user_id": ctx["user_id"], "period": "2026-02", "amount": 4000},
+    )
+    assert r.status_code == 200, r.text
+    assert client.post("/admin/dues/charges/2026-01/close", headers=admin_headers).status_code == 200
+
+    # 잔액 합계(6000 + 10000 + 10000) 초과 → 아무것도 저장하지 않음
+    r = client.post(
+        "/admin/dues/payments/allocate",
+        headers=admin_headers,
+        json={"user_id": ctx["user_id"], "amount": 26001},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "amount exceeds open balance (26000)"
+
+    with count_queries(db_session) as q:
+        res = client.post(
+            "/admin/dues/payments/allocate",
+            headers=admin_headers,
+            json={"user_id": ctx["user_id"], "amount": 20000, "method": "CASH", "memo": "3개월분"},
+        )
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["meta"] == {"count": 3, "amount": 20000}
+    assert [(p["period"], p["amount"]) for p in body["data"]] == [("2026-02", 6000), ("2026-03", 10000), ("2026-04", 4000)]
+    assert {p["method"] for p in body["data"]} == {"CASH"}
+    assert q["count"] <= 10
+
+    token = ctx["user_token"]
+    assert _me(client, token, "2026-01")["status"] == "UNPAID"
+    assert _me(client, token, "2026-02")["status"] == "PAID"
+    assert _me(client, token, "2026-03")["status"] == "PAID"
+    assert (_me(client, token, "2026-04")["status"], _me(client, token, "2026-04")["paid_amount"]) == ("PARTIAL", 4000)
+
+    r = client.post(
+        "/admin/dues/payments/allocate",
+        headers=admin_headers,
+        json={"user_id": ctx["user_id"], "amount": 6000},
+    )
+    assert r.status_code == 200, r.text
+    r = client.post(
+        "/admin/dues/payments/allocate",
+        headers=admin_headers,
+        json={"user_id": ctx["user_id"], "amount": 1000},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "no open charges for that user"
+
+
+def test_allocate_payment_to_charge_missing_from_cache(client, db_session, test_engine):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_headers = auth_header(ctx["admin_token"])
+    r = client.post("/admin/dues/charges", headers=admin_headers, json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+    assert client.get("/admin/dues/charges", headers=admin_headers).status_code == 200  # 청구 캐시 적재
+
+    # 다른 워커가 만든 청구: 이 워커의 청구 캐시에는 아직 없음
+    admin_id = db_session.scalar(select(User.id).where(User.role == Role.ADMIN))
+    with test_engine.begin() as conn:
+        conn.execute(insert(DuesCharge).values(id=uuid.uuid4(), period="2026-02", amount=10000, created_by=admin_id))
+
+    res = client.post(
+        "/admin/dues/payments/allocate",
+        headers=admin_headers,
+        json={"user_id": ctx["user_id"], "amount": 15000},
+    )
+    assert res.status_code == 200, res.text
+    assert [(p["period"], p["amount"]) for p in res.json()["data"]] == [("2026-01", 10000), ("2026-02", 5000)]
@@ -0,0 +1,104 @@
+"""
+
+
+
+관리자 기간별 수납 통계(/admin/dues/analytics) 테스트.
+- 청구 총액 / 수납 총액 / 수납률, 납부 방법별 · 학년별 세부 통계,
+  마감 기간 캐시 적중과 납부 / 회원 변경 시 캐시 무효화를 확인한다.
+
+
+
+"""
+
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def _pay(client, token, user_id, period, amount, method):
+    r = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(token),
+        json={"user_id": user_id, "period": period, "amount": amount, "method": method},
+    )
+    assert r.status_code == 200, r.text
+
+
+def test_admin_dues_analytics(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_id = ctx["user_id"]
+
+    for period in ["2024-01", "2024-02"]:
+        r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+
+    _pay(client, admin_token, user_id, "2024-01", 6000, "CASH")
+    _pay(client, admin_token, user_id, "2024-01", 4000, "TRANSFER")
+
+    res = client.get("/admin/dues/analytics?from=2024-01&to=2024-12", headers=auth_header(admin_token))
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["meta"]["count"] == 2
+    assert body["meta"]["cached"] == 0
+
+    jan, feb = body["data"]
+    # 대상: ADMIN(4학년) + MEMBER(2학년)
+    assert jan["period"] == "2024-01"
+    assert jan["expected_total"] == 20000
+    assert jan["collected_total"] == 10000
+    assert jan["collection_rate"] == 0.5
+    assert jan["members"] == 2
+    assert jan["payments"] == 2
+    assert {m["method"]: m["collected_total"] for m in jan["by_method"]} == {"CASH": 6000, "TRANSFER": 4000}
+    grades = {g["grade"]: g for g in jan["by_grade"]}
+    assert grades[2]["collected_total"] == 10000
+    assert grades[2]["collection_rate"] == 1.0
+    assert grades[4]["expected_total"] == 10000
+    assert grades[4]["collected_total"] == 0
+
+    assert feb["collected_total"] == 0
+    assert feb["by_method"] == []
+
+    # 마감된 기간은 캐시에서 응답
+    res = client.get("/admin/dues/analytics?from=2024-01&to=2024-12", headers=auth_header(admin_token))
+    assert res.json()["meta"]["cached"] == 2
+    assert res.json()["data"] == body["data"]
+
+    # 납부가 반영되면 해당 기간만 무효화
+    _pay(client, admin_token, user_id, "2024-02", 3000, "ETC")
+    res = client.get("/admin/dues/analytics?from=2024-01&to=2024-12", headers=auth_header(admin_token))
+    assert res.json()["meta"]["cached"] == 1
+    assert res.json()["data"][1]["collected_total"] == 3000
+
+    res = client.get("/admin/dues/analytics?from=2024-12&to=2024-01", headers=auth_header(admin_token))
+    assert res.status_code == 400
+
+
+def test_admin_dues_analytics_invalidated_on_member_change(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2024-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    res = client.get("/admin/dues/analytics?from=2024-01&to=2024-01", headers=auth_header(admin_token))
+    assert res.json()["data"][0]["expected_total"] == 20000
+
+    # 신규 회원 승인 → 청구 대상 증가
+    reg = client.post(
+        "/auth/register",
+        json={
+            "email": "new_member@test.com",
+            "password": "UserPassw0rd!",
+            "name": "신규회원",
+            "student_id": "20240001",
+            "phone": "010-1111-2222",
+            "grade": 1,
+        },
+    )
+    assert reg.status_code == 200, reg.text
+    approve = client.post(f"/admin/guest/{reg.json()['data']['id']}/approve", headers=auth_header(admin_token))
+    assert approve.status_code == 200, approve.text
+
+    res = client.get("/admin/dues/analytics?from=2024-01&to=2024-01", headers=auth_header(admin_token))
+    assert res.json()["meta"]["cached"] == 0
+    assert res.json()["data"][0]["expected_total"] == 30000
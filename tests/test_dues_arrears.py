@@ -0,0 +1,96 @@
+"""
+
+
+
+관리자 회원별 누적 미납 랭킹(/admin/dues/arrears) 테스트.
+- 누적 미납 금액 / 미납 기간 수 / 가장 오래된 미납 기간 계산,
+  정렬과 커서 페이지네이션(중복/누락 없음), 잘못된 커서 / 커서 값 타입(400)을 확인한다.
+
+
+
+"""
+
+import base64
+import json
+
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def _cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def test_admin_arrears_ranking_and_pagination(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_id = ctx["user_id"]
+
+    for period in ["2026-01", "2026-02", "2026-03"]:
+        r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+
+    # MEMBER: 1월 완납, 2월 부분납 → 미납 2개 기간(2월, 3월), 16000
+    for period, amount in [("2026-01", 10000), ("2026-02", 4000)]:
+        r = client.post(
+            "/admin/dues/payments",
+            headers=auth_header(admin_token),
+            json={"user_id": user_id, "period": period, "amount": amount, "method": "TRANSFER"},
+        )
+        assert r.status_code == 200, r.text
+
+    res = client.get("/admin/dues/arrears", headers=auth_header(admin_token))
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["meta"]["total"] == 2  # ADMIN + MEMBER
+
+    # ADMIN 은 전액 미납(30000)이라 1위, MEMBER 는 2위
+    first, second = body["data"]
+    assert first["arrears_total"] == 30000
+    assert first["unpaid_periods"] == 3
+    assert second["user_id"] == user_id
+    assert second["arrears_total"] == 16000
+    assert second["unpaid_periods"] == 2
+    assert second["oldest_unpaid_period"] == "2026-02"
+
+    # limit=1 커서 페이지네이션
+    seen = []
+    cursor = None
+    while True:
+        url = "/admin/dues/arrears?limit=1&sort=oldest"
+        if cursor:
+            url += f"&cursor={cursor}"
+        page = client.get(url, headers=auth_header(admin_token)).json()
+        seen += [r["user_id"] for r in page["data"]]
+        cursor = page["meta"]["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == 2
+    assert seen[1] == user_id  # oldest 오름차순: ADMIN(2026-01) → MEMBER(2026-02)
+
+
+def test_admin_arrears_invalid_cursor_400(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+
+    res = client.get("/admin/dues/arrears?cursor=not-a-cursor", headers=auth_header(ctx["admin_token"]))
+    assert res.status_code == 400
+    assert res.json()["detail"] == "invalid cursor"
+
+    # 형식은 맞지만 정렬 키 / 학번 타입이 다른 커서
+    for sort, values in [
+        ("arrears", ["abc", "S1"]),
+        ("arrears", [True, "S1"]),
+        ("unpaid_periods", [1.5, "S1"]),
+        ("name", [1, "S1"]),
+        ("student_id", ["S1", 7]),
+        ("oldest", ["2026-01", None]),
+        ("oldest", ["january", "S1"]),
+    ]:
+        res = client.get(
+            f"/admin/dues/arrears?sort={sort}&cursor={_cursor(values)}",
+            headers=auth_header(ctx["admin_token"]),
+        )
+        assert res.status_code == 400, (sort, values)
+        assert res.json()["detail"] == "invalid cursor"
+
+    res = client.get(f"/admin/dues/arrears?sort=arrears&cursor={_cursor([0, 'S1'])}", headers=auth_header(ctx["admin_token"]))
+    assert res.status_code == 200, res.text
@@ -0,0 +1,142 @@
+"""
+
+
+
+회비 잔액 원장(dues_balances) 테스트.
+- 청구 생성 시 UNPAID 행 생성, 납부 시 누적 금액/상태 증분 반영,
+  원본(dues_payments)과 어긋난 원장을 reconcile_balances 로
+  점검(drift 보고) 및 재구축하는지, 재구축 중 진행 중인 납부의 증분을 덮어쓰지 않는지 확인한다.
+
+
+
+"""
+
+import threading
+import time
+import uuid
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.models.dues import DuesBalance
+from app.services.dues import record_payment
+from app.services.dues_balance import reconcile_balances, reconcile_charge_batch
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def _balance(db, user_id: str, charge_id: str) -> DuesBalance | None:
+    db.expire_all()
+    return db.scalar(
+        select(DuesBalance)
+        .where(DuesBalance.user_id == uuid.UUID(user_id))
+        .where(DuesBalance.charge_id == uuid.UUID(charge_id))
+    )
+
+
+def test_balance_ledger_updated_on_charge_and_payment(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_id = ctx["user_id"]
+
+    c = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-01", "amount": 10000})
+    assert c.status_code == 200, c.text
+    charge_id = c.json()["data"]["id"]
+
+    b = _balance(db_session, user_id, charge_id)
+    assert b is not None
+    assert (b.paid_amount, b.status) == (0, "UNPAID")
+
+    for amount, expected in [(4000, "PARTIAL"), (6000, "PAID")]:
+        p = client.post(
+            "/admin/dues/payments",
+            headers=auth_header(admin_token),
+            json={"user_id": user_id, "period": "2026-01", "amount": amount, "method": "CASH"},
+        )
+        assert p.status_code == 200, p.text
+        b = _balance(db_session, user_id, charge_id)
+        assert b.status == expected
+
+    assert b.paid_amount == 10000
+
+
+def test_reconcile_balances_reports_and_fixes_drift(client, db_session, test_engine):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_id = ctx["user_id"]
+
+    c = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-02", "amount": 10000})
+    charge_id = c.json()["data"]["id"]
+    p = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(admin_token),
+        json={"user_id": user_id, "period": "2026-02", "amount": 10000, "method": "TRANSFER"},
+    )
+    assert p.status_code == 200, p.text
+
+    # 원장을 임의로 망가뜨림
+    db_session.execute(
+        update(DuesBalance)
+        .where(DuesBalance.user_id == uuid.UUID(user_id))
+        .values(paid_amount=3000, status="PARTIAL")
+    )
+    db_session.commit()
+
+    factory = sessionmaker(bind=test_engine)
+
+    report = reconcile_balances(factory, fix=False, workers=2, batch_size=1)
+    assert report["drift_count"] == 1
+    d = report["drift"][0]
+    assert d["user_id"] == user_id
+    assert (d["stored_paid"], d["expected_paid"], d["expected_status"]) == (3000, 10000, "PAID")
+
+    report = reconcile_balances(factory, fix=True, workers=2, batch_size=1)
+    assert report["drift_count"] == 1
+
+    b = _balance(db_session, user_id, charge_id)
+    assert (b.paid_amount, b.status) == (10000, "PAID")
+
+    assert reconcile_balances(factory, fix=False)["drift_count"] == 0
+
+
+def test_reconcile_waits_for_in_flight_payment(client, db_session, test_engine):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_id = ctx["user_id"]
+
+    c = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-02", "amount": 10000})
+    charge_id = c.json()["data"]["id"]
+    p = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(admin_token),
+        json={"user_id": user_id, "period": "2026-02", "amount": 4000},
+    )
+    assert p.status_code == 200, p.text
+    db_session.execute(update(DuesBalance).values(paid_amount=0, status="UNPAID"))
+    db_session.commit()
+
+    factory = sessionmaker(bind=test_engine)
+
+    # 다른 워커의 납부: 기록했지만 아직 commit 전
+    payer = factory()
+    record_payment(payer, user_id=uuid.UUID(user_id), period="2026-02", amount=3000,
+                   method="CASH", memo=None, created_by=uuid.UUID(user_id))
+
+    result = {}
+
+    def repair():
+        with factory() as db:
+            result["drift"] = reconcile_charge_batch(db, charge_ids=[uuid.UUID(charge_id)], fix=True)
+
+    t = threading.Thread(target=repair)
+    t.start()
+    time.sleep(0.3)
+    assert t.is_alive()  # 납부 트랜잭션이 끝날 때까지 대기
+    payer.commit()
+    payer.close()
+    t.join(timeout=10)
+
+    # commit 된 납부까지 포함한 합계로 재구축 (납부 증분이 덮어써지지 않음)
+    assert [d["expected_paid"] for d in result["drift"]] == [7000]
+    b = _balance(db_session, user_id, charge_id)
+    assert (b.paid_amount, b.status) == (7000, "PARTIAL")
+    assert reconcile_balances(factory, fix=False)["drift_count"] == 0
@@ -0,0 +1,120 @@
+"""
+
+
+
+은행 거래내역 대사(/admin/dues/reconcile) 테스트.
+- 입금자명 / 적요 학번으로 회원 식별, 금액 기준 미납 청구 배정(여러 달 분할),
+  매칭 실패 사유, 제안 일괄 확정(/reconcile/confirm) 후 잔액 반영을 확인한다.
+
+
+
+"""
+
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def test_bank_reconcile_suggest_and_confirm(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    for period in ["2026-01", "2026-02"]:
+        r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+
+    statement = (
+        "거래일시,입금자명,입금액,적요\n"
+        "2026-01-05,테스트 유저,\"10,000\",1월 회비\n"
+        f"2026-02-03,엄마,10000,{ctx['user_student_id']} 회비\n"
+        "2026-02-04,모르는사람,10000,\n"
+        "2026-02-05,테스트유저,0,\n"
+    )
+    res = client.post(
+        "/admin/dues/reconcile",
+        headers={**auth_header(admin_token), "Content-Type": "text/csv"},
+        content=statement.encode("utf-8"),
+    )
+    assert res.status_code == 200, res.text
+    data = res.json()["data"]
+
+    suggestions = data["suggestions"]
+    assert [(s["line"], s["period"], s["matched_by"]) for s in suggestions] == [
+        (2, "2026-01", "name"),
+        (3, "2026-02", "student_id"),
+    ]
+    assert all(s["user_id"] == ctx["user_id"] for s in suggestions)
+    assert [(u["line"], u["reason"]) for u in data["unmatched"]] == [
+        (4, "member not found"),
+        (5, "not a deposit"),
+    ]
+
+    confirm = client.post(
+        "/admin/dues/reconcile/confirm",
+        headers=auth_header(admin_token),
+        json={"payments": suggestions},
+    )
+    assert confirm.status_code == 200, confirm.text
+    assert confirm.json()["data"]["inserted"] == 2
+
+    me = client.get("/dues/me", headers=auth_header(ctx["user_token"])).json()["data"]
+    assert me["status"] == "PAID"
+    assert me["arrears_total"] == 0
+
+
+def test_bank_reconcile_splits_deposit_across_months(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    for period in ["2026-01", "2026-02", "2026-03"]:
+        r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+    r = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(admin_token),
+        json={"user_id": ctx["user_id"], "period": "2026-01", "amount": 4000, "method": "CASH"},
+    )
+    assert r.status_code == 200, r.text
+
+    statement = (
+        "입금자명,입금액\n"
+        "테스트유저,30000\n"
+        "테스트유저,5000\n"
+    )
+    res = client.post(
+        "/admin/dues/reconcile",
+        headers={**auth_header(admin_token), "Content-Type": "text/csv"},
+        content=statement.encode("utf-8"),
+    )
+    assert res.status_code == 200, res.text
+    data = res.json()["data"]
+
+    # 30,000 → 1월 잔액 6,000 + 2월 10,000 + 3월 10,000, 남은 4,000 은 매칭 실패
+    assert [(s["line"], s["period"], s["amount"]) for s in data["suggestions"]] == [
+        (2, "2026-01", 6000),
+        (2, "2026-02", 10000),
+        (2, "2026-03", 10000),
+    ]
+    assert [(u["line"], u["amount"], u["reason"]) for u in data["unmatched"]] == [
+        (2, 4000, "exceeds open charges"),
+        (3, 5000, "no open charge"),
+    ]
+
+    confirm = client.post(
+        "/admin/dues/reconcile/confirm",
+        headers=auth_header(admin_token),
+        json={"payments": data["suggestions"]},
+    )
+    assert confirm.status_code == 200, confirm.text
+    assert confirm.json()["data"]["inserted"] == 3
+
+    me = client.get("/dues/me", headers=auth_header(ctx["user_token"])).json()["data"]
+    assert me["arrears_total"] == 0
+
+
+def test_bank_reconcile_missing_columns_400(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+
+    res = client.post(
+        "/admin/dues/reconcile",
+        headers={**auth_header(ctx["admin_token"]), "Content-Type": "text/csv"},
+        content="foo,bar\n1,2\n".encode("utf-8"),
+    )
+    assert res.status_code == 400
+    assert res.json()["detail"] == "bank statement must have depositor and amount columns"
@@ -0,0 +1,178 @@
+"""
+
+
+
+관리자 회비 납부 일괄 등록(/admin/dues/payments/bulk) 테스트.
+- CSV / JSON-lines / XLSX 업로드, user_id / student_id 식별,
+  atomic 모드 전체 취소(400)와 best_effort 모드 부분 저장,
+  잔액 원장 반영(/dues/me)을 확인한다.
+
+
+
+"""
+
+import io
+import json
+
+from datetime import datetime, timezone
+
+from openpyxl import Workbook
+from sqlalchemy import update
+
+from app.models.dues import DuesCharge
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def _setup(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    for period in ["2026-01", "2026-02"]:
+        r = client.post(
+            "/admin/dues/charges",
+            headers=auth_header(ctx["admin_token"]),
+            json={"period": period, "amount": 10000},
+        )
+        assert r.status_code == 200, r.text
+    return ctx
+
+
+def test_bulk_payments_csv_ok(client, db_session):
+    ctx = _setup(client, db_session)
+
+    body = (
+        "\ufeffuser_id,student_id,period,amount,method,memo\n"
+        f"{ctx['user_id']},,2026-01,\"10,000\",TRANSFER,1월\n"
+        f",{ctx['user_student_id']},2026-02,4000,cash,2월 부분\n"
+    )
+    res = client.post(
+        "/admin/dues/payments/bulk",
+        headers={**auth_header(ctx["admin_token"]), "Content-Type": "text/csv"},
+        content=body.encode("utf-8"),
+    )
+    assert res.status_code == 200, res.text
+    report = res.json()["data"]
+    assert (report["total"], report["inserted"], report["failed"]) == (2, 2, 0)
+
+    me = client.get("/dues/me?period=2026-02", headers=auth_header(ctx["user_token"])).json()["data"]
+    assert me["status"] == "PARTIAL"
+    assert me["paid_amount"] == 4000
+    assert me["arrears_total"] == 6000
+
+
+def test_bulk_payments_atomic_rejects_all(client, db_session):
+    ctx = _setup(client, db_session)
+
+    lines = [
+        {"student_id": ctx["user_student_id"], "period": "2026-01", "amount": 10000},
+        {"student_id": "no-such-student", "period": "2026-01", "amount": 10000},
+        {"student_id": ctx["user_student_id"], "period": "2030-01", "amount": 10000},
+    ]
+    body = "\n".join(json.dumps(x) for x in lines) + "\nnot json\n"
+    res = client.post(
+        "/admin/dues/payments/bulk",
+        headers={**auth_header(ctx["admin_token"]), "Content-Type": "application/x-ndjson"},
+        content=body.encode("utf-8"),
+    )
+    assert res.status_code == 400, res.text
+    detail = res.json()["detail"]
+    assert detail["failed"] == 3
+    assert [e["row"] for e in detail["errors"]] == [2, 3, 4]
+    assert detail["errors"][0]["error"] == "user not found"
+    assert detail["errors"][1]["error"] == "charge not found for that period"
+
+    # 아무것도 저장되지 않아야 함
+    me = client.get("/dues/me?period=2026-01", headers=auth_header(ctx["user_token"])).json()["data"]
+    assert me["paid_amount"] == 0
+
+
+def test_bulk_payments_xlsx_best_effort(client, db_session):
+    ctx = _setup(client, db_session)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["student_id", "period", "amount", "method"])
+    ws.append([ctx["user_student_id"], "2026-01", 10000, "TRANSFER"])
+    ws.append([ctx["user_student_id"], "2026-02", -5, "TRANSFER"])
+    buf = io.BytesIO()
+    wb.save(buf)
+
+    res = client.post(
+        "/admin/dues/payments/bulk?mode=best_effort&format=xlsx",
+        headers=auth_header(ctx["admin_token"]),
+        content=buf.getvalue(),
+    )
+    assert res.status_code == 200, res.text
+    report = res.json()["data"]
+    assert (report["inserted"], report["failed"]) == (1, 1)
+    assert report["errors"] == [{"row": 3, "error": "amount must be greater than 0"}]
+
+    me = client.get("/dues/me?period=2026-01", headers=auth_header(ctx["user_token"])).json()["data"]
+    assert me["status"] == "PAID"
+
+
+def test_bulk_payments_unsupported_format_400(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+
+    res = client.post(
+        "/admin/dues/payments/bulk",
+        headers={**auth_header(ctx["admin_token"]), "Content-Type": "application/pdf"},
+        content=b"%PDF",
+    )
+    assert res.status_code == 400
+
+
+def test_bulk_payments_malformed_upload_400(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+
+    # 따옴표가 닫히지 않아 필드 크기 제한을 넘는 CSV → csv.Error
+    res = client.post(
+        "/admin/dues/payments/bulk",
+        headers={**auth_header(ctx["admin_token"]), "Content-Type": "text/csv"},
+        content=b'student_id,period,amount\n"' + b"x" * 200_000,
+    )
+    assert res.status_code == 400, res.text
+    assert res.json()["detail"] == "could not parse upload: Error"
+
+    res = client.post(
+        "/admin/dues/payments/bulk?format=xlsx",
+        headers=auth_header(ctx["admin_token"]),
+        content=b"not a workbook",
+    )
+    assert res.status_code == 400, res.text
+    assert res.json()["detail"] == "could not parse upload: BadZipFile"
+
+
+def test_bulk_payments_closed_after_cache_load_is_row_error(client, db_session):
+    ctx = _setup(client, db_session)
+
+    def _upload(body: str, mode: str):
+        return client.post(
+            f"/admin/dues/payments/bulk?mode={mode}",
+            headers={**auth_header(ctx["admin_token"]), "Content-Type": "text/csv"},
+            content=body.encode("utf-8"),
+        )
+
+    # 청구 캐시 적재 후, 캐시를 거치지 않고 2026-01 청구 마감
+    res = _upload(f"student_id,period,amount\n{ctx['user_student_id']},2026-02,1000\n", "atomic")
+    assert res.status_code == 200, res.text
+    db_session.execute(
+        update(DuesCharge).where(DuesCharge.period == "2026-01").values(closed_at=datetime.now(timezone.utc))
+    )
+    db_session.commit()
+
+    body = (
+        "student_id,period,amount\n"
+        f"{ctx['user_student_id']},2026-01,10000\n"
+        f"{ctx['user_student_id']},2026-02,2000\n"
+    )
+    res = _upload(body, "atomic")
+    assert res.status_code == 400, res.text
+    assert res.json()["detail"]["errors"] == [{"row": 2, "error": "period is closed"}]
+
+    res = _upload(body, "best_effort")
+    assert res.status_code == 200, res.text
+    report = res.json()["data"]
+    assert (report["inserted"], report["failed"]) == (1, 1)
+    assert report["errors"] == [{"row": 2, "error": "period is closed"}]
+
+    me = client.get("/dues/me?period=2026-02", headers=auth_header(ctx["user_token"])).json()["data"]
+    assert me["paid_amount"] == 3000
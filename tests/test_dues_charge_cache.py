@@ -0,0 +1,140 @@
+"""
+
+
+
+회비 청구 프로세스 내 캐시 테스트.
+- 반복 조회는 캐시 hit, 청구 생성 시 무효화되어 목록에 즉시 반영되는지,
+  다른 워커가 만든 청구(캐시에 없는 period)도 조회되는지,
+  NOTIFY 리스너가 캐시를 무효화하는지, 긴 청구 id 목록이 잘리지 않고
+  전체 무효화 payload 로 대체되는지 확인한다.
+
+
+
+"""
+
+import select
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.models.dues import DuesCharge
+from app.core.config import settings
+from app.services.dues_cache import (
+    ChargeCacheListener,
+    CHARGES_CHANNEL,
+    NOTIFY_PAYLOAD_LIMIT,
+    charge_cache,
+    mark_payments,
+)
+from tests.helpers import auth_header, setup_admin_and_member, get_user
+
+
+def _stats(client, token) -> dict:
+    r = client.get("/admin/dues/cache/stats", headers=auth_header(token))
+    assert r.status_code == 200, r.text
+    return r.json()["data"]["charges"]
+
+
+def test_charge_cache_hits_and_invalidation_on_create(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    before = _stats(client, admin_token)
+    for _ in range(3):
+        r = client.get("/admin/dues/charges", headers=auth_header(admin_token))
+        assert r.status_code == 200, r.text
+        assert [c["period"] for c in r.json()["data"]] == ["2026-01"]
+    after = _stats(client, admin_token)
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+    assert after["size"] == 1
+
+    # 청구 생성 → 캐시 무효화 → 목록에 즉시 반영
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-02", "amount": 10000})
+    assert r.status_code == 200, r.text
+    r = client.get("/admin/dues/charges", headers=auth_header(admin_token))
+    assert [c["period"] for c in r.json()["data"]] == ["2026-02", "2026-01"]
+    assert _stats(client, admin_token)["invalidations"] > after["invalidations"]
+
+    # 중복 청구는 캐시와 무관하게 DB 기준으로 거부
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-02", "amount": 10000})
+    assert r.status_code == 409
+
+
+def test_charge_cache_finds_charge_created_elsewhere(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_token = ctx["user_token"]
+
+    r = client.get("/admin/dues/charges", headers=auth_header(admin_token))
+    assert r.json()["data"] == []
+
+    # 다른 워커가 만든 청구: 이 프로세스 캐시는 무효화되지 않음
+    member = get_user(db_session, ctx["user_id"])
+    db_session.add(DuesCharge(period="2026-03", amount=5000, created_by=member.id))
+    db_session.commit()
+
+    r = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(admin_token),
+        json={"user_id": ctx["user_id"], "period": "2026-03", "amount": 5000, "method": "CASH"},
+    )
+    assert r.status_code == 200, r.text
+
+    r = client.get("/dues/me/payments?period=2026-03", headers=auth_header(user_token))
+    assert r.json()["meta"]["count"] == 1
+
+
+def test_charge_cache_listener_invalidates_on_notify(test_engine, db_session):
+    charge_cache.by_period(db_session, "2026-01")
+    assert charge_cache.stats()["size"] == 0
+    invalidations = charge_cache.invalidations
+
+    listener = ChargeCacheListener(test_engine, poll_seconds=0.2)
+    listener.start()
+    try:
+        deadline = time.monotonic() + 5
+        while charge_cache.invalidations == invalidations and time.monotonic() < deadline:
+            with test_engine.begin() as conn:
+                conn.execute(text("SELECT pg_notify(:channel, '')"), {"channel": CHARGES_CHANNEL})
+            time.sleep(0.1)
+    finally:
+        listener.stop()
+
+    assert charge_cache.invalidations > invalidations
+
+
+def test_notify_payload_never_truncates_charge_ids(test_engine, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "DUES_CACHE_NOTIFY", True)
+    raw = test_engine.raw_connection()
+    try:
+        raw.driver_connection.autocommit = True
+        raw.driver_connection.cursor().execute(f"LISTEN {CHARGES_CHANNEL}")
+
+        def received():
+            conn = raw.driver_connection
+            deadline = time.monotonic() + 5
+            while not conn.notifies and time.monotonic() < deadline:
+                select.select([conn], [], [], 0.2)
+                conn.poll()
+            payloads = [n.payload for n in conn.notifies]
+            conn.notifies.clear()
+            return payloads
+
+        few = [uuid.uuid4() for _ in range(3)]
+        mark_payments(db_session, few)
+        db_session.commit()
+        [payload] = received()
+        assert payload.startswith("paid:")
+        assert {uuid.UUID(c) for c in payload[5:].split(",")} == set(few)
+
+        many = [uuid.uuid4() for _ in range(NOTIFY_PAYLOAD_LIMIT // 36 + 1)]
+        mark_payments(db_session, many)
+        db_session.commit()
+        assert received() == ["members"]
+    finally:
+        raw.close()
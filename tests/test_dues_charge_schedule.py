@@ -0,0 +1,73 @@
+"""
+
+
+
+관리자 회비 청구 일정 일괄 생성(/admin/dues/charges/schedule) 테스트.
+- 범위 + 기본 금액 / 목록 지정으로 청구를 한 번에 만들고,
+  이미 있는 period 는 skipped 로 보고되는지, 잔액 원장과 입력 오류(400)를 확인한다.
+
+
+
+"""
+
+from sqlalchemy import select, func
+
+from app.models.dues import DuesBalance
+from tests.helpers import auth_header, setup_admin_and_member, count_queries
+
+
+def test_charge_schedule_range_with_overrides(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-05", "amount": 7000})
+    assert r.status_code == 200, r.text
+
+    body = {
+        "from": "2026-03",
+        "to": "2027-02",
+        "amount": 10000,
+        "charges": [{"period": "2026-09", "amount": 15000}],
+    }
+    with count_queries(db_session) as counter:
+        res = client.post("/admin/dues/charges/schedule", headers=auth_header(admin_token), json=body)
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert data["meta"] == {"requested": 12, "created": 11, "skipped": 1}
+    assert data["data"]["skipped"] == ["2026-05"]
+    created = {c["period"]: c["amount"] for c in data["data"]["created"]}
+    assert list(created) == sorted(created)
+    assert created["2026-09"] == 15000
+    assert created["2027-02"] == 10000
+    assert "2026-05" not in created
+
+    # 청구 개수와 무관한 고정 쿼리 수 (인증 + INSERT RETURNING + 원장 초기화)
+    assert counter["count"] <= 5
+
+    # 생성된 청구마다 MEMBER / ADMIN 잔액 원장 행 생성
+    assert db_session.scalar(select(func.count()).select_from(DuesBalance)) == 12 * 2
+
+    r = client.get("/admin/dues/charges", headers=auth_header(admin_token))
+    assert r.json()["meta"]["count"] == 12
+
+    # 같은 일정 재요청 → 모두 skipped
+    res = client.post("/admin/dues/charges/schedule", headers=auth_header(admin_token), json=body)
+    assert res.json()["meta"] == {"requested": 12, "created": 0, "skipped": 12}
+
+
+def test_charge_schedule_validation(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    headers = auth_header(ctx["admin_token"])
+    url = "/admin/dues/charges/schedule"
+
+    assert client.post(url, headers=headers, json={}).status_code == 400
+    assert client.post(url, headers=headers, json={"from": "2026-01", "to": "2026-06"}).status_code == 400
+    assert client.post(url, headers=headers, json={"from": "2026-06", "to": "2026-01", "amount": 1}).status_code == 400
+    assert client.post(url, headers=headers, json={"from": "2020-01", "to": "2035-12", "amount": 1}).status_code == 400
+    dup = {"charges": [{"period": "2026-01", "amount": 1}, {"period": "2026-01", "amount": 2}]}
+    assert client.post(url, headers=headers, json=dup).status_code == 400
+    bad = {"charges": [{"period": "2026-13", "amount": 1}]}
+    assert client.post(url, headers=headers, json=bad).status_code == 400
+
+    r = client.get("/admin/dues/charges", headers=headers)
+    assert r.json()["meta"]["count"] == 0
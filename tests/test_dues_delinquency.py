@@ -0,0 +1,104 @@
+"""
+
+
+
+관리자 연체 회원 조회(/admin/dues/delinquency) 테스트.
+- 연속 미납 / 최근 M개 중 K개 미납 판정과 회원별 미납 기간,
+  납부 commit 시 비트셋 재적재 없이 비트만 갱신되는지,
+  다른 워커의 변경(이벤트 없음)이 TTL 경과 후 반영되는지 확인한다.
+
+
+
+"""
+
+from sqlalchemy import update
+
+from app.models.dues import DuesBalance
+from app.services.dues_cache import paid_bitsets
+from tests.helpers import auth_header, setup_admin_and_member
+
+PERIODS = ["2026-01", "2026-02", "2026-03", "2026-04", "2026-05", "2026-06"]
+
+
+def _pay(client, headers, user_id, period, amount=10000):
+    r = client.post("/admin/dues/payments", headers=headers, json={"user_id": user_id, "period": period, "amount": amount})
+    assert r.status_code == 200, r.text
+
+
+def _delinquent(client, headers, query):
+    res = client.get(f"/admin/dues/delinquency?{query}", headers=headers)
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def test_delinquency_patterns(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    headers = auth_header(ctx["admin_token"])
+    user_id = ctx["user_id"]
+
+    for period in PERIODS:
+        r = client.post("/admin/dues/charges", headers=headers, json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+    status = client.get("/admin/dues/status?period=2026-01", headers=headers).json()["data"]
+    admin_id = next(u["user_id"] for u in status if u["user_id"] != user_id)
+
+    # 회원: 01, 02 완납 / 05 부분 납부, 관리자: 06 만 완납
+    _pay(client, headers, user_id, "2026-01")
+    _pay(client, headers, user_id, "2026-02")
+    _pay(client, headers, user_id, "2026-05", 5000)
+    _pay(client, headers, admin_id, "2026-06")
+
+    body = _delinquent(client, headers, "consecutive=4")
+    assert body["meta"]["periods"] == PERIODS[2:]
+    assert [(m["user_id"], m["missed_periods"]) for m in body["data"]] == [(user_id, PERIODS[2:])]
+
+    body = _delinquent(client, headers, "consecutive=3&to=2026-05")
+    assert body["meta"]["periods"] == ["2026-03", "2026-04", "2026-05"]
+    assert {m["user_id"] for m in body["data"]} == {user_id, admin_id}
+
+    body = _delinquent(client, headers, "missed=5&window=6")
+    assert [(m["user_id"], m["missed_count"]) for m in body["data"]] == [(admin_id, 5)]
+    assert body["data"][0]["missed_periods"] == PERIODS[:5]
+
+    # 부족한 청구 수 → 연속 미납은 빈 결과
+    assert _delinquent(client, headers, "consecutive=7")["data"] == []
+
+    # 납부 commit → 비트만 갱신 (재적재 없음)
+    loads = paid_bitsets.loads
+    _pay(client, headers, user_id, "2026-06")
+    assert _delinquent(client, headers, "consecutive=4")["data"] == []
+    assert _delinquent(client, headers, "missed=4&window=6")["data"][0]["user_id"] == admin_id
+    assert paid_bitsets.loads == loads
+
+
+def test_delinquency_bitsets_expire_after_ttl(client, db_session, test_engine):
+    ctx = setup_admin_and_member(client, db_session)
+    headers = auth_header(ctx["admin_token"])
+    user_id = ctx["user_id"]
+
+    for period in PERIODS[:2]:
+        r = client.post("/admin/dues/charges", headers=headers, json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+    _pay(client, headers, user_id, "2026-01")
+    assert user_id not in {m["user_id"] for m in _delinquent(client, headers, "consecutive=2")["data"]}
+
+    # 다른 워커의 변경: 세션 이벤트 없이 잔액 원장만 바뀜 → TTL 전에는 이전 비트셋
+    with test_engine.begin() as conn:
+        conn.execute(update(DuesBalance).values(status="UNPAID", paid_amount=0))
+    assert user_id not in {m["user_id"] for m in _delinquent(client, headers, "consecutive=2")["data"]}
+
+    expirations = paid_bitsets.expirations
+    paid_bitsets._loaded_at -= paid_bitsets.ttl_seconds + 1
+    assert user_id in {m["user_id"] for m in _delinquent(client, headers, "consecutive=2")["data"]}
+    assert paid_bitsets.expirations == expirations + 1
+
+
+def test_delinquency_validation(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    headers = auth_header(ctx["admin_token"])
+
+    for query in ["", "missed=3", "consecutive=3&missed=1&window=2", "missed=4&window=3", "consecutive=0", "consecutive=2&to=2026-13"]:
+        res = client.get(f"/admin/dues/delinquency?{query}", headers=headers)
+        assert res.status_code == 400, query
+
+    assert _delinquent(client, headers, "consecutive=2")["data"] == []
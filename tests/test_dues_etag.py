@@ -0,0 +1,94 @@
+"""
+
+
+
+회원 회비 API ETag / 304 테스트.
+- If-None-Match 일치 시 회비 계산 없이 304 를 반환하는지,
+  본인 납부 / 새 청구가 생기면 ETag 가 바뀌고 다른 회원 납부에는 영향이 없는지,
+  회비 버전이 같은 두 회원의 ETag 가 서로 일치하지 않는지 확인한다.
+
+
+
+"""
+
+from tests.helpers import auth_header, setup_admin_and_member, count_queries
+
+
+def test_member_dues_etag_and_not_modified(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_headers = auth_header(ctx["user_token"])
+
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    first = client.get("/dues/me", headers=user_headers)
+    assert first.status_code == 200, first.text
+    etag = first.headers["ETag"]
+    assert "Authorization" in first.headers["Vary"]
+
+    with count_queries(db_session) as full:
+        client.get("/dues/me", headers=user_headers)
+    with count_queries(db_session) as cached:
+        res = client.get("/dues/me", headers={**user_headers, "If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+    assert "Authorization" in res.headers["Vary"]
+    assert res.content == b""
+    assert cached["count"] < full["count"]
+
+    for url in ["/dues/me/payments", "/dues/me/statement"]:
+        res = client.get(url, headers={**user_headers, "If-None-Match": etag})
+        assert res.status_code == 304
+
+    # 관리자 본인(다른 회원) 납부 → 이 회원의 ETag 는 그대로
+    status = client.get("/admin/dues/status?period=2026-01", headers=auth_header(admin_token)).json()["data"]
+    admin_id = next(u["user_id"] for u in status if u["user_id"] != ctx["user_id"])
+    r = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(admin_token),
+        json={"user_id": admin_id, "period": "2026-01", "amount": 10000},
+    )
+    assert r.status_code == 200, r.text
+    assert client.get("/dues/me", headers={**user_headers, "If-None-Match": etag}).status_code == 304
+
+    # 본인 납부 → ETag 변경
+    r = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(admin_token),
+        json={"user_id": ctx["user_id"], "period": "2026-01", "amount": 4000},
+    )
+    assert r.status_code == 200, r.text
+    res = client.get("/dues/me", headers={**user_headers, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["data"]["paid_amount"] == 4000
+    etag = res.headers["ETag"]
+
+    # 새 청구 → 모든 회원 ETag 변경
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-02", "amount": 10000})
+    assert r.status_code == 200, r.text
+    res = client.get("/dues/me", headers={**user_headers, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["data"]["current_period"] == "2026-02"
+    assert res.headers["ETag"] != etag
+
+
+def test_member_dues_etag_is_per_user(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_headers = auth_header(ctx["admin_token"])
+    user_headers = auth_header(ctx["user_token"])
+
+    r = client.post("/admin/dues/charges", headers=admin_headers, json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    # 둘 다 미납 → 회비 버전은 같지만 ETag 는 달라야 함
+    admin_res = client.get("/dues/me", headers=admin_headers)
+    user_res = client.get("/dues/me", headers=user_headers)
+    assert admin_res.status_code == user_res.status_code == 200
+    assert admin_res.headers["ETag"] != user_res.headers["ETag"]
+
+    # 같은 브라우저에서 다른 계정이 앞 계정의 ETag 를 보내도 304 가 아님
+    for url in ["/dues/me", "/dues/me/payments", "/dues/me/statement"]:
+        res = client.get(url, headers={**user_headers, "If-None-Match": admin_res.headers["ETag"]})
+        assert res.status_code == 200, url
+        assert res.headers["ETag"] == user_res.headers["ETag"]
@@ -0,0 +1,99 @@
+"""
+관리자 회비 CSV export COPY 경로 테스트.
+- Postgres COPY 결과와 서버 측 커서(csv.writer) 결과가 같은 행을 내는지,
+  메모 특수문자(쉼표/따옴표/줄바꿈) 이스케이프, 캐시 적중 시 COPY 생략,
+  소비 중단 시 COPY 스레드 정리 확인.
+"""
+import csv
+import io
+import threading
+
+from sqlalchemy import select
+
+from app.services import dues_export
+from app.services.dues import get_charge_by_period
+from app.services.dues_cache import status_cache
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def _rows(chunks) -> list[list[str]]:
+    data = b"".join(c if isinstance(c, bytes) else c.encode("utf-8") for c in chunks)
+    assert data.startswith(b"\xef\xbb\xbf")
+    return list(csv.reader(io.StringIO(data.decode("utf-8-sig"), newline="")))
+
+
+def _seed(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    h = auth_header(ctx["admin_token"])
+    c = client.post("/admin/dues/charges", headers=h, json={"period": "2026-09", "amount": 10000})
+    assert c.status_code == 200, c.text
+    for amount, method, memo in [(4000, "CASH", '1차, "현금"'), (3000, "TRANSFER", "줄\n바꿈"), (1000, "ETC", None)]:
+        p = client.post("/admin/dues/payments", headers=h,
+                        json={"user_id": ctx["user_id"], "period": "2026-09", "amount": amount, "method": method, "memo": memo})
+        assert p.status_code == 200, p.text
+    return ctx, get_charge_by_period(db_session, "2026-09")
+
+
+def _both(db_session, monkeypatch, fn, charge):
+    status_cache.invalidate()
+    assert dues_export.copy_supported(db_session)
+    copied = _rows(fn(db_session, period="2026-09", charge=charge))
+    monkeypatch.setattr(dues_export, "copy_supported", lambda db: False)
+    fallback = _rows(fn(db_session, period="2026-09", charge=charge))
+    monkeypatch.undo()
+    return copied, fallback
+
+
+def test_copy_payments_csv_matches_fallback(client, db_session, monkeypatch):
+    _, charge = _seed(client, db_session)
+    copied, fallback = _both(db_session, monkeypatch, dues_export.iter_payments_csv, charge)
+
+    assert copied[0] == dues_export.PAYMENTS_CSV_HEADER
+    assert len(copied) == 4
+    assert copied == fallback
+    assert [r[4] for r in copied[1:]] == ["ETC", "TRANSFER", "CASH"]
+    assert [r[5] for r in copied[1:]] == ["", "줄\n바꿈", '1차, "현금"']
+
+
+def test_copy_status_csv_matches_fallback(client, db_session, monkeypatch):
+    _, charge = _seed(client, db_session)
+    copied, fallback = _both(db_session, monkeypatch, dues_export.iter_status_csv, charge)
+
+    assert copied[0] == dues_export.STATUS_CSV_HEADER
+    assert copied == fallback
+    assert any(r[3] == "PARTIAL" and r[4] == "10000" and r[5] == "8000" for r in copied[1:])
+
+
+def test_status_csv_uses_cached_rows(client, db_session, monkeypatch):
+    ctx, charge = _seed(client, db_session)
+    status_cache.invalidate()
+    res = client.get("/admin/dues/status?period=2026-09", headers=auth_header(ctx["admin_token"]))
+    assert res.status_code == 200, res.text
+
+    def no_copy(*args, **kwargs):
+        raise AssertionError("COPY should not run on a cache hit")
+
+    monkeypatch.setattr(dues_export, "iter_copy_csv", no_copy)
+    rows = _rows(dues_export.iter_status_csv(db_session, period="2026-09", charge=charge))
+    assert rows[0] == dues_export.STATUS_CSV_HEADER
+    assert any(r[3] == "PARTIAL" and r[5] == "8000" for r in rows[1:])
+
+
+def test_copy_stops_when_consumer_closes(client, db_session, monkeypatch):
+    _, charge = _seed(client, db_session)
+    before = threading.active_count()
+    # 행마다 청크 하나, 큐 1칸 → 소비를 멈추면 COPY 가 중간에 막힌 상태에서 중단
+    monkeypatch.setattr(dues_export, "EXPORT_CHUNK_SIZE", 1)
+    monkeypatch.setattr(dues_export, "COPY_QUEUE_CHUNKS", 1)
+
+    raw = db_session.connection().connection.driver_connection
+    it = dues_export.iter_payments_csv(db_session, period="2026-09", charge=charge)
+    assert next(it) == b"\xef\xbb\xbf"
+    assert next(it).startswith(b"period,")
+    it.close()
+
+    assert threading.active_count() == before
+    # COPY 중이던 연결은 폐기, 같은 세션의 다음 쿼리는 새 연결에서 정상 동작 (청구 캐시를 거치지 않음)
+    assert raw.closed
+    assert db_session.execute(select(1)).scalar() == 1
+    assert db_session.connection().connection.driver_connection is not raw
@@ -0,0 +1,194 @@
+"""
+관리자 백그라운드 export 작업 테스트.
+- 작업 등록(202) → 워커 완료(DONE) → 파일 다운로드 / Range 부분 다운로드(206),
+  같은 요청 + 같은 데이터 재사용, 납부 변경 후 새 작업, 입력 검증(400),
+  연간 보고서 시트 구성, 프로세스 풀 실행(납부 직후 재생성 반영), 만료 작업 정리.
+"""
+import csv
+import io
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.models.export_job import ExportJob
+from app.services.dues_export_jobs import export_runner, purge_expired_exports
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+@pytest.fixture()
+def runner(client, tmp_path):
+    export_runner.configure(database_url=settings.TEST_DATABASE_URL, export_dir=str(tmp_path), processes=0)
+    yield export_runner
+    export_runner.configure()
+
+
+def _seed(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    h = auth_header(ctx["admin_token"])
+    for period in ["2026-01", "2026-02"]:
+        c = client.post("/admin/dues/charges", headers=h, json={"period": period, "amount": 10000})
+        assert c.status_code == 200, c.text
+    p = client.post("/admin/dues/payments", headers=h,
+                    json={"user_id": ctx["user_id"], "period": "2026-01", "amount": 4000, "method": "CASH"})
+    assert p.status_code == 200, p.text
+    return ctx, h
+
+
+def _wait_done(client, h, job_id, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        res = client.get(f"/admin/exports/{job_id}", headers=h)
+        assert res.status_code == 200, res.text
+        job = res.json()["data"]
+        if job["status"] in ("DONE", "FAILED"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"export job {job_id} did not finish")
+
+
+def test_export_job_status_csv_roundtrip(client, db_session, runner):
+    ctx, h = _seed(client, db_session)
+
+    res = client.post("/admin/exports", headers=h, json={"kind": "status_csv", "periods": ["2026-01"]})
+    assert res.status_code == 202, res.text
+    body = res.json()
+    assert body["meta"]["reused"] is False
+    assert body["data"]["status"] in ("QUEUED", "RUNNING", "DONE")
+
+    job = _wait_done(client, h, body["data"]["id"])
+    assert job["status"] == "DONE", job["error"]
+    assert job["progress"] == 100
+    assert job["download_url"] == f"/admin/exports/{job['id']}/file"
+
+    file = client.get(job["download_url"], headers=h)
+    assert file.status_code == 200
+    assert file.headers["content-type"].startswith("text/csv")
+    assert 'filename="dues_status_2026-01.csv"' in file.headers["content-disposition"]
+    assert int(file.headers["content-length"]) == job["size"]
+    rows = list(csv.reader(io.StringIO(file.content.decode("utf-8-sig"))))
+    assert rows[0] == ["period", "name", "student_id", "status", "amount_due", "paid_amount"]
+    assert any(r[3] == "PARTIAL" and r[5] == "4000" for r in rows[1:])
+
+    # Range 요청: 부분 응답
+    part = client.get(job["download_url"], headers={**h, "Range": "bytes=0-9"})
+    assert part.status_code == 206
+    assert part.content == file.content[:10]
+    assert part.headers["content-range"] == f"bytes 0-9/{job['size']}"
+
+
+def test_export_job_reused_until_data_changes(client, db_session, runner):
+    ctx, h = _seed(client, db_session)
+    req = {"kind": "status_xlsx", "periods": ["2026-01", "2026-02", "2026-01"]}
+
+    first = client.post("/admin/exports", headers=h, json=req).json()["data"]
+    assert first["params"] == {"periods": ["2026-01", "2026-02"]}
+    assert _wait_done(client, h, first["id"])["status"] == "DONE"
+
+    again = client.post("/admin/exports", headers=h, json=req)
+    assert again.status_code == 200
+    assert again.json()["meta"]["reused"] is True
+    assert again.json()["data"]["id"] == first["id"]
+
+    # 납부가 바뀌면 새 작업
+    p = client.post("/admin/dues/payments", headers=h,
+                    json={"user_id": ctx["user_id"], "period": "2026-02", "amount": 10000})
+    assert p.status_code == 200, p.text
+    changed = client.post("/admin/exports", headers=h, json=req)
+    assert changed.status_code == 202
+    assert changed.json()["meta"]["reused"] is False
+    job = _wait_done(client, h, changed.json()["data"]["id"])
+    assert job["status"] == "DONE", job["error"]
+
+    wb = load_workbook(io.BytesIO(client.get(job["download_url"], headers=h).content), read_only=True)
+    assert wb.sheetnames == ["2026-01", "2026-02"]
+    feb = list(wb["2026-02"].iter_rows(values_only=True))
+    assert any(r[3] == "PAID" and r[5] == 10000 for r in feb[1:])
+
+
+def test_export_job_year_workbook(client, db_session, runner):
+    ctx, h = _seed(client, db_session)
+
+    res = client.post("/admin/exports", headers=h, json={"kind": "year_xlsx", "year": 2026})
+    assert res.status_code == 202, res.text
+    job = _wait_done(client, h, res.json()["data"]["id"])
+    assert job["status"] == "DONE", job["error"]
+    assert job["filename"] == "dues_2026.xlsx"
+
+    wb = load_workbook(io.BytesIO(client.get(job["download_url"], headers=h).content), read_only=True)
+    assert wb.sheetnames == ["2026", "2026-01", "2026-02"]
+    summary = list(wb["2026"].iter_rows(values_only=True))
+    assert summary[0] == ("name", "student_id", "2026-01_paid", "2026-01_status", "2026-02_paid", "2026-02_status")
+    assert any(r[2] == 4000 and r[3] == "PARTIAL" for r in summary[1:])
+
+
+def test_export_job_in_process_pool(client, db_session, runner):
+    ctx, h = _seed(client, db_session)
+    runner.configure(database_url=settings.TEST_DATABASE_URL, export_dir=runner.export_dir, processes=1)
+
+    res = client.post("/admin/exports", headers=h, json={"kind": "status_xlsx", "periods": ["2026-01"]})
+    assert res.status_code == 202, res.text
+    job = _wait_done(client, h, res.json()["data"]["id"], timeout=60.0)
+    assert job["status"] == "DONE", job["error"]
+
+    # 같은 작업 프로세스에서 곧바로 다시 만들어도 방금 납부가 반영되어야 함 (프로세스 내 캐시 미사용)
+    p = client.post("/admin/dues/payments", headers=h,
+                    json={"user_id": ctx["user_id"], "period": "2026-01", "amount": 6000, "method": "CASH"})
+    assert p.status_code == 200, p.text
+    res = client.post("/admin/exports", headers=h, json={"kind": "status_xlsx", "periods": ["2026-01"]})
+    assert res.status_code == 202, res.text
+    job = _wait_done(client, h, res.json()["data"]["id"], timeout=60.0)
+    assert job["status"] == "DONE", job["error"]
+
+    wb = load_workbook(io.BytesIO(client.get(job["download_url"], headers=h).content), read_only=True)
+    jan = list(wb["2026-01"].iter_rows(values_only=True))
+    assert any(r[3] == "PAID" and r[5] == 10000 for r in jan[1:])
+
+
+def test_export_job_validation_and_not_found(client, db_session, runner):
+    ctx, h = _seed(client, db_session)
+
+    bad = [
+        ({"kind": "status_csv", "periods": []}, "periods is required"),
+        ({"kind": "status_csv", "periods": ["2026-01", "2026-02"]}, "status_csv takes exactly one period"),
+        ({"kind": "payments_csv", "periods": ["2026-13"]}, "month must be between 01 and 12"),
+        ({"kind": "year_xlsx"}, "year is required for year_xlsx"),
+    ]
+    for body, detail in bad:
+        res = client.post("/admin/exports", headers=h, json=body)
+        assert res.status_code == 400, body
+        assert res.json()["detail"] == detail
+
+    missing = "00000000-0000-0000-0000-000000000000"
+    assert client.get(f"/admin/exports/{missing}", headers=h).status_code == 404
+    assert client.get(f"/admin/exports/{missing}/file", headers=h).status_code == 404
+
+    # 관리자 전용
+    member = client.post("/admin/exports", headers=auth_header(ctx["user_token"]),
+                         json={"kind": "status_csv", "periods": ["2026-01"]})
+    assert member.status_code == 403
+
+
+def test_purge_expired_export_jobs(client, db_session, runner):
+    ctx, h = _seed(client, db_session)
+    res = client.post("/admin/exports", headers=h, json={"kind": "payments_csv", "periods": ["2026-01"]})
+    job = _wait_done(client, h, res.json()["data"]["id"])
+    assert job["status"] == "DONE", job["error"]
+
+    db_session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == uuid.UUID(job["id"]))
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    db_session.commit()
+    assert client.get(f"/admin/exports/{job['id']}", headers=h).status_code == 404
+
+    path = db_session.get(ExportJob, uuid.UUID(job["id"])).file_path
+    assert purge_expired_exports(db_session) == 1
+    db_session.commit()
+    assert not os.path.exists(path)
@@ -6,11 +6,15 @@
 
 관리자 회비 현황 XLSX export 테스트.
 - ADMIN 접근, period 검증, attachment 헤더,
-  XLSX 응답 content-type 및 파일 시그니처(PK) 확인.
+  XLSX 응답 content-type 및 파일 시그니처(PK), 여러 period 시트 확인.
 
 
 
 """
+import io
+
+from openpyxl import load_workbook
+
 from tests.helpers import auth_header, setup_admin_and_member
 
 
@@ -60,3 +64,34 @@ def test_admin_dues_export_xlsx_invalid_period_400(client, db_session):
     res = client.get("/admin/dues/export.xlsx?period=2026-13", headers=auth_header(admin_token))
     assert res.status_code == 400
     assert res.json()["detail"] == "month must be between 01 and 12"
+
+
+def test_admin_dues_export_xlsx_multiple_periods(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+
+    for period in ["2026-01", "2026-02"]:
+        c = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": 10000})
+        assert c.status_code == 200, c.text
+    p = client.post(
+        "/admin/dues/payments",
+        headers=auth_header(admin_token),
+        json={"user_id": ctx["user_id"], "period": "2026-02", "amount": 10000},
+    )
+    assert p.status_code == 200, p.text
+
+    res = client.get(
+        "/admin/dues/export.xlsx?period=2026-01&period=2026-02&period=2026-03",
+        headers=auth_header(admin_token),
+    )
+    assert res.status_code == 200
+    assert 'filename="dues_status_2026-01_2026-03.xlsx"' in res.headers["content-disposition"]
+
+    # period 마다 시트 하나, 청구가 없는 period 는 헤더만
+    wb = load_workbook(io.BytesIO(res.content), read_only=True)
+    assert wb.sheetnames == ["2026-01", "2026-02", "2026-03"]
+    feb = list(wb["2026-02"].iter_rows(values_only=True))
+    assert feb[0] == ("period", "name", "student_id", "status", "amount_due", "paid_amount")
+    assert ("2026-02", "PAID", 10000) in [(r[0], r[3], r[5]) for r in feb[1:]]
+    assert len(list(wb["2026-01"].iter_rows())) == 3  # 헤더 + ADMIN + MEMBER
+    assert len(list(wb["2026-03"].iter_rows())) == 1
@@ -221,7 +221,7 @@ def test_dues_charge_duplicate_period_rejected(client, db_session):
     assert r1.status_code == 200, r1.text
 
     r2 = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": amount})
-    assert r2.status_code == 400, r2.text
+    assert r2.status_code == 409, r2.text
     assert r2.json()["detail"] == "charge for that period already exists"
 
 
@@ -0,0 +1,123 @@
+"""
+
+
+
+관리자 회비 쓰기 API Idempotency-Key 테스트.
+- 같은 키로 재요청하면 납부 / 청구가 다시 기록되지 않고 원래 응답이 반환되는지,
+  같은 키에 다른 본문이면 422, 만료 키 덮어쓰기 / 정리가 되는지,
+  동시 요청에 저장이 밀렸는데 먼저 저장된 응답도 없으면 409 인지 확인한다.
+
+
+
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, func
+
+from app.models.dues import DuesCharge, DuesPayment
+from app.models.idempotency import IdempotencyKey
+from app.routers import admin_dues
+from app.services.idempotency import store_response, purge_expired_keys
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def test_payment_idempotency_key_replays_original_response(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    headers = {**auth_header(admin_token), "Idempotency-Key": "pay-001"}
+    payload = {"user_id": ctx["user_id"], "period": "2026-01", "amount": 4000, "method": "CASH"}
+
+    first = client.post("/admin/dues/payments", headers=headers, json=payload)
+    assert first.status_code == 200, first.text
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = client.post("/admin/dues/payments", headers=headers, json=payload)
+    assert retry.status_code == 200, retry.text
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    assert db_session.scalar(select(func.count()).select_from(DuesPayment)) == 1
+    r = client.get("/dues/me", headers=auth_header(ctx["user_token"]))
+    assert r.json()["data"]["paid_amount"] == 4000
+
+    # 같은 키, 다른 본문 → 422
+    r = client.post("/admin/dues/payments", headers=headers, json={**payload, "amount": 5000})
+    assert r.status_code == 422
+
+    # 키 없이 보내면 매번 새로 기록
+    r = client.post("/admin/dues/payments", headers=auth_header(admin_token), json=payload)
+    assert r.status_code == 200, r.text
+    assert db_session.scalar(select(func.count()).select_from(DuesPayment)) == 2
+
+
+def test_charge_idempotency_key(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    headers = {**auth_header(ctx["admin_token"]), "Idempotency-Key": "charge-2026-02"}
+    payload = {"period": "2026-02", "amount": 10000}
+
+    first = client.post("/admin/dues/charges", headers=headers, json=payload)
+    assert first.status_code == 200, first.text
+
+    # 키가 없었다면 중복 청구(400)였을 재시도도 원래 응답 반환
+    retry = client.post("/admin/dues/charges", headers=headers, json=payload)
+    assert retry.status_code == 200, retry.text
+    assert retry.json() == first.json()
+
+    # 실패한 요청은 키가 저장되지 않음
+    bad = {**auth_header(ctx["admin_token"]), "Idempotency-Key": "charge-bad"}
+    assert client.post("/admin/dues/charges", headers=bad, json={"period": "2026-13", "amount": 1}).status_code == 400
+    assert db_session.get(IdempotencyKey, ("POST /admin/dues/charges", "charge-bad")) is None
+
+
+def test_store_response_conflict_and_expiry(db_session):
+    kwargs = {"scope": "POST /test", "key": "k1", "request_hash": "h", "status_code": 200}
+    assert store_response(db_session, body={"n": 1}, **kwargs) is True
+    db_session.commit()
+
+    # 살아있는 키 → 저장 실패 (동시 요청의 뒤쪽)
+    assert store_response(db_session, body={"n": 2}, **kwargs) is False
+    db_session.rollback()
+
+    # 만료된 키는 덮어쓰기 가능, 정리 대상
+    row = db_session.get(IdempotencyKey, ("POST /test", "k1"))
+    row.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db_session.commit()
+    assert store_response(db_session, body={"n": 3}, **kwargs) is True
+    db_session.commit()
+    db_session.refresh(row)
+    assert row.response_body == {"n": 3}
+
+    row.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db_session.commit()
+    assert purge_expired_keys(db_session) == 1
+    db_session.commit()
+    assert db_session.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+
+def test_lost_idempotency_race_without_stored_response_409(client, db_session, monkeypatch):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    # 같은 키의 다른 요청이 먼저 저장했지만 다시 읽기 전에 만료 / 정리된 상황
+    monkeypatch.setattr(admin_dues, "store_response", lambda db, **kw: False)
+
+    headers = {**auth_header(admin_token), "Idempotency-Key": "race-001"}
+    for url, payload in [
+        ("/admin/dues/charges", {"period": "2026-02", "amount": 10000}),
+        ("/admin/dues/payments", {"user_id": ctx["user_id"], "period": "2026-01", "amount": 4000}),
+        ("/admin/dues/payments/allocate", {"user_id": ctx["user_id"], "amount": 4000}),
+    ]:
+        res = client.post(url, headers=headers, json=payload)
+        assert res.status_code == 409, (url, res.text)
+        assert res.json()["detail"] == "idempotency key in use, retry"
+
+    # 모두 rollback 되어 아무것도 기록되지 않음
+    assert db_session.scalar(select(func.count()).select_from(DuesCharge)) == 1
+    assert db_session.scalar(select(func.count()).select_from(DuesPayment)) == 0
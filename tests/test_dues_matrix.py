@@ -0,0 +1,76 @@
+"""
+
+
+
+관리자 회원 × 기간 회비 매트릭스 테스트.
+- 여러 period 청구/납부 후 /admin/dues/matrix 의 JSON 피벗 결과,
+  CSV 헤더/행, XLSX 시그니처 및 잘못된 범위(400)를 확인한다.
+
+
+
+"""
+
+import csv
+import io
+
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def _setup(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    for period in ["2026-01", "2026-02", "2026-03"]:
+        r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": 10000})
+        assert r.status_code == 200, r.text
+
+    payments = [("2026-01", 10000), ("2026-02", 3000)]
+    for period, amount in payments:
+        r = client.post(
+            "/admin/dues/payments",
+            headers=auth_header(admin_token),
+            json={"user_id": ctx["user_id"], "period": period, "amount": amount, "method": "TRANSFER"},
+        )
+        assert r.status_code == 200, r.text
+    return ctx
+
+
+def test_admin_dues_matrix_json(client, db_session):
+    ctx = _setup(client, db_session)
+
+    res = client.get("/admin/dues/matrix?from=2026-01&to=2026-03", headers=auth_header(ctx["admin_token"]))
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert [p["period"] for p in body["data"]["periods"]] == ["2026-01", "2026-02", "2026-03"]
+    assert body["meta"]["count"] == len(body["data"]["rows"])
+
+    row = next(r for r in body["data"]["rows"] if r["user_id"] == ctx["user_id"])
+    assert row["cells"] == [
+        {"paid_amount": 10000, "status": "PAID"},
+        {"paid_amount": 3000, "status": "PARTIAL"},
+        {"paid_amount": 0, "status": "UNPAID"},
+    ]
+
+
+def test_admin_dues_matrix_csv_and_xlsx(client, db_session):
+    ctx = _setup(client, db_session)
+    admin_token = ctx["admin_token"]
+
+    res = client.get("/admin/dues/matrix?from=2026-02&to=2026-03&format=csv", headers=auth_header(admin_token))
+    assert res.status_code == 200, res.text
+    assert "attachment" in res.headers.get("content-disposition", "")
+    rows = list(csv.reader(io.StringIO(res.text.lstrip("\ufeff"))))
+    assert rows[0] == ["name", "student_id", "2026-02_paid", "2026-02_status", "2026-03_paid", "2026-03_status"]
+    row = next(r for r in rows[1:] if r[1] == ctx["user_student_id"])
+    assert row[2:] == ["3000", "PARTIAL", "0", "UNPAID"]
+
+    res = client.get("/admin/dues/matrix?from=2026-01&to=2026-03&format=xlsx", headers=auth_header(admin_token))
+    assert res.status_code == 200
+    assert res.content[:2] == b"PK"
+
+
+def test_admin_dues_matrix_invalid_range_400(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+
+    res = client.get("/admin/dues/matrix?from=2026-05&to=2026-01", headers=auth_header(ctx["admin_token"]))
+    assert res.status_code == 400
+    assert res.json()["detail"] == "from must not be later than to"
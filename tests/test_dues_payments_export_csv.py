@@ -6,13 +6,14 @@
 
 관리자 회비 납부내역 CSV export 테스트.
 - 특정 period 납부 기록 2건 생성 후 export 결과(헤더/행 수/금액),
-  attachment 헤더 및 period 검증(400) 확인.
+  attachment 헤더 및 period 검증(400), 서버 측 커서 batch 단위 읽기 확인.
 
 
 
 """
 import csv
 import io
+from app.services.dues import get_charge_by_period, iter_payment_rows, iter_admin_status_rows
 from tests.helpers import auth_header, setup_admin_and_member
 
 def _parse_csv_text(text: str) -> list[list[str]]:
@@ -60,3 +61,23 @@ def test_admin_dues_payments_export_csv_invalid_period_400(client, db_session):
     res = client.get("/admin/dues/payments/export?period=2026-13", headers=auth_header(admin_token))
     assert res.status_code == 400
     assert res.json()["detail"] == "month must be between 01 and 12"
+
+
+def test_payment_rows_stream_in_batches(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+
+    c = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-09", "amount": 10000})
+    assert c.status_code == 200, c.text
+    for amount in [1000, 2000, 3000, 4000, 5000]:
+        p = client.post("/admin/dues/payments", headers=auth_header(admin_token),
+                        json={"user_id": ctx["user_id"], "period": "2026-09", "amount": amount})
+        assert p.status_code == 200, p.text
+
+    charge = get_charge_by_period(db_session, "2026-09")
+    batches = list(iter_payment_rows(db_session, charge_id=charge.id, batch_size=2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert sorted(r.amount for b in batches for r in b) == [1000, 2000, 3000, 4000, 5000]
+
+    batches = list(iter_admin_status_rows(db_session, charge=charge, batch_size=1))
+    assert [len(b) for b in batches] == [1, 1]
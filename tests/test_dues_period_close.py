@@ -0,0 +1,118 @@
+"""
+
+
+
+관리자 회비 기간 마감(/admin/dues/charges/{period}/close) 테스트.
+- 마감 후 단건 / 일괄 납부가 거부되는지, 마감과 동시에 들어온 납부가 거부되는지,
+  납부 현황 / 수납 통계가 마감 시점 스냅샷에서 응답되는지 확인한다.
+
+
+
+"""
+
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select, func, update
+from sqlalchemy.orm import Session
+
+from app.models.dues import DuesCharge, DuesPeriodSnapshot, DuesPeriodTotal
+from app.services.dues import record_payment
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def test_close_period_freezes_status_and_rejects_payments(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_headers = auth_header(ctx["admin_token"])
+
+    r = client.post("/admin/dues/charges", headers=admin_headers, json={"period": "2024-03", "amount": 10000})
+    assert r.status_code == 200, r.text
+    r = client.post(
+        "/admin/dues/payments",
+        headers=admin_headers,
+        json={"user_id": ctx["user_id"], "period": "2024-03", "amount": 4000, "method": "TRANSFER"},
+    )
+    assert r.status_code == 200, r.text
+
+    res = client.post("/admin/dues/charges/2024-03/close", headers=admin_headers)
+    assert res.status_code == 200, res.text
+    data = res.json()["data"]
+    assert data["members"] == 2
+    assert (data["expected_total"], data["collected_total"], data["payments"]) == (20000, 4000, 1)
+    assert (data["paid_count"], data["partial_count"], data["unpaid_count"]) == (0, 1, 1)
+    assert db_session.scalar(select(func.count()).select_from(DuesPeriodSnapshot)) == 2
+
+    charges = client.get("/admin/dues/charges", headers=admin_headers).json()["data"]
+    assert charges[0]["closed_at"] == data["closed_at"]
+
+    # 마감 후 납부 / 재마감 거부
+    r = client.post(
+        "/admin/dues/payments",
+        headers=admin_headers,
+        json={"user_id": ctx["user_id"], "period": "2024-03", "amount": 6000},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "period is closed"
+    assert client.post("/admin/dues/charges/2024-03/close", headers=admin_headers).status_code == 400
+    assert client.post("/admin/dues/charges/2024-04/close", headers=admin_headers).status_code == 400
+
+    body = json.dumps({"student_id": ctx["user_student_id"], "period": "2024-03", "amount": 6000}) + "\n"
+    r = client.post(
+        "/admin/dues/payments/bulk",
+        headers={**admin_headers, "Content-Type": "application/x-ndjson"},
+        content=body.encode("utf-8"),
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"]["errors"][0]["error"] == "period is closed"
+
+    # 납부 현황은 스냅샷에서 응답
+    status = client.get("/admin/dues/status?period=2024-03", headers=admin_headers).json()["data"]
+    member = next(u for u in status if u["user_id"] == ctx["user_id"])
+    assert (member["paid_amount"], member["status"]) == (4000, "PARTIAL")
+
+    # 수납 통계는 마감 합계에서 응답 (납부 원본을 읽지 않음)
+    res = client.get("/admin/dues/analytics?from=2024-01&to=2024-12", headers=admin_headers)
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["meta"]["cached"] == 1
+    item = body["data"][0]
+    assert (item["expected_total"], item["collected_total"], item["collection_rate"]) == (20000, 4000, 0.2)
+    assert item["by_method"] == [{"method": "TRANSFER", "collected_total": 4000, "payments": 1}]
+    assert db_session.scalar(select(func.count()).select_from(DuesPeriodTotal)) == 1
+
+
+def test_payment_waiting_on_close_is_rejected(client, db_session, test_engine):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_headers = auth_header(ctx["admin_token"])
+    r = client.post("/admin/dues/charges", headers=admin_headers, json={"period": "2024-03", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    # 마감 트랜잭션이 청구 행을 잠근 채 closed_at 기록 (아직 commit 전)
+    closer = Session(bind=test_engine)
+    closer.execute(select(DuesCharge.id).where(DuesCharge.period == "2024-03").with_for_update())
+    closer.execute(update(DuesCharge).where(DuesCharge.period == "2024-03").values(closed_at=datetime.now(timezone.utc)))
+
+    result = {}
+
+    def pay():
+        with Session(bind=test_engine) as db:
+            try:
+                record_payment(db, user_id=uuid.UUID(ctx["user_id"]), period="2024-03", amount=4000,
+                               method="CASH", memo=None, created_by=uuid.UUID(ctx["user_id"]))
+                db.commit()
+                result["ok"] = True
+            except ValueError as e:
+                result["error"] = str(e)
+
+    t = threading.Thread(target=pay)
+    t.start()
+    time.sleep(0.3)
+    assert t.is_alive()  # 청구 행 잠금 대기
+    closer.commit()
+    closer.close()
+    t.join(timeout=10)
+
+    assert result == {"error": "period is closed"}
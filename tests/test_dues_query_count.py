@@ -0,0 +1,130 @@
+"""
+
+
+
+회비 조회 쿼리 수 테스트.
+- /dues/me 가 청구(period) 수와 관계없이 일정한 개수의 쿼리로
+  응답하는지(O(1)) 확인한다.
+- /admin/dues/status, export(csv/xlsx)가 회원 수와 관계없이
+  일정한 개수의 쿼리로 응답하는지 확인한다.
+
+
+
+"""
+
+import uuid
+
+from app.models.user import User, Role
+from app.services.dues_cache import status_cache
+from tests.helpers import auth_header, setup_admin_and_member, count_queries
+
+
+def _create_charge(client, admin_token: str, period: str, amount: int = 10000):
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": period, "amount": amount})
+    assert r.status_code == 200, r.text
+
+
+def _add_members(db, n: int):
+    for _ in range(n):
+        db.add(User(
+            email=f"m_{uuid.uuid4().hex[:8]}@test.com",
+            password_hash="x",
+            name="회원",
+            student_id=f"2023{uuid.uuid4().hex[:6]}",
+            phone="010-0000-0000",
+            grade=1,
+            role=Role.MEMBER,
+        ))
+    db.commit()
+
+
+def test_my_dues_query_count_constant_across_periods(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_token = ctx["user_token"]
+
+    _create_charge(client, admin_token, "2024-01")
+
+    with count_queries(db_session) as few:
+        r = client.get("/dues/me", headers=auth_header(user_token))
+    assert r.status_code == 200, r.text
+    assert r.json()["data"]["arrears_total"] == 10000
+
+    # 청구를 늘려도 쿼리 수는 그대로여야 함
+    for month in range(2, 13):
+        _create_charge(client, admin_token, f"2024-{month:02d}")
+    for month in range(1, 13):
+        _create_charge(client, admin_token, f"2025-{month:02d}")
+
+    with count_queries(db_session) as many:
+        r = client.get("/dues/me", headers=auth_header(user_token))
+    assert r.status_code == 200, r.text
+    body = r.json()["data"]
+    assert body["current_period"] == "2025-12"
+    assert body["status"] == "UNPAID"
+    assert body["arrears_total"] == 24 * 10000
+
+    with count_queries(db_session) as with_period:
+        r = client.get("/dues/me?period=2024-06", headers=auth_header(user_token))
+    assert r.status_code == 200, r.text
+    assert r.json()["data"]["current_period"] == "2024-06"
+
+    assert many["count"] == few["count"]
+    assert with_period["count"] == few["count"]
+
+
+def test_admin_status_query_count_constant_across_members(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    period = "2026-01"
+    _create_charge(client, admin_token, period)
+
+    urls = [
+        f"/admin/dues/status?period={period}",
+        f"/admin/dues/export?period={period}",
+        f"/admin/dues/export.xlsx?period={period}",
+    ]
+
+    def _measure() -> list[int]:
+        counts = []
+        for url in urls:
+            status_cache.invalidate()  # 집계 자체의 쿼리 수를 측정 (요청 병합 캐시 제외)
+            with count_queries(db_session) as c:
+                r = client.get(url, headers=auth_header(admin_token))
+            assert r.status_code == 200, r.text
+            counts.append(c["count"])
+        return counts
+
+    _measure()  # 청구 캐시 적재
+    few = _measure()
+    _add_members(db_session, 30)
+    many = _measure()
+
+    assert many == few
+
+    r = client.get(urls[0], headers=auth_header(admin_token))
+    assert r.json()["meta"]["count"] == 32  # ADMIN + MEMBER + 30
+
+
+def test_dues_write_paths_single_statement(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    headers = auth_header(ctx["admin_token"])
+
+    # 인증 등 요청 공통 쿼리 수 (캐시 통계는 DB 를 읽지 않음)
+    with count_queries(db_session) as base:
+        client.get("/admin/dues/cache/stats", headers=headers)
+
+    with count_queries(db_session) as charge:
+        _create_charge(client, ctx["admin_token"], "2024-01")
+    assert charge["count"] == base["count"] + 1
+
+    client.get("/admin/dues/charges", headers=headers)  # 청구 캐시 적재
+    with count_queries(db_session) as payment:
+        r = client.post(
+            "/admin/dues/payments",
+            headers=headers,
+            json={"user_id": ctx["user_id"], "period": "2024-01", "amount": 4000},
+        )
+        assert r.status_code == 200, r.text
+    assert payment["count"] == base["count"] + 1
+    assert r.json()["data"]["method"] == "TRANSFER"
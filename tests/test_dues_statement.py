@@ -0,0 +1,118 @@
+"""
+
+
+
+회원 회비 명세(/dues/me/statement) 테스트.
+- 청구와 납부가 시간순으로 합쳐지고 누적 잔액이 맞는지,
+  커서 페이지네이션(중복/누락 없음), 잘못된 커서 / 커서 값 타입(400)과
+  쿼리 수가 원장 길이와 무관한지 확인한다.
+
+
+
+"""
+
+import base64
+import json
+import uuid
+
+from tests.helpers import auth_header, setup_admin_and_member, count_queries
+
+
+def _cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def test_member_dues_statement_running_balance(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_token = ctx["user_token"]
+    user_id = ctx["user_id"]
+
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+    for amount in [3000, 7000]:
+        r = client.post(
+            "/admin/dues/payments",
+            headers=auth_header(admin_token),
+            json={"user_id": user_id, "period": "2026-01", "amount": amount, "method": "CASH", "memo": f"m{amount}"},
+        )
+        assert r.status_code == 200, r.text
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2026-02", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    res = client.get("/dues/me/statement?order=asc", headers=auth_header(user_token))
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert [(e["type"], e["period"], e["amount"], e["balance"]) for e in body["data"]] == [
+        ("CHARGE", "2026-01", 10000, 10000),
+        ("PAYMENT", "2026-01", 3000, 7000),
+        ("PAYMENT", "2026-01", 7000, 0),
+        ("CHARGE", "2026-02", 10000, 10000),
+    ]
+    assert body["data"][1]["method"] == "CASH"
+    assert body["data"][1]["memo"] == "m3000"
+    assert body["meta"]["total"] == 4
+    assert body["meta"]["closing_balance"] == 10000
+
+    # 기본은 최신순, 페이지를 나눠도 같은 항목 / 같은 누적 잔액
+    pages = []
+    cursor = None
+    while True:
+        url = "/dues/me/statement?limit=3" + (f"&cursor={cursor}" if cursor else "")
+        res = client.get(url, headers=auth_header(user_token))
+        assert res.status_code == 200, res.text
+        pages.extend(res.json()["data"])
+        cursor = res.json()["meta"]["next_cursor"]
+        if not cursor:
+            break
+    assert pages == list(reversed(body["data"]))
+
+    res = client.get("/dues/me/statement?cursor=zzz", headers=auth_header(user_token))
+    assert res.status_code == 400
+
+    # 형식은 맞지만 값 타입 / 값이 잘못된 커서
+    entry_id = str(uuid.uuid4())
+    for values in [
+        ["2026-01-01T00:00:00", 1, 5],
+        [20260101, 1, entry_id],
+        ["2026-01-01T00:00:00", "1", entry_id],
+        ["2026-01-01T00:00:00", True, entry_id],
+        ["2026-01-01T00:00:00", 7, entry_id],
+        ["not-a-date", 1, entry_id],
+        ["2026-01-01T00:00:00", 1, "not-a-uuid"],
+    ]:
+        res = client.get(f"/dues/me/statement?cursor={_cursor(values)}", headers=auth_header(user_token))
+        assert res.status_code == 400, values
+        assert res.json()["detail"] == "invalid cursor"
+
+
+def test_member_dues_statement_query_count_constant(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    admin_token = ctx["admin_token"]
+    user_token = ctx["user_token"]
+
+    def _measure() -> int:
+        with count_queries(db_session) as c:
+            r = client.get("/dues/me/statement", headers=auth_header(user_token))
+        assert r.status_code == 200, r.text
+        return c["count"]
+
+    r = client.post("/admin/dues/charges", headers=auth_header(admin_token), json={"period": "2025-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+    few = _measure()
+
+    r = client.post(
+        "/admin/dues/charges/schedule",
+        headers=auth_header(admin_token),
+        json={"from": "2025-02", "to": "2026-12", "amount": 10000},
+    )
+    assert r.status_code == 200, r.text
+    for period in ["2025-02", "2025-03", "2025-04"]:
+        r = client.post(
+            "/admin/dues/payments",
+            headers=auth_header(admin_token),
+            json={"user_id": ctx["user_id"], "period": period, "amount": 10000},
+        )
+        assert r.status_code == 200, r.text
+
+    assert _measure() == few
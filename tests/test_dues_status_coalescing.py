@@ -0,0 +1,105 @@
+"""
+
+
+
+관리자 납부 현황 / export 집계 요청 병합(single-flight) 테스트.
+- 같은 (operation, period) 동시 요청이 계산 1회를 공유하는지,
+  TTL 안의 재요청은 DB 를 읽지 않고 납부 commit 시 무효화되는지 확인한다.
+
+
+
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.services.dues_cache import CoalescingCache, status_cache
+from tests.helpers import auth_header, setup_admin_and_member, count_queries
+
+
+def test_coalescing_cache_single_flight():
+    cache = CoalescingCache(ttl_seconds=30)
+    charge_id = uuid.uuid4()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return ["row"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute(("status", "2026-01"), charge_id, compute)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute(("status", "2026-01"), charge_id, compute)))
+        for _ in range(4)
+    ]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [["row"]] * 5
+    assert cache.stats()["coalesced"] == 4
+
+    # TTL 안의 재요청은 저장된 결과, 무효화 후에는 다시 계산
+    assert cache.get_or_compute(("status", "2026-01"), charge_id, compute) == ["row"]
+    cache.invalidate_charges([charge_id])
+    cache.get_or_compute(("status", "2026-01"), charge_id, compute)
+    assert len(calls) == 2
+
+
+def test_coalescing_cache_error_and_invalidation_during_flight():
+    cache = CoalescingCache(ttl_seconds=30)
+    charge_id = uuid.uuid4()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute(("status", "2026-01"), charge_id, fail)
+    assert cache.stats()["in_flight"] == 0
+
+    # 계산 도중 무효화 → 결과는 반환하지만 저장하지 않음
+    def compute():
+        cache.invalidate_charges([charge_id])
+        return ["stale"]
+
+    assert cache.get_or_compute(("status", "2026-01"), charge_id, compute) == ["stale"]
+    assert cache.stats()["size"] == 0
+
+
+def test_admin_status_uses_short_lived_cache(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    headers = auth_header(ctx["admin_token"])
+
+    r = client.post("/admin/dues/charges", headers=headers, json={"period": "2026-01", "amount": 10000})
+    assert r.status_code == 200, r.text
+
+    client.get("/admin/dues/charges", headers=headers)  # 청구 캐시 적재
+    hits = status_cache.hits
+    with count_queries(db_session) as first:
+        client.get("/admin/dues/status?period=2026-01", headers=headers)
+    with count_queries(db_session) as second:
+        res = client.get("/admin/dues/export?period=2026-01", headers=headers)
+    assert res.status_code == 200
+    assert second["count"] == first["count"] - 1
+    assert client.get("/admin/dues/cache/stats", headers=headers).json()["data"]["status"]["hits"] == hits + 1
+
+    # 납부 commit → 해당 period 무효화
+    r = client.post(
+        "/admin/dues/payments",
+        headers=headers,
+        json={"user_id": ctx["user_id"], "period": "2026-01", "amount": 4000},
+    )
+    assert r.status_code == 200, r.text
+    status = client.get("/admin/dues/status?period=2026-01", headers=headers).json()["data"]
+    member = next(u for u in status if u["user_id"] == ctx["user_id"])
+    assert (member["paid_amount"], member["status"]) == (4000, "PARTIAL")
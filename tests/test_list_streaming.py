@@ -0,0 +1,99 @@
+"""
+대규모 목록 API 스트리밍 테스트.
+- 기본 JSON 응답과 stream=true(JSON 봉투 스트리밍) / Accept: application/x-ndjson 결과 비교,
+  서버 측 커서 batch 경계를 넘는 회원 수, meta.count trailer, 삭제 회원 / 관리자 로그 / 회원용 목록.
+"""
+import json
+from datetime import datetime, timezone
+
+from app.core.streaming import NDJSON_MEDIA_TYPE, STREAM_BATCH_SIZE, iter_json_envelope, iter_ndjson
+from app.models.user import Role, User
+from tests.helpers import auth_header, setup_admin_and_member
+
+
+def _add_members(db_session, n: int, *, deleted: int = 0):
+    now = datetime.now(timezone.utc)
+    for i in range(n + deleted):
+        is_deleted = i >= n
+        db_session.add(User(
+            email=f"bulk{i}@test.com",
+            password_hash="x",
+            name=f"회원{i}",
+            student_id=f"3000{i:05d}",
+            phone="010-0000-0000",
+            grade=1 + i % 4,
+            role=Role.DELETED if is_deleted else Role.MEMBER,
+            is_deleted=is_deleted,
+            deleted_at=now if is_deleted else None,
+        ))
+    db_session.commit()
+
+
+def _ndjson(res) -> tuple[list[dict], dict]:
+    assert res.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    return lines[:-1], lines[-1]["meta"]
+
+
+def test_envelope_and_ndjson_serializers():
+    batches = [[{"a": 1}, {"a": "한글"}], [], [{"a": None}]]
+    body = "".join(iter_json_envelope(iter(batches), meta={"limit": 5}))
+    assert json.loads(body) == {"data": [{"a": 1}, {"a": "한글"}, {"a": None}], "meta": {"limit": 5, "count": 3}}
+    assert "".join(iter_json_envelope(iter([]))) == '{"data":[],"meta":{"count":0}}'
+
+    chunks = list(iter_ndjson(iter(batches)))
+    assert len(chunks) == 3  # 비어 있지 않은 묶음마다 하나 + meta
+    assert chunks[-1] == '{"meta":{"count":3}}\n'
+
+
+def test_admin_users_all_streaming_matches_buffered(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    h = auth_header(ctx["admin_token"])
+    _add_members(db_session, STREAM_BATCH_SIZE * 2 + 7)
+
+    buffered = client.get("/admin/users/all", headers=h)
+    assert buffered.status_code == 200
+    expected = buffered.json()
+    assert expected["meta"]["count"] == STREAM_BATCH_SIZE * 2 + 9  # + 관리자 + 승인 회원
+
+    streamed = client.get("/admin/users/all?stream=true", headers=h)
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("application/json")
+    assert streamed.json() == expected
+
+    rows, meta = _ndjson(client.get("/admin/users/all", headers={**h, "Accept": NDJSON_MEDIA_TYPE}))
+    assert rows == expected["data"]
+    assert meta == {"count": len(rows)}
+
+
+def test_deleted_users_and_logs_streaming(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    h = auth_header(ctx["admin_token"])
+    _add_members(db_session, 3, deleted=4)
+
+    expected = client.get("/admin/users/deleted", headers=h).json()
+    assert expected["meta"]["count"] == 4
+    assert all(u["is_deleted"] and u["deleted_at"] for u in expected["data"])
+    assert client.get("/admin/users/deleted?stream=true", headers=h).json() == expected
+
+    logs = client.get("/admin/logs?limit=10", headers=h).json()
+    assert logs["meta"] == {"limit": 10, "count": 1}  # 승인 로그
+    assert client.get("/admin/logs?limit=10&stream=true", headers=h).json() == logs
+    rows, meta = _ndjson(client.get("/admin/logs?limit=10", headers={**h, "Accept": NDJSON_MEDIA_TYPE}))
+    assert rows == logs["data"]
+    assert meta == {"limit": 10, "count": 1}
+
+
+def test_member_users_all_streaming(client, db_session):
+    ctx = setup_admin_and_member(client, db_session)
+    h = auth_header(ctx["user_token"])
+    _add_members(db_session, 5, deleted=2)
+
+    expected = client.get("/users/all", headers=h).json()
+    assert expected["meta"]["count"] == 6  # 승인 회원 + 5 (삭제 / 관리자 제외)
+    assert set(expected["data"][0]) == {"name", "student_id", "grade"}
+
+    assert client.get("/users/all?stream=true", headers=h).json() == expected
+    rows, meta = _ndjson(client.get("/users/all", headers={**h, "Accept": f"{NDJSON_MEDIA_TYPE}, */*;q=0.1"}))
+    assert rows == expected["data"]
+    assert meta == {"count": 6}